@@ -1,10 +1,32 @@
 # code/core/admin.py
 from django.contrib import admin
-from .models import Course, CourseMember, CourseContent, Comment, Completion
-
-# Daftarkan semua model Anda di sini
-admin.site.register(Course)
-admin.site.register(CourseMember)
-admin.site.register(CourseContent)
-admin.site.register(Comment)
-admin.site.register(Completion)
\ No newline at end of file
+from .models import Course, CourseMember, CourseContent, Comment, Completion, MemberProgress, ImportJob
+
+# __str__ model mengikuti beberapa FK, jadi daftar admin perlu select_related
+@admin.register(Course)
+class CourseAdmin(admin.ModelAdmin):
+    list_select_related = ('teacher',)
+
+@admin.register(CourseMember)
+class CourseMemberAdmin(admin.ModelAdmin):
+    list_select_related = ('user_id', 'course_id')
+
+@admin.register(CourseContent)
+class CourseContentAdmin(admin.ModelAdmin):
+    list_select_related = ('course_id',)
+
+@admin.register(Comment)
+class CommentAdmin(admin.ModelAdmin):
+    list_select_related = ('member_id__user_id', 'content_id')
+
+@admin.register(Completion)
+class CompletionAdmin(admin.ModelAdmin):
+    list_select_related = ('member_id__user_id', 'content_id__course_id')
+
+admin.site.register(MemberProgress)
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'course', 'state', 'rows_processed', 'rows_failed', 'rows_imported', 'created_at')
+    list_filter = ('state',)
+    list_select_related = ('course',)
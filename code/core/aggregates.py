@@ -0,0 +1,31 @@
+# /code/core/aggregates.py
+from .counters import count_subquery
+
+
+def course_aggregates():
+    """
+    nama anotasi -> subquery COUNT berkorelasi per course. Nama sengaja berbeda
+    dari kolom counter Course (num_*) karena Django menolak anotasi yang bentrok
+    dengan field model.
+    """
+    from .models import CourseMember, CourseContent, Comment
+
+    return {
+        'member_total': count_subquery(CourseMember, 'course_id'),
+        'student_total': count_subquery(CourseMember, 'course_id', roles='std'),
+        'content_total': count_subquery(CourseContent, 'course_id'),
+        'comment_total': count_subquery(Comment, 'content_id__course_id'),
+    }
+
+
+def annotate_course_counts(queryset, *names):
+    """
+    Tambahkan hitungan per course sebagai subquery terpisah, bukan Count() atas
+    JOIN. Beberapa Count() dalam satu query mengalikan baris (members x contents)
+    sehingga lambat dan salah tanpa distinct=True; subquery tetap linear.
+
+        annotate_course_counts(Course.objects.all(), 'member_total', 'content_total')
+    """
+    aggregates = course_aggregates()
+    names = names or tuple(aggregates)
+    return queryset.annotate(**{name: aggregates[name] for name in names})
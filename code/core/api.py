@@ -1,12 +1,32 @@
 # /code/core/api.py
+from django.contrib.auth import get_user_model
+from jwt import PyJWTError
 from ninja import NinjaAPI
-from ninja.security import HttpBearer
+from ninja.security import HttpBearer, django_auth
 from ninja_simple_jwt.auth.views.api import mobile_auth_router
+from ninja_simple_jwt.jwt.token_operations import TokenTypes, decode_token
+
+from .renderers import api_renderer
 
 class AuthBearer(HttpBearer):
     def authenticate(self, request, token):
         return token
 
-api = NinjaAPI(urls_namespace='auth-api')
+class JWTAuth(HttpBearer):
+    """Access token dari /api/auth/mobile/; request.auth berisi User dari database."""
+    def authenticate(self, request, token):
+        try:
+            payload = decode_token(token, token_type=TokenTypes.ACCESS, verify=True)
+        except (PyJWTError, OSError):
+            # token salah/kedaluwarsa atau kunci JWT belum dibuat (make_rsa)
+            return None
+        return get_user_model().objects.filter(pk=payload.get('user_id'), is_active=True).first()
+
+def is_staff_user(user):
+    return user.is_staff or user.is_superuser
+
+api = NinjaAPI(urls_namespace='auth-api', renderer=api_renderer())
 api.add_router("/auth/", mobile_auth_router)
-apiAuth = AuthBearer()
\ No newline at end of file
+apiAuth = AuthBearer()
+# endpoint yang butuh identitas pemanggil: sesi login (dengan cek CSRF) atau JWT
+userAuth = [django_auth, JWTAuth()]
\ No newline at end of file
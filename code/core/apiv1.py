@@ -1,24 +1,39 @@
 # apiv1.py
 from ninja import NinjaAPI, Schema, Query, Field, FilterSchema
-from ninja.pagination import paginate, PageNumberPagination
-from ninja.throttling import AnonRateThrottle, AuthRateThrottle
+from ninja.pagination import paginate
+from ninja.decorators import decorate_view
 from pydantic import field_validator
-from django.db.models import Count, Q
+from django.db.models import F, Q
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional, Union
 import re
 from ninja.responses import Response
 
 from .models import User, CourseMember, CourseContent, Comment, Course
-from .api import apiAuth
+from .api import apiAuth, is_staff_user, userAuth
+from .throttling import AnonRateThrottle, AuthRateThrottle, throttle_async
+from .search import course_search_q
+from .aggregates import annotate_course_counts
+from .pagination import KeysetPagination
+from .streaming import streamable
+from .catalog import cached_page
+from .stats import get_user_stats
+from .services import acomment_feed, filter_users, user_page
+from .enrollment import bulk_enroll
+from .completions import complete_contents
+from .thumbnails import thumbnail_urls
+from .conditional import catalog_state, conditional, table_state
+from .renderers import api_renderer, trusted_values
 
 # Inisialisasi API dengan throttling global
+API_THROTTLES = [
+    AnonRateThrottle('10/m'),  
+    AuthRateThrottle('10/m'),
+]
 apiv1 = NinjaAPI(
     urls_namespace='apiv1',
-    throttle=[
-        AnonRateThrottle('10/m'),  
-        AuthRateThrottle('10/m'),
-    ],
+    throttle=API_THROTTLES,
+    renderer=api_renderer(),
 )
 
 @apiv1.get('/hello')
@@ -124,23 +139,42 @@ class UserSchema(Schema):
     last_name: str
     email: str
 
-# GET users 
-@apiv1.get("/users", response=List[UserSchema])
-@paginate(PageNumberPagination, page_size=10)
-def list_users(request, search: Optional[str] = Query(None)):
-    users = User.objects.all()
-    
-    if search:
-        users = users.filter(
-            Q(username__icontains=search) |
-            Q(first_name__icontains=search) |
-            Q(last_name__icontains=search) |
-            Q(email__icontains=search)
-        ).distinct()
-    
-    return users.order_by('date_joined')
+class UserPageSchema(Schema):
+    items: List[UserSchema]
+    next_cursor: Optional[str] = None
+    count: Optional[int] = None
+
+# GET users: halaman sama dengan /users/ HTML (hasil pencarian terurut relevansi)
+@apiv1.get("/users", response=UserPageSchema)
+@trusted_values(UserSchema)
+def list_users(request, search: Optional[str] = Query(None), pagination: KeysetPagination.Input = Query(...)):
+    page_size = min(pagination.page_size or 10, 200)
+    items, next_cursor = user_page(
+        search, pagination.cursor, page_size, fields=('id', 'username', 'first_name', 'last_name', 'email'),
+    )
+    return {
+        'items': items,
+        'next_cursor': next_cursor,
+        'count': filter_users(search).count() if pagination.include_total else None,
+    }
+
+# ============= STATS ENDPOINT =============
+class UserStatsOut(Schema):
+    total_users: int
+    admin: int
+    staff: int
+    siswa: int
+    teacher: int
+    total_course: int
+    total_member: int
+    rata2: float
+
+@apiv1.get('/stats', response={200: UserStatsOut, 403: dict}, auth=userAuth)
+def userStats(request):
+    if not is_staff_user(request.auth):
+        return 403, {"status": "Hanya staff yang dapat melihat statistik"}
+    return get_user_stats()
 
-# ... (sisanya sama seperti sebelumnya)
 
 # ============= COURSE FILTER & SCHEMAS =============
 class CourseFilter(FilterSchema):
@@ -148,7 +182,7 @@ class CourseFilter(FilterSchema):
     price_lte: Optional[int] = 0
     created_gte: Optional[datetime] = None
     created_lte: Optional[datetime] = None
-    search: Optional[str] = Field(None, q=['name__icontains', 'description__icontains'])
+    search: Optional[str] = None
 
     def filter_price_gte(self, value: int):
         return Q(price__gte=value) if value else Q()
@@ -162,12 +196,24 @@ class CourseFilter(FilterSchema):
     def filter_created_lte(self, value: datetime):
         return Q(created_at__lte=value) if value else Q()
 
+    def filter_search(self, value: str):
+        return course_search_q(value)
+
+def _course_thumbnails(course):
+    # course berupa dict dari .values(...) yang menyertakan 'image'
+    return thumbnail_urls(course.get('image'))
+
 class CourseSchema(Schema):
     id: int
     name: str
     description: str
     price: int
     teacher: int
+    thumbnails: Dict[str, str] = {}
+
+    @staticmethod
+    def resolve_thumbnails(obj):
+        return _course_thumbnails(obj)
 
 class DetailCourseOut(Schema):
     id: int
@@ -175,38 +221,48 @@ class DetailCourseOut(Schema):
     description: str
     price: int
     teacher: int
-    num_members: int
-    num_contents: int
+    num_members: int = Field(..., alias='member_total')
+    num_contents: int = Field(..., alias='content_total')
+    thumbnails: Dict[str, str] = {}
+
+    @staticmethod
+    def resolve_thumbnails(obj):
+        return _course_thumbnails(obj)
 
 # GET courses without auth for public access (untuk HTML dashboard)
 @apiv1.get('courses-public/', response=List[CourseSchema])
+@decorate_view(conditional(catalog_state, private=False))
+@cached_page('courses-public', CourseSchema)
+@streamable(schema=CourseSchema)
+@paginate(KeysetPagination)
 def listPublicCourses(request):
-    courses = Course.objects.all()
-    return [
-        {
-            "id": c.id,
-            "name": c.name,
-            "description": c.description,
-            "price": c.price,
-            "teacher": c.teacher.id if c.teacher else None
-        }
-        for c in courses
-    ]
+    return Course.objects.values('id', 'name', 'description', 'price', 'teacher', 'image', 'created_at')
+
+# GET detail course (async: dilayani tanpa thread pada profil ASGI)
+@apiv1.get('courses/{id}/', response={200: DetailCourseOut, 404: dict}, throttle=[])
+@throttle_async(*API_THROTTLES)
+async def getCourse(request, id: int):
+    course = await Course.objects.filter(pk=id).values(
+        'id', 'name', 'description', 'price', 'teacher', 'image',
+        member_total=F('num_students') + F('num_assistants'), content_total=F('num_contents'),
+    ).afirst()
+    if course is None:
+        return 404, {"status": "Course tidak ditemukan"}
+    return course
 
 # GET courses with auth, filter, and pagination
 @apiv1.get('courses/', response=List[DetailCourseOut], auth=apiAuth)
-@paginate(PageNumberPagination, page_size=5)
+@paginate(KeysetPagination, page_size=5)
 def listAllCourse(request, filters: CourseFilter = Query(...)):
     courses = Course.objects.all()
     courses = filters.filter(courses)
     
-    # Annotate each course with the number of members and contents
-    courses = courses.annotate(
-        num_members=Count('coursemember'),
-        num_contents=Count('coursecontent')
-    )
+    # Hitung member & konten lewat subquery terpisah (tanpa JOIN members x contents)
+    courses = annotate_course_counts(courses, 'member_total', 'content_total')
     
-    return courses
+    return courses.values(
+        'id', 'name', 'description', 'price', 'teacher', 'image', 'member_total', 'content_total', 'created_at'
+    )
 
 # ============= COURSE MEMBER ENDPOINTS =============
 class CourseMemberSchema(Schema):
@@ -223,53 +279,39 @@ class CourseMemberOut(Schema):
     roles: str
 
 @apiv1.get("/members", response=List[CourseMemberSchema])
+@trusted_values(CourseMemberSchema)
+@streamable(schema=CourseMemberSchema)
+@paginate(KeysetPagination)
 def list_members(request):
-    members = CourseMember.objects.all()
-    return [
-        {
-            "id": m.id,
-            "user_id": m.user_id.id,
-            "course_id": m.course_id.id,
-            "roles": m.roles,
-        }
-        for m in members
-    ]
+    return CourseMember.objects.values('id', 'user_id', 'course_id', 'roles', 'created_at')
 
 @apiv1.get('mycourses/', auth=apiAuth, response=List[CourseMemberOut])
+@trusted_values(CourseMemberOut)
+@paginate(KeysetPagination)
 def getMyCourses(request):
     user = User.objects.first()
-    mycourses = CourseMember.objects.filter(user_id=user)\
-        .select_related('course_id', 'user_id')
-   
-    return [
-        {
-            "id": c.id,
-            "user_id": c.user_id.id,
-            "course_id": c.course_id.id,
-            "course_name": c.course_id.name,
-            "roles": c.roles
-        }
-        for c in mycourses
-    ]
-
-@apiv1.post('course/{id}/enroll/', auth=apiAuth, response=CourseMemberSchema)
+    return CourseMember.objects.filter(user_id=user).values(
+        'id', 'user_id', 'course_id', 'roles', 'created_at', course_name=F('course_id__name')
+    )
+
+@apiv1.post('course/{id}/enroll/', auth=apiAuth, response={200: CourseMemberSchema, 400: dict, 404: dict})
 def courseEnrollment(request, id: int):
     user = User.objects.first()
 
     try:
         course = Course.objects.get(pk=id)
     except Course.DoesNotExist:
-        return {"status": "Course tidak ditemukan"}, 404
+        return 404, {"status": "Course tidak ditemukan"}
       
-    if CourseMember.objects.filter(user_id=user, course_id=course).exists():
-        return {"status": "Anda sudah terdaftar di kursus ini."}, 400
-
-    enrollment = CourseMember.objects.create(
-        user_id=user, 
-        course_id=course, 
-        roles='std'
+    # unique_course_member menjamin tidak ada duplikat walau request datang bersamaan
+    enrollment, created = CourseMember.objects.get_or_create(
+        user_id=user,
+        course_id=course,
+        defaults={'roles': 'std'}
     )
-  
+    if not created:
+        return 400, {"status": "Anda sudah terdaftar di kursus ini."}
+
     return {
         "id": enrollment.id,
         "user_id": enrollment.user_id.id,
@@ -277,35 +319,51 @@ def courseEnrollment(request, id: int):
         "roles": enrollment.roles
     }
 
+class BulkEnrollIn(Schema):
+    user_ids: List[int] = []
+    usernames: List[str] = []
+    roles: Literal['std', 'ast'] = 'std'
+
+class BulkEnrollOut(Schema):
+    requested: int
+    created: int
+    already_enrolled: int
+    not_found_count: int
+    not_found: List[Union[int, str]]
+
+@apiv1.post('course/{id}/enroll/bulk/', auth=userAuth, response={200: BulkEnrollOut, 403: dict, 404: dict})
+def bulkEnrollment(request, id: int, data: BulkEnrollIn):
+    course = Course.objects.filter(pk=id).first()
+    if course is None:
+        return 404, {"status": "Course tidak ditemukan"}
+    if course.teacher_id != request.auth.pk and not is_staff_user(request.auth):
+        return 403, {"status": "Hanya pengajar kursus atau staff yang dapat mendaftarkan peserta"}
+    return bulk_enroll(course, data.user_ids, data.usernames, data.roles)
+
 # ============= COURSE CONTENT ENDPOINTS =============
 class CourseContentSchema(Schema):
     id: int
     course_id: int
     name: str
     description: str
-    video_url: str
+    video_url: Optional[str] = None
     file_attachment: Optional[str] = None
 
 @apiv1.get("/contents", response=List[CourseContentSchema])
+@decorate_view(conditional(table_state(CourseContent), private=False))
+@trusted_values(CourseContentSchema)
+@streamable(schema=CourseContentSchema)
+@paginate(KeysetPagination)
 def list_contents(request):
-    contents = CourseContent.objects.all()
-    return [
-        {
-            "id": c.id,
-            "course_id": c.course_id.id,
-            "name": c.name,
-            "description": c.description,
-            "video_url": c.video_url,
-            "file_attachment": c.file_attachment
-        }
-        for c in contents
-    ]
+    return CourseContent.objects.values(
+        'id', 'course_id', 'name', 'description', 'video_url', 'file_attachment', 'created_at'
+    )
 
 # ============= COMMENT ENDPOINTS =============
 class CommentSchema(Schema):
     id: int
-    content_id: int
-    member_id: int
+    content_id: Optional[int] = None
+    member_id: Optional[int] = None
     comment: str
 
 class CommentIn(Schema):
@@ -313,17 +371,33 @@ class CommentIn(Schema):
     comment: str
 
 @apiv1.get("/comments", response=List[CommentSchema])
+@decorate_view(conditional(table_state(Comment), private=False))
+@trusted_values(CommentSchema)
+@streamable(schema=CommentSchema)
+@paginate(KeysetPagination)
 def list_comments(request):
-    comments = Comment.objects.all()
-    return [
-        {
-            "id": c.id,
-            "content_id": c.content_id.id,
-            "member_id": c.member_id.id,
-            "comment": c.comment,
-        }
-        for c in comments
-    ]
+    return Comment.objects.values('id', 'content_id', 'member_id', 'comment', 'created_at')
+
+class CommentFeedItem(Schema):
+    id: int
+    comment: str
+    created_at: datetime
+    user_pk: Optional[int] = None
+    username: Optional[str] = None
+
+class CommentFeedOut(Schema):
+    items: List[CommentFeedItem]
+    next_cursor: Optional[str] = None
+
+# Feed komentar satu konten, terbaru lebih dulu (async, keyset cursor)
+@apiv1.get('contents/{id}/comments/', response={200: CommentFeedOut, 404: dict}, throttle=[])
+@throttle_async(*API_THROTTLES)
+async def contentComments(request, id: int, cursor: Optional[str] = None):
+    content = await CourseContent.objects.filter(pk=id).only('pk').afirst()
+    if content is None:
+        return 404, {"status": "Content tidak ditemukan"}
+    items, next_cursor = await acomment_feed(content, cursor)
+    return {'items': items, 'next_cursor': next_cursor}
 
 @apiv1.post('comments/', auth=apiAuth)
 def postComment(request, data: CommentIn):
@@ -346,4 +420,32 @@ def postComment(request, data: CommentIn):
         )
         return {"status": "berhasil"}
     else:
-        return {"status": "tidak boleh komentar di sini"}, 403
\ No newline at end of file
+        return {"status": "tidak boleh komentar di sini"}, 403
+
+# ============= COMPLETION ENDPOINTS =============
+class CompletionIn(Schema):
+    content_ids: List[int] = []
+    up_to: Optional[int] = None
+
+class ProgressOut(Schema):
+    completed_count: int
+    total_count: int
+    fully_completed: bool
+    last_activity: Optional[datetime] = None
+
+class CompletionOut(Schema):
+    created: int
+    already_completed: int
+    not_found: List[int]
+    progress: ProgressOut
+
+@apiv1.post('course/{id}/complete/', auth=userAuth, response={200: CompletionOut, 400: dict, 403: dict})
+def markCompletions(request, id: int, data: CompletionIn):
+    """Sinkronisasi banyak penyelesaian sekaligus (mis. dari klien mobile offline)."""
+    if not data.content_ids and data.up_to is None:
+        return 400, {"status": "Isi content_ids atau up_to"}
+
+    member = CourseMember.objects.filter(user_id=request.auth, course_id=id).first()
+    if member is None:
+        return 403, {"status": "Anda bukan anggota kursus ini"}
+    return complete_contents(member, data.content_ids, data.up_to)
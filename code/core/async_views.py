@@ -0,0 +1,121 @@
+# /code/core/async_views.py
+"""
+Versi async dari view baca yang paling ramai (katalog, detail course, daftar
+& detail konten, feed komentar). core/urls.py memasangnya menggantikan versi
+sync bila settings.ASYNC_VIEWS aktif, yaitu pada profil ASGI
+(gunicorn_asgi_config.py). Query memakai ORM async (aget, aexists, async for)
+sehingga request yang menunggu database tidak menahan satu thread pun.
+
+Template dirender setelah semua data dimuat: request.user diisi dari
+request.auser() dan tidak ada relasi lazy yang tersisa di context.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.shortcuts import aget_object_or_404, redirect, render
+from django.template.loader import render_to_string
+from ninja.errors import ValidationError as NinjaValidationError
+
+from .conditional import conditional, content_detail_state, content_list_state, course_state
+from .models import Course, CourseMember, CourseContent, Completion
+from .services import acomment_feed, apaginate
+from .views import CONTENTS_PER_PAGE, catalog_context, content_list_context, course_catalog
+
+
+async def _load_user(request):
+    # auser() sudah di-cache oleh AuthenticationMiddleware; request.user yang
+    # lazy akan memicu query sync saat template membaca {{ user }}
+    request.user = await request.auser()
+    return request.user
+
+
+async def course_list(request):
+    await _load_user(request)
+    query, sort_option = request.GET.get('q'), request.GET.get('sort')
+    # cache katalog (get_or_build) sinkron; builder-nya yang menjalankan query
+    courses = await sync_to_async(course_catalog)(query, sort_option)
+    context = {'courses': courses, 'object_list': courses, **catalog_context(query, sort_option)}
+    return render(request, 'course/course_list.html', context)
+
+
+@conditional(course_state)
+async def course_detail(request, pk):
+    user = await _load_user(request)
+    course = await aget_object_or_404(Course.objects.select_related('teacher'), pk=pk)
+    is_joined = user.is_authenticated and await CourseMember.objects.filter(
+        course_id=course, user_id=user
+    ).aexists()
+    return render(request, 'course/course_detail.html', {'course': course, 'object': course, 'is_joined': is_joined})
+
+
+@login_required(login_url='login')
+@conditional(content_list_state)
+async def course_content_list(request, course_pk):
+    user = await _load_user(request)
+    course = await aget_object_or_404(Course.objects.select_related('teacher'), pk=course_pk)
+
+    is_member = await CourseMember.objects.filter(course_id=course.pk, user_id=user.pk).aexists()
+    if not is_member and not user.is_staff:
+        messages.error(request, f"Anda harus terdaftar di kursus '{course.name}' untuk mengakses konten ini.")
+        return redirect('course_detail', pk=course.pk)
+
+    student_list = [
+        member.user_id async for member in CourseMember.objects.filter(
+            course_id=course.pk, user_id__is_staff=False, user_id__is_superuser=False
+        ).select_related('user_id')
+    ]
+    contents = CourseContent.objects.filter(course_id=course.pk).order_by('pk')
+    page_obj = await apaginate(contents, CONTENTS_PER_PAGE, request.GET.get('page'))
+
+    context = content_list_context(course, user, is_member, student_list, page_obj)
+    return render(request, 'course/course_content_list.html', context)
+
+
+async def _content_for_member(request, course_pk, content_pk):
+    user = await _load_user(request)
+    course = await aget_object_or_404(Course, pk=course_pk)
+    content = await aget_object_or_404(CourseContent, pk=content_pk, course_id=course)
+    content.course_id = course  # dipakai template (form komentar) tanpa query lagi
+    current_member = await CourseMember.objects.filter(course_id=course, user_id=user).afirst()
+    if current_member is None and not user.is_staff:
+        return None
+    return course, content, current_member
+
+
+@login_required(login_url='login')
+@conditional(content_detail_state)
+async def course_content_detail(request, course_pk, content_pk):
+    access = await _content_for_member(request, course_pk, content_pk)
+    if access is None:
+        messages.error(request, "Anda harus bergabung dengan kursus ini untuk melihat konten.")
+        return redirect('course_detail', pk=course_pk)
+    course, content, current_member = access
+
+    comments, next_cursor = await acomment_feed(content)
+    completed = current_member is not None and await Completion.objects.filter(
+        member_id=current_member, content_id=content
+    ).aexists()
+
+    context = {
+        'course': course,
+        'content': content,
+        'comments': comments,
+        'next_cursor': next_cursor,
+        'completed': completed,
+    }
+    return render(request, 'course/course_content_detail.html', context)
+
+
+@login_required(login_url='login')
+async def content_comments(request, course_pk, content_pk):
+    access = await _content_for_member(request, course_pk, content_pk)
+    if access is None:
+        return JsonResponse({'error': "Anda harus bergabung dengan kursus ini."}, status=403)
+
+    try:
+        comments, next_cursor = await acomment_feed(access[1], request.GET.get('cursor'))
+    except NinjaValidationError:
+        return JsonResponse({'error': "Cursor tidak valid."}, status=400)
+    html = render_to_string('comment/comment_items.html', {'comments': comments}, request=request)
+    return JsonResponse({'comments': comments, 'html': html, 'next_cursor': next_cursor})
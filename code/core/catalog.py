@@ -0,0 +1,149 @@
+# /code/core/catalog.py
+import hashlib
+import json
+import time
+from functools import wraps
+from typing import List
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from pydantic import TypeAdapter
+
+from .streaming import stream_format
+
+VERSION_KEY = 'catalog:version'
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def _cache():
+    return caches[getattr(settings, 'CATALOG_CACHE_ALIAS', 'default')]
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def shared_cache():
+    """
+    True bila CATALOG_CACHE_ALIAS memakai backend bersama (file/redis/memcached).
+    Cache per proses (LocMem) membuat setiap worker punya versi sendiri, jadi
+    versi di situ tidak boleh dipakai sebagai validator ETag.
+    """
+    backend = settings.CACHES[getattr(settings, 'CATALOG_CACHE_ALIAS', 'default')]['BACKEND']
+    return backend not in LOCAL_CACHE_BACKENDS
+
+
+def _version(key):
+    cache = _cache()
+    version = cache.get(key)
+    if version is None:
+        # versi awal berbasis waktu supaya tidak pernah sama dengan entri lama
+        cache.add(key, int(time.time() * 1000), None)
+        version = cache.get(key)
+    return version
+
+
+def _bump(key):
+    cache = _cache()
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = int(time.time() * 1000)
+        cache.set(key, version, None)
+        return version
+
+
+def _table_key(model):
+    return f'table:{model._meta.label_lower}:version'
+
+
+def catalog_version():
+    """Nomor versi katalog saat ini; berubah setiap kali course/member/konten ditulis."""
+    return _version(VERSION_KEY)
+
+
+def bump_catalog_version():
+    return _bump(VERSION_KEY)
+
+
+def table_version(model):
+    """Nomor versi isi tabel `model`; dinaikkan signal/importer setelah commit."""
+    return _version(_table_key(model))
+
+
+def bump_table_version(model):
+    return _bump(_table_key(model))
+
+
+def get_or_build(name, builder):
+    """
+    Ambil nilai katalog dari cache, dibangun ulang oleh `builder()` bila versinya
+    sudah basi. Pola stale-while-revalidate: hanya satu request (pemegang lock)
+    yang membangun ulang, request lain tetap dilayani nilai lama. Untuk key yang
+    benar-benar kosong, request lain menunggu sebentar hasil pemegang lock
+    daripada ikut menghantam database.
+    """
+    cache = _cache()
+    key = 'catalog:' + hashlib.sha1(name.encode()).hexdigest()
+    lock_key = f'{key}:lock'
+    version = catalog_version()
+    ttl = _setting('CATALOG_CACHE_TTL', 300)
+
+    entry = cache.get(key)
+    if entry is not None:
+        entry_version, built_at, value = entry
+        if entry_version == version and time.time() - built_at < ttl:
+            return value
+
+    if cache.add(lock_key, 1, _setting('CATALOG_CACHE_LOCK_TIMEOUT', 30)):
+        try:
+            value = builder()
+            cache.set(key, (version, time.time(), value), _setting('CATALOG_CACHE_TIMEOUT', 60 * 60 * 24))
+            return value
+        finally:
+            cache.delete(lock_key)
+
+    if entry is not None:
+        return entry[2]
+
+    deadline = time.monotonic() + _setting('CATALOG_CACHE_COLD_WAIT', 2.0)
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[2]
+    return builder()
+
+
+def cached_page(name, schema):
+    """
+    Dekorator endpoint ninja yang sudah di-@paginate: halaman hasil diserialisasi
+    sekali menjadi bytes JSON lalu disimpan per (versi katalog, query string).
+    Permintaan streaming (?format=ndjson) dilewatkan apa adanya.
+    """
+    adapter = TypeAdapter(List[schema])
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, **kwargs):
+            if stream_format(request):
+                return view_func(request, **kwargs)
+
+            def build():
+                page = view_func(request, **kwargs)
+                items = adapter.dump_python(adapter.validate_python(page['items']), mode='json')
+                return json.dumps(dict(page, items=items), cls=DjangoJSONEncoder).encode()
+
+            params = urlencode(sorted(request.GET.lists()), doseq=True)
+            body = get_or_build(f'{name}?{params}', build)
+            return HttpResponse(body, content_type='application/json')
+
+        return wrapper
+
+    return decorator
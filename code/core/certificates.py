@@ -0,0 +1,390 @@
+# /code/core/certificates.py
+import hashlib
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F
+from django.template.loader import get_template, render_to_string
+
+from .counters import count_subquery
+from .pdfworker import init_worker, render_pdf
+
+logger = logging.getLogger('core.certificates')
+
+CERTIFICATE_TEMPLATE = 'completion/certif.html'
+CERTIFICATE_STYLESHEET = 'completion/certif.css'
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def certificate_name(user):
+    return f"{user.first_name} {user.last_name}".strip() or user.username
+
+
+def _template_source(template_name):
+    return get_template(template_name).template.source
+
+
+@lru_cache(maxsize=None)
+def template_hash():
+    """Hash template + stylesheet; mengubah desain sertifikat otomatis membatalkan cache."""
+    source = _template_source(CERTIFICATE_TEMPLATE) + _template_source(CERTIFICATE_STYLESHEET)
+    return hashlib.sha256(source.encode()).hexdigest()[:16]
+
+
+def certificate_path(user, course, full_name):
+    """
+    Lokasi PDF di cache disk, content-addressed oleh (user, course, hash template,
+    nama). Nama ikut di-hash karena tercetak di sertifikat: ganti nama = file baru.
+    """
+    raw = f'{user.pk}:{course.pk}:{template_hash()}:{full_name}'
+    digest = hashlib.sha256(raw.encode()).hexdigest()
+    return Path(_setting('CERTIFICATE_CACHE_DIR', settings.BASE_DIR / 'certificate_cache')) / digest[:2] / f'{digest}.pdf'
+
+
+def render_certificate_html(course, full_name, external_stylesheet=False):
+    return render_to_string(CERTIFICATE_TEMPLATE, {
+        'full_name': full_name,
+        'course_name': course.name,
+        'external_stylesheet': external_stylesheet,
+    })
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn: proses anak tidak mewarisi koneksi database/thread dari worker gunicorn
+            context = multiprocessing.get_context(_setting('CERTIFICATE_MP_CONTEXT', 'spawn'))
+            _executor = ProcessPoolExecutor(max_workers=_setting('CERTIFICATE_WORKERS', 2), mp_context=context)
+        return _executor
+
+
+def _reset_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = None
+
+
+def _claim(lock_path, timeout=None):
+    """
+    Tandai render sedang berjalan dengan lock file, supaya worker gunicorn lain
+    yang menerima request poll tidak merender ulang. Lock yang lebih tua dari
+    `timeout` (default CERTIFICATE_RENDER_TIMEOUT) dianggap milik render yang gagal.
+    """
+    timeout = timeout if timeout is not None else _setting('CERTIFICATE_RENDER_TIMEOUT', 120)
+    try:
+        fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        try:
+            age = time.time() - os.path.getmtime(lock_path)
+        except FileNotFoundError:
+            return _claim(lock_path, timeout)
+        if age < timeout:
+            return False
+        os.remove(lock_path)
+        return _claim(lock_path, timeout)
+    os.close(fd)
+    return True
+
+
+def _release(lock_path):
+    try:
+        os.remove(lock_path)
+    except FileNotFoundError:
+        pass
+
+
+def _failure_path(path):
+    return Path(f'{path}.failed')
+
+
+def ensure_certificate(path, build_html):
+    """
+    True jika PDF di `path` sudah siap. Jika belum, jadwalkan render di process
+    pool (sekali untuk semua worker) dan kembalikan False. `build_html()` hanya
+    dipanggil bila render benar-benar perlu dijadwalkan. Penanda gagal dari
+    render sebelumnya dihapus: memanggil fungsi ini berarti mencoba lagi.
+
+    Dengan CERTIFICATE_WORKERS = 0 render dijalankan langsung di request.
+    """
+    if path.exists():
+        return True
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _failure_path(path).unlink(missing_ok=True)
+    lock_path = f'{path}.lock'
+    if not _claim(lock_path):
+        return False
+
+    html = build_html()
+    if not _setting('CERTIFICATE_WORKERS', 2):
+        try:
+            render_pdf(html, str(path))
+        finally:
+            _release(lock_path)
+        return True
+
+    def done(future):
+        if future.exception() is not None:
+            logger.error("Render sertifikat %s gagal", path, exc_info=future.exception())
+            # dicatat sebelum lock dilepas supaya poll tidak sempat menjadwalkan ulang
+            _failure_path(path).touch()
+        _release(lock_path)
+
+    try:
+        future = _get_executor().submit(render_pdf, html, str(path))
+    except BrokenProcessPool:
+        # proses anak mati (mis. OOM); buat pool baru pada request berikutnya
+        _reset_executor()
+        _release(lock_path)
+        raise
+    future.add_done_callback(done)
+    return False
+
+
+def certificate_state(path, build_html):
+    """
+    Status untuk poll: 'ready', 'pending' atau 'failed' (render terakhir error;
+    dicoba lagi lewat ensure_certificate). Render yang hilang tanpa kabar, mis.
+    worker gunicorn-nya mati, dijadwalkan ulang setelah lock-nya kedaluwarsa.
+    """
+    if path.exists():
+        return 'ready'
+    if _failure_path(path).exists():
+        return 'failed'
+    return 'ready' if ensure_certificate(path, build_html) else 'pending'
+
+
+# --- BATCH SATU COURSE ---
+
+def eligible_members(course):
+    """Siswa yang sudah menyelesaikan semua konten course, dalam satu query."""
+    from .models import CourseMember, Completion
+
+    completed = count_subquery(Completion, 'member_id', content_id__course_id=course.pk)
+    return (
+        CourseMember.objects.filter(course_id=course, roles='std', course_id__num_contents__gt=0)
+        .annotate(completed=completed)
+        .filter(completed__gte=F('course_id__num_contents'))
+        .select_related('user_id')
+        .order_by('user_id__username')
+    )
+
+
+def iter_course_certificates(course, workers=None, members=None):
+    """
+    Yield (nama file di zip, path PDF) untuk setiap siswa yang lulus. PDF yang
+    sudah ada di cache disk langsung dipakai; sisanya dirender paralel di
+    process pool yang setiap workernya mem-parse stylesheet & font sekali.
+    Hasil tetap mengikuti urutan siswa, dengan jumlah render yang sedang
+    berjalan dibatasi supaya memori tidak ikut tumbuh dengan ukuran kelas.
+    """
+    pending = []
+    for member in eligible_members(course) if members is None else members:
+        user = member.user_id
+        full_name = certificate_name(user)
+        path = certificate_path(user, course, full_name)
+        pending.append((f'Sertifikat_{user.username}.pdf', path, full_name))
+
+    workers = workers or _setting('CERTIFICATE_BATCH_WORKERS', None) or os.cpu_count()
+    context = multiprocessing.get_context(_setting('CERTIFICATE_MP_CONTEXT', 'spawn'))
+    executor = None
+    in_flight = deque()
+    try:
+        for entry, path, full_name in pending:
+            future = None
+            if not path.exists():
+                if executor is None:
+                    executor = ProcessPoolExecutor(
+                        max_workers=workers, mp_context=context,
+                        initializer=init_worker, initargs=(_template_source(CERTIFICATE_STYLESHEET),),
+                    )
+                path.parent.mkdir(parents=True, exist_ok=True)
+                html = render_certificate_html(course, full_name, external_stylesheet=True)
+                future = executor.submit(render_pdf, html, str(path))
+            in_flight.append((entry, path, future))
+            while in_flight and (len(in_flight) > workers * 4 or _is_ready(in_flight[0])):
+                yield _finish(in_flight.popleft())
+        while in_flight:
+            yield _finish(in_flight.popleft())
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def _is_ready(item):
+    future = item[2]
+    return future is None or future.done()
+
+
+def _finish(item):
+    entry, path, future = item
+    if future is not None:
+        future.result()
+    return entry, path
+
+
+class _ZipStream:
+    """File tulis-saja untuk zipfile; isinya diambil per potong oleh iter_zip()."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data, self.chunks = b''.join(self.chunks), []
+        return data
+
+
+def iter_zip(entries):
+    """Stream arsip ZIP dari (nama, path); PDF sudah terkompresi jadi disimpan apa adanya."""
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, 'w', zipfile.ZIP_STORED) as archive:
+        for name, path in entries:
+            archive.write(path, arcname=name)
+            yield stream.drain()
+    yield stream.drain()
+
+
+# --- ZIP SATU COURSE (dibangun di luar request) ---
+
+_zip_executor = None
+
+
+def _zip_dir():
+    return Path(_setting('CERTIFICATE_CACHE_DIR', settings.BASE_DIR / 'certificate_cache')) / 'zip'
+
+
+def _queue_dir():
+    return _zip_dir() / 'queue'
+
+
+def course_zip_path(course, members):
+    """
+    Lokasi ZIP course, content-addressed oleh template dan daftar (siswa, nama)
+    yang lulus: siswa baru lulus atau ganti nama = ZIP baru.
+    """
+    raw = ':'.join([str(course.pk), template_hash(), *(
+        f'{member.user_id_id}={certificate_name(member.user_id)}' for member in members
+    )])
+    return _zip_dir() / f'{course.pk}-{hashlib.sha256(raw.encode()).hexdigest()[:20]}.zip'
+
+
+def build_course_zip(course, workers=None, output=None):
+    """
+    Render sertifikat yang belum ada dan tulis ZIP course. File ditulis ke
+    nama sementara lalu di-rename, jadi view tidak pernah menyajikan ZIP
+    setengah jadi; ZIP lama course yang sama dihapus. Return path ZIP.
+    """
+    members = list(eligible_members(course))
+    path = Path(output) if output else course_zip_path(course, members)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    try:
+        with open(tmp, 'wb') as archive:
+            for chunk in iter_zip(iter_course_certificates(course, workers, members)):
+                archive.write(chunk)
+        os.replace(tmp, path)
+    finally:
+        Path(tmp).unlink(missing_ok=True)
+    if not output:
+        for old in path.parent.glob(f'{course.pk}-*.zip'):
+            if old != path:
+                old.unlink(missing_ok=True)
+    return path
+
+
+def build_queued_zip(course_id, path):
+    """Bangun ZIP yang dijadwalkan course_zip_state, lalu lepas lock dan entri antreannya."""
+    from .models import Course
+
+    try:
+        course = Course.objects.filter(pk=course_id).first()
+        if course is not None:
+            build_course_zip(course)
+    except Exception:
+        logger.exception("ZIP sertifikat course %s gagal dibuat", course_id)
+        _failure_path(path).touch()
+    finally:
+        (_queue_dir() / str(course_id)).unlink(missing_ok=True)
+        _release(f'{path}.lock')
+
+
+def _build_in_thread(course_id, path):
+    try:
+        build_queued_zip(course_id, path)
+    finally:
+        connection.close()
+
+
+def _get_zip_executor():
+    global _zip_executor
+    with _executor_lock:
+        if _zip_executor is None:
+            # satu ZIP pada satu waktu per worker: tiap build sudah memakai process pool sendiri
+            _zip_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='certificate-zip')
+        return _zip_executor
+
+
+def course_zip_state(course, retry=False):
+    """
+    ('ready' | 'pending' | 'failed', path) untuk ZIP course. Bila belum ada,
+    build dijadwalkan sesuai CERTIFICATE_ZIP_RUNNER ('thread', 'command' atau
+    'sync'). `retry` menghapus penanda gagal dari build sebelumnya. Build yang
+    hilang (proses mati) dijadwalkan ulang setelah CERTIFICATE_ZIP_TIMEOUT.
+    """
+    path = course_zip_path(course, eligible_members(course))
+    if path.exists():
+        return 'ready', path
+    if retry:
+        _failure_path(path).unlink(missing_ok=True)
+    elif _failure_path(path).exists():
+        return 'failed', path
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if not _claim(f'{path}.lock', _setting('CERTIFICATE_ZIP_TIMEOUT', 1800)):
+        return 'pending', path
+
+    runner = _setting('CERTIFICATE_ZIP_RUNNER', 'thread')
+    if runner == 'sync':
+        build_queued_zip(course.pk, path)
+        return ('ready' if path.exists() else 'failed'), path
+    if runner == 'command':
+        _queue_dir().mkdir(parents=True, exist_ok=True)
+        (_queue_dir() / str(course.pk)).write_text(str(path))
+    else:
+        _get_zip_executor().submit(_build_in_thread, course.pk, path)
+    return 'pending', path
+
+
+def queued_zip_courses():
+    """(course_id, path ZIP) yang menunggu `manage.py generate_course_certificates --queued`."""
+    queue = _queue_dir()
+    if not queue.is_dir():
+        return []
+    return [(int(entry.name), Path(entry.read_text())) for entry in sorted(queue.iterdir()) if entry.name.isdigit()]
@@ -0,0 +1,95 @@
+# /code/core/completions.py
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from .counters import adjust_counters
+from .progress import adjust_progress
+
+
+def progress_status(member):
+    from .models import MemberProgress
+
+    progress = MemberProgress.objects.filter(member_id=member).values(
+        'completed_count', 'total_count', 'fully_completed', 'last_activity'
+    ).first()
+    return progress or {'completed_count': 0, 'total_count': 0, 'fully_completed': False, 'last_activity': None}
+
+
+RETURNING_VENDORS = ('postgresql', 'sqlite')
+INSERT_BATCH_SIZE = 500
+
+
+def _insert_completions(member, content_ids):
+    """
+    INSERT Completion untuk `content_ids`, melewati yang sudah ada. Return
+    jumlah baris yang benar-benar ditulis: baris yang didahului request lain
+    (mis. mark_content_complete yang tidak memakai lock progres) tidak ikut
+    dihitung, karena counter-nya sudah digeser oleh signal request itu.
+    """
+    from .models import Completion
+
+    if connection.vendor not in RETURNING_VENDORS:
+        # tanpa RETURNING: hanya akurat selama semua penulis memakai lock progres
+        Completion.objects.bulk_create(
+            [Completion(member_id=member, content_id_id=pk) for pk in content_ids], ignore_conflicts=True,
+        )
+        return len(content_ids)
+
+    qn = connection.ops.quote_name
+    meta = Completion._meta
+    columns = ', '.join(qn(meta.get_field(name).column) for name in ('member_id', 'content_id', 'last_update'))
+    now = timezone.now()
+    created = 0
+    with connection.cursor() as cursor:
+        for start in range(0, len(content_ids), INSERT_BATCH_SIZE):
+            batch = content_ids[start:start + INSERT_BATCH_SIZE]
+            # bulk_create(ignore_conflicts=True) tidak memberi tahu baris mana yang dilewati
+            cursor.execute(
+                f"INSERT INTO {qn(meta.db_table)} ({columns}) VALUES {', '.join(['(%s, %s, %s)'] * len(batch))} "
+                f"ON CONFLICT DO NOTHING RETURNING {qn(meta.get_field('content_id').column)}",
+                [value for pk in batch for value in (member.pk, pk, now)],
+            )
+            created += len(cursor.fetchall())
+    return created
+
+
+def complete_contents(member, content_ids=(), up_to=None):
+    """
+    Tandai banyak konten selesai sekaligus untuk satu anggota: konten di
+    `content_ids` dan/atau semua konten course dengan id <= `up_to` (urutan
+    daftar konten). Satu query membaca status konten, satu INSERT (ignore
+    conflicts ... RETURNING) menyimpan Completion yang belum ada; `created`
+    hanya menghitung baris yang benar-benar ditulis.
+
+    bulk_create tidak memicu signal, jadi counter course dan progres anggota
+    digeser di sini. Baris progres dikunci lebih dulu supaya sinkronisasi
+    paralel anggota yang sama tidak menghitung konten yang sama dua kali.
+    """
+    from .models import Completion, CourseContent, MemberProgress
+
+    content_ids = list(dict.fromkeys(content_ids))
+    selected = Q(pk__in=content_ids)
+    if up_to is not None:
+        selected |= Q(pk__lte=up_to)
+
+    with transaction.atomic():
+        list(MemberProgress.objects.select_for_update().filter(member_id=member).values_list('pk'))
+        done = Completion.objects.filter(member_id=member, content_id=OuterRef('pk'))
+        contents = dict(
+            CourseContent.objects.filter(selected, course_id=member.course_id_id)
+            .annotate(done=Exists(done))
+            .values_list('pk', 'done')
+        )
+        missing = [pk for pk, is_done in contents.items() if not is_done]
+        created = _insert_completions(member, missing) if missing else 0
+        if created:
+            adjust_counters(member.course_id_id, num_completions=created)
+            adjust_progress(MemberProgress.objects.filter(member_id=member), completed=created, touch=True)
+
+    return {
+        'created': created,
+        'already_completed': len(contents) - created,
+        'not_found': [pk for pk in content_ids if pk not in contents],
+        'progress': progress_status(member),
+    }
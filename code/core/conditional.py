@@ -0,0 +1,188 @@
+# /code/core/conditional.py
+"""
+Conditional GET (ETag / Last-Modified) untuk halaman dan endpoint yang sering
+di-poll aplikasi mobile. Validator halaman dihitung dengan satu query ringan
+(MAX updated_at dan counter pada Course) sebelum view dijalankan; endpoint
+list API memakai nomor versi di cache katalog tanpa query sama sekali. Bila
+cocok dengan If-None-Match, view tidak dipanggil sama sekali sehingga tidak
+ada render template maupun serialisasi JSON.
+
+Keputusan 304 hanya memakai ETag: MAX(updated_at) tidak berubah saat baris
+dihapus, jadi If-Modified-Since saja tidak cukup aman. Last-Modified tetap
+dikirim sebagai informasi.
+"""
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.contrib.messages import get_messages
+from django.middleware.csrf import get_token
+from django.db.models import Exists, Max, OuterRef, Subquery
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .catalog import catalog_version, shared_cache, table_version
+from .counters import count_subquery
+from .models import Comment, Completion, Course, CourseContent, CourseMember
+from .streaming import stream_format
+
+COURSE_STATE = (
+    'updated_at', 'num_students', 'num_assistants', 'num_contents', 'num_comments', 'num_completions',
+    'teacher__username', 'teacher__first_name', 'teacher__last_name',
+)
+
+
+def make_etag(*parts):
+    # weak: isi HTML berbeda per render (token CSRF di-mask ulang) walau setara
+    return 'W/"%s"' % hashlib.sha1(repr(parts).encode()).hexdigest()[:20]
+
+
+def _latest(*timestamps):
+    timestamps = [ts for ts in timestamps if ts is not None]
+    return max(timestamps) if timestamps else None
+
+
+def _viewer(request):
+    """Bagian ETag untuk halaman HTML: user di navbar dan secret CSRF di form."""
+    user = request.user
+    get_token(request)  # secret baru (request pertama) ikut dikirim sebagai cookie
+    return user.pk, user.get_username(), user.is_staff, user.is_superuser, request.META.get('CSRF_COOKIE')
+
+
+def _latest_subquery(model, outer_path, outer='pk'):
+    return Subquery(
+        model.objects.filter(**{outer_path: OuterRef(outer)}).order_by().values(outer_path)
+        .annotate(latest=Max('updated_at')).values('latest')
+    )
+
+
+def _respond(request, state):
+    """(respons 304 atau None, etag, last_modified) untuk hasil validators."""
+    etag, last_modified = make_etag(request.get_full_path(), *state[0]), state[1]
+    # last_modified sengaja tidak ikut: If-Modified-Since saja tidak dipercaya
+    return get_conditional_response(request, etag=etag), etag, last_modified
+
+
+def _finish(response, etag, last_modified, private):
+    if response.status_code in (200, 304):
+        if not response.has_header('ETag'):
+            response['ETag'] = etag
+        if last_modified is not None and not response.has_header('Last-Modified'):
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        # tanpa ini browser boleh memakai freshness heuristik dari Last-Modified
+        patch_cache_control(response, no_cache=True, **({'private': True} if private else {}))
+    return response
+
+
+def _skip(request):
+    # pesan flash yang belum tampil harus dirender di halaman berikutnya
+    return request.method not in ('GET', 'HEAD') or len(get_messages(request))
+
+
+def conditional(validators, private=True):
+    """
+    Dekorator view (sync/async) dan operation ninja (lewat decorate_view).
+    `validators(request, *args, **kwargs)` mengembalikan (parts, last_modified)
+    atau None bila kondisi tidak bisa dihitung (mis. objek tidak ada) dan view
+    dijalankan seperti biasa. `parts` harus berubah setiap kali isi respons berubah.
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                if _skip(request):
+                    return await view(request, *args, **kwargs)
+                if hasattr(request, 'auser'):
+                    request.user = await request.auser()
+                state = await sync_to_async(validators)(request, *args, **kwargs)
+                if state is None:
+                    return await view(request, *args, **kwargs)
+                response, etag, last_modified = _respond(request, state)
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                return _finish(response, etag, last_modified, private)
+
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if _skip(request):
+                return view(request, *args, **kwargs)
+            state = validators(request, *args, **kwargs)
+            if state is None:
+                return view(request, *args, **kwargs)
+            response, etag, last_modified = _respond(request, state)
+            if response is None:
+                response = view(request, *args, **kwargs)
+            return _finish(response, etag, last_modified, private)
+
+        return wrapper
+
+    return decorator
+
+
+# --- Validator halaman ---
+
+def course_state(request, pk):
+    """Detail course: baris course (termasuk counter) dan status gabung user."""
+    row = Course.objects.filter(pk=pk).values_list(
+        *COURSE_STATE,
+        Exists(CourseMember.objects.filter(course_id=OuterRef('pk'), user_id=request.user.pk)),
+    ).first()
+    if row is None:
+        return None
+    return (_viewer(request), row), row[0]
+
+
+def content_list_state(request, course_pk):
+    """Daftar konten: course, konten (MAX updated_at; jumlahnya ada di counter) dan anggota."""
+    row = Course.objects.filter(pk=course_pk).values_list(
+        *COURSE_STATE,
+        _latest_subquery(CourseContent, 'course_id'),
+        _latest_subquery(CourseMember, 'course_id'),
+        Exists(CourseMember.objects.filter(course_id=OuterRef('pk'), user_id=request.user.pk)),
+    ).first()
+    if row is None:
+        return None
+    return (_viewer(request), row), _latest(row[0], row[-3], row[-2])
+
+
+def content_detail_state(request, course_pk, content_pk):
+    """Detail konten: konten, course, komentar (jumlah & MAX updated_at) dan status selesai user."""
+    row = CourseContent.objects.filter(pk=content_pk, course_id=course_pk).values_list(
+        'updated_at', 'course_id__updated_at', 'course_id__name',
+        count_subquery(Comment, 'content_id'),
+        _latest_subquery(Comment, 'content_id'),
+        Exists(CourseMember.objects.filter(course_id=OuterRef('course_id'), user_id=request.user.pk)),
+        Exists(Completion.objects.filter(content_id=OuterRef('pk'), member_id__user_id=request.user.pk)),
+    ).first()
+    if row is None:
+        return None
+    return (_viewer(request), row), _latest(row[0], row[1], row[4])
+
+
+# --- Validator API ---
+
+def catalog_state(request, **kwargs):
+    """
+    Katalog publik: versi katalog naik setiap course/member/konten ditulis
+    (tanpa query). Tanpa cache bersama tidak ada ETag: versi per proses bisa
+    sama di worker lain untuk isi yang berbeda.
+    """
+    if not shared_cache():
+        return None
+    return (catalog_version(), stream_format(request)), None
+
+
+def table_state(model):
+    """
+    Endpoint list seluruh tabel: versi tabel di cache katalog, dinaikkan signal
+    post_save/post_delete dan importer setelah commit (tanpa query). Penulisan
+    massal lain (bulk_create, update()) wajib memanggil bump_table_version.
+    """
+    def validators(request, **kwargs):
+        if not shared_cache():
+            return None
+        return (model._meta.label_lower, table_version(model), stream_format(request)), None
+
+    return validators
@@ -0,0 +1,68 @@
+# /code/core/counters.py
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+# Kolom counter terdenormalisasi pada Course
+COUNTER_FIELDS = ('num_students', 'num_assistants', 'num_contents', 'num_comments', 'num_completions')
+
+ROLE_COUNTERS = {'std': 'num_students', 'ast': 'num_assistants'}
+
+
+def _counter_sources():
+    # nama_kolom -> (model sumber, path ke course, filter tambahan)
+    from .models import CourseMember, CourseContent, Comment, Completion
+    return {
+        'num_students': (CourseMember, 'course_id', {'roles': 'std'}),
+        'num_assistants': (CourseMember, 'course_id', {'roles': 'ast'}),
+        'num_contents': (CourseContent, 'course_id', {}),
+        'num_comments': (Comment, 'content_id__course_id', {}),
+        'num_completions': (Completion, 'content_id__course_id', {}),
+    }
+
+
+def count_subquery(model, course_path, outer='pk', **filters):
+    """COUNT berkorelasi per course, aman dipakai di annotate() maupun update()."""
+    counts = (
+        model.objects.filter(**{course_path: OuterRef(outer)}, **filters)
+        .order_by()
+        .values(course_path)
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def adjust_counters(course, **deltas):
+    """
+    Naik/turunkan counter Course secara atomik dengan F-expression.
+
+    `course` boleh berupa instance Course, pk, atau ekspresi query yang
+    menghasilkan pk. Jika berupa instance, nilainya di memori ikut diperbarui
+    supaya objek yang sedang dipakai tidak basi.
+    """
+    from .models import Course
+
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas or course is None:
+        return
+
+    course_pk = course.pk if isinstance(course, Course) else course
+    Course.objects.filter(pk=course_pk).update(**{
+        field: Greatest(F(field) + delta, Value(0)) for field, delta in deltas.items()
+    })
+
+    if isinstance(course, Course):
+        for field, delta in deltas.items():
+            setattr(course, field, max(getattr(course, field) + delta, 0))
+
+
+def rebuild_counters(queryset=None):
+    """Hitung ulang semua counter dari tabel sumber dalam satu UPDATE."""
+    from .models import Course
+
+    if queryset is None:
+        queryset = Course.objects.all()
+    return queryset.update(**{
+        field: count_subquery(model, path, **filters)
+        for field, (model, path, filters) in _counter_sources().items()
+    })
@@ -0,0 +1,176 @@
+# /code/core/downloads.py
+"""
+Pengiriman file lampiran (FileField) lewat view yang sudah memeriksa akses.
+
+- Header Range (satu rentang byte) dijawab 206 Partial Content, sehingga
+  video bisa di-seek dan download yang putus bisa dilanjutkan.
+- If-None-Match / If-Range memakai ETag dari nama, ukuran dan mtime file.
+- DOWNLOAD_OFFLOAD = 'x-accel' (nginx) atau 'x-sendfile' (Apache/lighttpd):
+  Django hanya mengirim header, byte file dikirim oleh proxy di depan sehingga
+  worker gunicorn langsung bebas. Tanpa offload file di-stream per blok;
+  di gunicorn sync respons file penuh memakai sendfile() lewat wsgi.file_wrapper.
+"""
+import hashlib
+import mimetypes
+import posixpath
+import re
+from urllib.parse import quote
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.utils.http import content_disposition_header, http_date, parse_etags
+
+OFFLOAD_MODES = ('x-accel', 'x-sendfile')
+BLOCK_SIZE = 64 * 1024
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def parse_range(header, size):
+    """
+    (start, end) inklusif dari header Range, atau None bila header tidak ada
+    atau tidak didukung (multi-range, sintaks salah): file dikirim utuh.
+    Raise RangeNotSatisfiable bila rentangnya di luar ukuran file.
+    """
+    match = _RANGE_RE.match((header or '').replace(' ', ''))
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise RangeNotSatisfiable
+        return max(size - suffix, 0), size - 1
+
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+class _FileRange:
+    """File-like yang hanya membaca `length` byte mulai posisi sekarang."""
+
+    def __init__(self, filelike, length):
+        self.filelike = filelike
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.filelike.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.filelike.close()
+
+
+async def _aiter_file(filelike, block_size):
+    # ASGI: iterator sync akan ditampung seluruhnya di memori oleh Django,
+    # jadi setiap blok dibaca di thread dan dikirim satu per satu
+    read = sync_to_async(filelike.read, thread_sensitive=False)
+    try:
+        while chunk := await read(block_size):
+            yield chunk
+    finally:
+        filelike.close()
+
+
+def _set_headers(response, headers):
+    for name, value in headers.items():
+        response[name] = value
+
+
+def _not_modified(request, etag, last_modified):
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        # perbandingan lemah (RFC 9110 13.1.2)
+        return '*' in etags or etag.removeprefix('W/') in {tag.removeprefix('W/') for tag in etags}
+    return request.headers.get('If-Modified-Since') == last_modified
+
+
+def _range_allowed(request, etag, last_modified):
+    if_range = request.headers.get('If-Range')
+    return if_range is None or if_range in (etag, last_modified)
+
+
+def serve_file(request, fieldfile, filename=None, as_attachment=True):
+    """Respons untuk isi `fieldfile`; pemeriksaan akses dilakukan pemanggil."""
+    storage, name = fieldfile.storage, fieldfile.name
+    try:
+        size = storage.size(name)
+        modified = storage.get_modified_time(name)
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404("File tidak ditemukan")
+
+    etag = '"%s"' % hashlib.sha1(f'{name}:{size}:{modified.timestamp()}'.encode()).hexdigest()[:20]
+    last_modified = http_date(modified.timestamp())
+    validators = {'ETag': etag, 'Last-Modified': last_modified, 'Cache-Control': 'private, no-cache'}
+
+    if _not_modified(request, etag, last_modified):
+        response = HttpResponseNotModified()
+        _set_headers(response, validators)
+        return response
+
+    filename = filename or posixpath.basename(name)
+    content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    mode = _setting('DOWNLOAD_OFFLOAD', None)
+
+    if mode in OFFLOAD_MODES:
+        # Range & If-None-Match dari klien dijawab langsung oleh proxy
+        response = HttpResponse(content_type=content_type)
+        if mode == 'x-accel':
+            prefix = _setting('DOWNLOAD_ACCEL_PREFIX', '/protected-media/')
+            response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(name)
+        else:
+            response['X-Sendfile'] = storage.path(name)
+    elif mode:
+        raise ValueError(f"DOWNLOAD_OFFLOAD harus None atau salah satu dari {OFFLOAD_MODES}")
+    else:
+        try:
+            byte_range = parse_range(request.headers.get('Range'), size) if _range_allowed(
+                request, etag, last_modified) else None
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            _set_headers(response, validators)
+            return response
+
+        filelike = storage.open(name, 'rb')
+        status, length = 200, size
+        if byte_range is not None:
+            start, end = byte_range
+            status, length = 206, end - start + 1
+            filelike.seek(start)
+            filelike = _FileRange(filelike, length)
+
+        block_size = _setting('DOWNLOAD_BLOCK_SIZE', BLOCK_SIZE)
+        content = _aiter_file(filelike, block_size) if isinstance(request, ASGIRequest) else filelike
+        response = FileResponse(content, status=status, content_type=content_type)
+        response.block_size = block_size
+        response['Content-Length'] = length
+        if status == 206:
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+
+    response['Accept-Ranges'] = 'bytes'
+    response['Content-Disposition'] = content_disposition_header(as_attachment, filename)
+    _set_headers(response, validators)
+    return response
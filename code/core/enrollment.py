@@ -0,0 +1,90 @@
+# /code/core/enrollment.py
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from .catalog import bump_catalog_version
+from .counters import ROLE_COUNTERS, adjust_counters
+from .progress import rebuild_progress
+from .stats import invalidate_user_stats
+
+ENROLL_BATCH_SIZE = 1000
+MAX_NOT_FOUND_REPORTED = 100
+
+
+def _batches(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def resolve_users(user_ids=(), usernames=(), batch_size=ENROLL_BATCH_SIZE):
+    """ID user (urut, tanpa duplikat) dari campuran id & username, plus yang tidak ditemukan."""
+    User = get_user_model()
+    found, not_found = {}, []
+
+    user_ids = list(dict.fromkeys(user_ids))
+    for batch in _batches(user_ids, batch_size):
+        existing = set(User.objects.filter(pk__in=batch).values_list('pk', flat=True))
+        for pk in batch:
+            if pk in existing:
+                found[pk] = None
+            else:
+                not_found.append(pk)
+
+    usernames = list(dict.fromkeys(usernames))
+    for batch in _batches(usernames, batch_size):
+        existing = dict(User.objects.filter(username__in=batch).values_list('username', 'pk'))
+        for username in batch:
+            if username in existing:
+                found[existing[username]] = None
+            else:
+                not_found.append(username)
+
+    return list(found), not_found
+
+
+def bulk_enroll(course, user_ids=(), usernames=(), roles='std', batch_size=ENROLL_BATCH_SIZE):
+    """
+    Daftarkan banyak user ke satu course sekaligus. Per batch: satu query untuk
+    anggota yang sudah ada, lalu bulk_create(ignore_conflicts=True) sehingga
+    pendaftaran paralel tidak menghasilkan duplikat (unique_course_member).
+
+    bulk_create tidak memicu signal, jadi baris progres, counter course, versi
+    katalog dan statistik user diperbarui di sini.
+    """
+    from .models import CourseMember
+
+    resolved, not_found = resolve_users(user_ids, usernames, batch_size)
+    created = 0
+    for batch in _batches(resolved, batch_size):
+        with transaction.atomic():
+            enrolled = set(
+                CourseMember.objects.filter(course_id=course, user_id__in=batch).values_list('user_id', flat=True)
+            )
+            new_ids = [pk for pk in batch if pk not in enrolled]
+            if not new_ids:
+                continue
+            CourseMember.objects.bulk_create(
+                [CourseMember(course_id=course, user_id_id=pk, roles=roles) for pk in new_ids],
+                ignore_conflicts=True,
+            )
+            # anggota hasil bulk_create belum punya baris progres (signal tidak jalan);
+            # yang kalah balapan dengan pendaftaran lain sudah punya
+            inserted = list(
+                CourseMember.objects.filter(course_id=course, user_id__in=new_ids, progress__isnull=True)
+                .values_list('pk', flat=True)
+            )
+            rebuild_progress(CourseMember.objects.filter(pk__in=inserted))
+            adjust_counters(course, **{ROLE_COUNTERS[roles]: len(inserted)})
+            created += len(inserted)
+
+    if created:
+        transaction.on_commit(bump_catalog_version)
+        transaction.on_commit(invalidate_user_stats)
+
+    return {
+        'requested': len(resolved) + len(not_found),
+        'created': created,
+        'already_enrolled': len(resolved) - created,
+        'not_found_count': len(not_found),
+        'not_found': not_found[:MAX_NOT_FOUND_REPORTED],
+    }
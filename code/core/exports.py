@@ -0,0 +1,129 @@
+# /code/core/exports.py
+import csv
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .streaming import NDJSON_CONTENT_TYPE
+
+EXPORT_NAMES = ('courses', 'contents', 'memberships', 'comments', 'completions')
+EXPORT_FORMATS = ('csv', 'ndjson')
+EXPORT_CHUNK_SIZE = 5000
+
+_encoder = DjangoJSONEncoder(separators=(',', ':'))
+
+
+def _export_sources():
+    # nama export -> (model, path ke course untuk filter per course, kolom values_list)
+    from .models import Course, CourseContent, CourseMember, Comment, Completion
+
+    return {
+        'courses': (Course, 'pk', (
+            'id', 'name', 'description', 'price', 'teacher_id', 'teacher__username',
+            'num_students', 'num_contents', 'created_at', 'updated_at',
+        )),
+        'contents': (CourseContent, 'course_id', (
+            'id', 'course_id', 'parent_id', 'name', 'description', 'video_url', 'created_at', 'updated_at',
+        )),
+        'memberships': (CourseMember, 'course_id', (
+            'id', 'course_id', 'user_id', 'user_id__username', 'roles', 'created_at',
+        )),
+        'comments': (Comment, 'content_id__course_id', (
+            'id', 'content_id', 'member_id', 'member_id__user_id__username', 'comment', 'created_at', 'updated_at',
+        )),
+        'completions': (Completion, 'content_id__course_id', (
+            'id', 'member_id', 'member_id__user_id', 'content_id', 'content_id__course_id', 'last_update',
+        )),
+    }
+
+
+def export_rows(name, course=None):
+    """
+    (kolom, queryset values_list) untuk satu export. Hanya kolom yang diekspor
+    yang di-SELECT, JOIN cukup untuk kolom relasi, diurutkan per id agar stabil.
+    """
+    model, course_path, fields = _export_sources()[name]
+    queryset = model.objects.all()
+    if course is not None:
+        queryset = queryset.filter(**{course_path: course})
+    return fields, queryset.order_by('id').values_list(*fields)
+
+
+class _LineBuffer:
+    """Target csv.writer yang hanya menampung baris sampai diambil."""
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, value):
+        self.parts.append(value)
+
+    def take(self):
+        data, self.parts = ''.join(self.parts), []
+        return data
+
+
+def _iter_chunks(queryset, chunk_size):
+    # iterator() = server-side cursor di Postgres: memori tetap satu chunk
+    batch = []
+    for row in queryset.iterator(chunk_size=chunk_size):
+        batch.append(row)
+        if len(batch) >= chunk_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_csv(fields, queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    buffer = _LineBuffer()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    yield buffer.take()
+    for batch in _iter_chunks(queryset, chunk_size):
+        writer.writerows(
+            [value.isoformat() if hasattr(value, 'isoformat') else value for value in row] for row in batch
+        )
+        yield buffer.take()
+
+
+def iter_ndjson_rows(fields, queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    for batch in _iter_chunks(queryset, chunk_size):
+        yield '\n'.join(_encoder.encode(dict(zip(fields, row))) for row in batch) + '\n'
+
+
+def iter_gzip(chunks, level=6):
+    """Kompres potongan teks menjadi stream gzip tanpa menampung seluruh isi."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def iter_export(name, fmt='csv', course=None, compress=False, chunk_size=EXPORT_CHUNK_SIZE):
+    fields, queryset = export_rows(name, course)
+    encode = iter_csv if fmt == 'csv' else iter_ndjson_rows
+    chunks = encode(fields, queryset, chunk_size)
+    if compress:
+        return iter_gzip(chunks)
+    return (chunk.encode() for chunk in chunks)
+
+
+def export_filename(name, fmt, course=None, compress=False):
+    scope = f'_course{course}' if course is not None else ''
+    suffix = '.gz' if compress else ''
+    return f"{name}{scope}_{timezone.now():%Y%m%d}.{fmt}{suffix}"
+
+
+def export_response(name, fmt='csv', course=None, compress=False):
+    content_type = 'text/csv; charset=utf-8' if fmt == 'csv' else NDJSON_CONTENT_TYPE
+    response = StreamingHttpResponse(
+        iter_export(name, fmt, course, compress),
+        content_type='application/gzip' if compress else content_type,
+    )
+    response['Content-Disposition'] = f'attachment; filename="{export_filename(name, fmt, course, compress)}"'
+    return response
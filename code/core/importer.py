@@ -1,65 +1,157 @@
+import codecs
 import csv
-import io
+
+from django.conf import settings
 from django.db import transaction
-from django.core.files.uploadedfile import UploadedFile 
+from django.core.files.uploadedfile import UploadedFile
+
+from .models import CourseContent, Course, MemberProgress
+from .counters import adjust_counters
+from .progress import adjust_progress
+from .catalog import bump_catalog_version, bump_table_version
+
+REQUIRED_HEADERS = ['name', 'description', 'video_url']
+MAX_ERROR_DETAILS = 100
+
+_NAME_MAX_LENGTH = CourseContent._meta.get_field('name').max_length
+_VIDEO_URL_MAX_LENGTH = CourseContent._meta.get_field('video_url').max_length
+
+
+class _RowError(ValueError):
+    pass
+
+
+class ImportCancelled(Exception):
+    pass
+
+
+def _iter_lines(csv_file: UploadedFile, encoding='utf-8-sig'):
+    """
+    Decode upload per chunk (bukan .read() sekaligus) dan hasilkan baris teks
+    lengkap dengan '\\n'-nya, sehingga csv.reader tetap bisa membaca field
+    ber-quote yang memuat baris baru. BOM dari Excel ikut dibuang.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ''
+    for chunk in csv_file.chunks():
+        pending += decoder.decode(chunk)
+        lines = pending.split('\n')
+        pending = lines.pop()
+        for line in lines:
+            yield line + '\n'
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        yield pending
+
+
+def _build_content(row, header_map, course):
+    if len(row) < len(REQUIRED_HEADERS):
+        raise _RowError("Baris memiliki jumlah kolom yang tidak memadai.")
+
+    name = row[header_map['name']].strip()
+    video_url = row[header_map['video_url']].strip()
+    if not name:
+        raise _RowError("Kolom 'name' tidak boleh kosong.")
+    if len(name) > _NAME_MAX_LENGTH:
+        raise _RowError(f"Kolom 'name' melebihi {_NAME_MAX_LENGTH} karakter.")
+    if len(video_url) > _VIDEO_URL_MAX_LENGTH:
+        raise _RowError(f"Kolom 'video_url' melebihi {_VIDEO_URL_MAX_LENGTH} karakter.")
 
-from .models import CourseContent, Course 
+    return CourseContent(
+        course_id=course,
+        name=name,
+        description=row[header_map['description']].strip(),
+        video_url=video_url,
+    )
+
+
+def import_content_from_csv(csv_file: UploadedFile, course: Course, batch_size=None, progress=None) -> tuple[int, str]:
+    """
+    Impor konten dari CSV secara streaming: baris divalidasi per batch lalu
+    disimpan dengan bulk_create. Tetap all-or-nothing: satu baris tidak valid
+    membatalkan seluruh impor, dan semua baris bermasalah dilaporkan (dibatasi
+    MAX_ERROR_DETAILS). Setelah baris pertama gagal, sisa file hanya divalidasi.
+
+    bulk_create tidak memicu signal, jadi counter course, progres anggota dan
+    versi katalog diperbarui sekali di akhir.
+
+    `progress(rows_processed, rows_failed)` dipanggil setiap `batch_size` baris;
+    jika mengembalikan False impor dibatalkan (rollback) dengan ImportCancelled.
+    """
+    batch_size = batch_size or getattr(settings, 'IMPORT_BATCH_SIZE', 2000)
+    csv_reader = csv.reader(_iter_lines(csv_file))
 
-def import_content_from_csv(csv_file: UploadedFile, course: Course) -> tuple[int, str]:
-    file_data = csv_file.read().decode('utf-8')
-    csv_reader = csv.reader(io.StringIO(file_data))
-    
     try:
-        header = next(csv_reader)
-        required_headers = ['name', 'description', 'video_url']
-        if not all(h in header for h in required_headers):
+        header = [h.strip() for h in next(csv_reader)]
+        if not all(h in header for h in REQUIRED_HEADERS):
             return 0, "Header CSV tidak lengkap atau tidak valid. Diperlukan: name, description, video_url."
-            
+
         header_map = {name: index for index, name in enumerate(header)}
-    
+
     except StopIteration:
         return 0, "File CSV kosong atau hanya berisi header yang kosong."
     except Exception as e:
         return 0, f"Gagal membaca header file CSV: {e}"
 
     success_count = 0
+    error_count = 0
     error_details = []
+    batch = []
+    processed = 0
+
+    def report():
+        if progress is not None and progress(processed, error_count) is False:
+            raise ImportCancelled
 
     try:
         with transaction.atomic():
-            for row_number, row in enumerate(csv_reader, start=2): 
+            for row_number, row in enumerate(csv_reader, start=2):
                 if not row:
-                    continue 
-                
+                    continue
+                processed += 1
+                if processed % batch_size == 0:
+                    report()
+
                 try:
-                    if len(row) < len(required_headers):
-                        raise ValueError("Baris memiliki jumlah kolom yang tidak memadai.")
-
-                    data = {
-                        'name': row[header_map['name']].strip(),
-                        'description': row[header_map['description']].strip(),
-                        'video_url': row[header_map['video_url']].strip() if 'video_url' in header_map else '',
-                    }
-                    
-                    if not data['name']:
-                        raise ValueError("Kolom 'name' tidak boleh kosong.")
-                    
-                    new_content = CourseContent(
-                        course_id=course,  #
-                        name=data['name'],
-                        description=data['description'],
-                        video_url=data['video_url'],
-                    )
-                    new_content.save()
-                    success_count += 1
-                    
-                except Exception as e:
-                    error_details.append(f"Baris {row_number}: Data tidak valid - {str(e)}. Data: {row}")
-                    
-            if error_details:
+                    content = _build_content(row, header_map, course)
+                except (_RowError, IndexError) as e:
+                    error_count += 1
+                    if len(error_details) < MAX_ERROR_DETAILS:
+                        error_details.append(f"Baris {row_number}: Data tidak valid - {e}. Data: {row}")
+                    batch = []
+                    continue
+
+                if error_count:
+                    continue
+                batch.append(content)
+                if len(batch) >= batch_size:
+                    CourseContent.objects.bulk_create(batch)
+                    success_count += len(batch)
+                    batch = []
+
+            if error_count:
+                report()
+                if error_count > len(error_details):
+                    error_details.append(f"... dan {error_count - len(error_details)} baris tidak valid lainnya.")
                 raise Exception("\n".join(error_details))
-            
+
+            if batch:
+                CourseContent.objects.bulk_create(batch)
+                success_count += len(batch)
+            report()
+
+            if success_count:
+                adjust_counters(course, num_contents=success_count)
+                adjust_progress(MemberProgress.objects.filter(course_id=course), total=success_count)
+                transaction.on_commit(bump_catalog_version)
+                # bulk_create tidak memicu signal invalidate_table
+                transaction.on_commit(lambda: bump_table_version(CourseContent))
+
             return success_count, ""
 
+    except ImportCancelled:
+        raise
+    except UnicodeDecodeError as e:
+        return 0, f"Import gagal total. File bukan teks UTF-8 yang valid: {e}"
     except Exception as e:
-        return 0, f"Import gagal total. {e}"
\ No newline at end of file
+        return 0, f"Import gagal total. {e}"
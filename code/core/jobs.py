@@ -0,0 +1,194 @@
+# /code/core/jobs.py
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .importer import ImportCancelled, import_content_from_csv
+from .models import ImportJob
+
+logger = logging.getLogger('core.jobs')
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def enqueue_import(course, upload, user):
+    """
+    Simpan upload sebagai ImportJob lalu jalankan sesuai IMPORT_JOB_RUNNER
+    ('thread', 'command' atau 'sync'). Request langsung selesai kecuali 'sync'.
+    """
+    job = ImportJob.objects.create(course=course, created_by=user, file=upload)
+    runner = _setting('IMPORT_JOB_RUNNER', 'thread')
+    if runner == 'sync':
+        run_import_job(job.pk)
+    elif runner == 'thread':
+        transaction.on_commit(lambda: _start_thread(job.pk))
+    return job
+
+
+def _start_thread(job_id):
+    threading.Thread(target=_run_in_thread, args=(job_id,), name=f'import-job-{job_id}', daemon=True).start()
+
+
+def _run_in_thread(job_id):
+    try:
+        run_import_job(job_id)
+    finally:
+        connection.close()
+
+
+class _ProgressReporter:
+    """
+    Callback progres untuk import_content_from_csv. Impor berjalan dalam satu
+    transaksi, jadi progres ditulis dari thread lain (koneksi database sendiri)
+    agar langsung terlihat oleh request polling; thread yang sama membaca flag
+    pembatalan. Penulisan dilewati bila penulisan sebelumnya belum selesai.
+    Setiap IMPORT_JOB_HEARTBEAT detik progres ditulis ulang walau tidak ada
+    batch baru, sebagai tanda job masih hidup (lihat requeue_stale_jobs).
+    """
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.processed = self.failed = 0
+        self.cancelled = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'import-progress-{job_id}')
+        self._pending = None
+        self._stopped = threading.Event()
+        self._heartbeat = threading.Thread(target=self._beat, name=f'import-heartbeat-{job_id}', daemon=True)
+        self._heartbeat.start()
+
+    def __call__(self, processed, failed):
+        self.processed, self.failed = processed, failed
+        self._submit()
+        return not self.cancelled
+
+    def _submit(self):
+        if self._pending is None or self._pending.done():
+            self._pending = self._executor.submit(self._write, self.processed, self.failed)
+
+    def _beat(self):
+        while not self._stopped.wait(_setting('IMPORT_JOB_HEARTBEAT', 15)):
+            self._submit()
+
+    def _write(self, processed, failed):
+        try:
+            ImportJob.objects.filter(pk=self.job_id).update(
+                rows_processed=processed, rows_failed=failed, heartbeat_at=timezone.now()
+            )
+            self.cancelled = ImportJob.objects.filter(pk=self.job_id, cancel_requested=True).exists()
+        except DatabaseError:
+            # mis. SQLite mengunci tabel selama transaksi impor; progres hanya informasi
+            logger.debug("Progres impor #%s tidak bisa ditulis", self.job_id, exc_info=True)
+
+    def close(self):
+        self._stopped.set()
+        self._heartbeat.join()
+        self._executor.submit(connection.close)
+        self._executor.shutdown(wait=True)
+
+
+def run_import_job(job_id):
+    """Proses satu job 'pending'. Aman dipanggil paralel: hanya satu pemanggil yang mengklaim job."""
+    now = timezone.now()
+    claimed = ImportJob.objects.filter(pk=job_id, state='pending', cancel_requested=False).update(
+        state='running', started_at=now, heartbeat_at=now
+    )
+    if not claimed:
+        return False
+
+    job = ImportJob.objects.select_related('course').get(pk=job_id)
+    reporter = _ProgressReporter(job.pk)
+    state, error, imported = 'failed', '', 0
+    try:
+        with job.file.open('rb') as upload:
+            imported, error = import_content_from_csv(upload, job.course, progress=reporter)
+        state = 'failed' if error else 'done'
+    except ImportCancelled:
+        state, error = 'cancelled', "Impor dibatalkan."
+    except Exception as e:
+        logger.exception("Job impor #%s gagal", job.pk)
+        error = f"Import gagal total. {e}"
+    finally:
+        reporter.close()
+        job.file.delete(save=False)
+        ImportJob.objects.filter(pk=job.pk).update(
+            state=state, error=error, file='',
+            rows_processed=reporter.processed, rows_failed=reporter.failed, rows_imported=imported,
+            finished_at=timezone.now(),
+        )
+    return True
+
+
+def requeue_stale_jobs(job_ids=None):
+    """
+    Kembalikan job 'running' yang tidak berdetak selama IMPORT_JOB_STALE_AFTER
+    detik (thread/worker-nya mati) ke 'pending'; yang sudah minta dibatalkan
+    langsung 'cancelled'. Impor berjalan dalam satu transaksi, jadi job yang
+    mati tidak meninggalkan konten setengah jadi. Return id job yang di-antre ulang.
+    """
+    cutoff = timezone.now() - timedelta(seconds=_setting('IMPORT_JOB_STALE_AFTER', 120))
+    stale = ImportJob.objects.filter(
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff), state='running',
+    )
+    if job_ids is not None:
+        stale = stale.filter(pk__in=job_ids)
+
+    for job in stale.filter(cancel_requested=True):
+        if stale.filter(pk=job.pk).update(state='cancelled', error="Impor dibatalkan.", finished_at=timezone.now()):
+            job.file.delete(save=False)
+            ImportJob.objects.filter(pk=job.pk).update(file='')
+
+    requeued = []
+    for job_id in stale.filter(cancel_requested=False).values_list('pk', flat=True):
+        # update bersyarat: hanya satu pemanggil yang berhasil, job yang kembali berdetak dilewati
+        if stale.filter(pk=job_id).update(state='pending', started_at=None, heartbeat_at=None,
+                                          rows_processed=0, rows_failed=0):
+            logger.warning("Job impor #%s berhenti berdetak, dijalankan ulang", job_id)
+            requeued.append(job_id)
+    return requeued
+
+
+def resume_stale_job(job):
+    """
+    Dipanggil saat progres job di-poll: dengan runner 'thread' tidak ada
+    worker lain yang mengambil job yang di-antre ulang, jadi thread baru
+    dimulai di sini. Return job terbaru dari database.
+    """
+    if job.state != 'running':
+        return job
+    if requeue_stale_jobs([job.pk]) and _setting('IMPORT_JOB_RUNNER', 'thread') == 'thread':
+        _start_thread(job.pk)
+    job.refresh_from_db()
+    return job
+
+
+def cancel_import_job(job):
+    """Job yang belum mulai langsung dibatalkan; job yang berjalan berhenti di batch berikutnya."""
+    if ImportJob.objects.filter(pk=job.pk, state='pending').update(
+        state='cancelled', cancel_requested=True, finished_at=timezone.now()
+    ):
+        job.file.delete(save=False)
+        ImportJob.objects.filter(pk=job.pk).update(file='')
+        return True
+    return bool(ImportJob.objects.filter(pk=job.pk, state='running').update(cancel_requested=True))
+
+
+def job_status(job):
+    return {
+        'id': job.pk,
+        'state': job.state,
+        'state_display': job.get_state_display(),
+        'finished': job.finished,
+        'rows_processed': job.rows_processed,
+        'rows_failed': job.rows_failed,
+        'rows_imported': job.rows_imported,
+        'error': job.error,
+        'cancel_requested': job.cancel_requested,
+    }
@@ -0,0 +1,20 @@
+# /code/core/management/commands/_bench.py
+"""Helper bersama command bench_* (nama berawalan '_' tidak dianggap command)."""
+from contextlib import contextmanager
+
+from django.db import transaction
+
+
+class _Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rollback_after(using=None):
+    """Jalankan blok di dalam transaksi lalu batalkan semua data yang ditulisnya."""
+    try:
+        with transaction.atomic(using=using):
+            yield
+            raise _Rollback
+    except _Rollback:
+        pass
@@ -0,0 +1,71 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from core.aggregates import annotate_course_counts
+from core.management.commands._bench import rollback_after
+from core.models import Course, CourseContent, CourseMember
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark hitungan member/konten per course: Count() atas JOIN vs subquery "
+        "berkorelasi. Data dibuat di dalam transaksi lalu di-rollback."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10,50,100,200',
+                            help="Jumlah member = jumlah konten per course, dipisah koma")
+        parser.add_argument('--courses', type=int, default=20)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        self.stdout.write(f"{'n':>6} {'join (ms)':>12} {'subquery (ms)':>15} {'rasio':>8}")
+        for size in sizes:
+            with rollback_after():
+                join_ms, subquery_ms = self._run(size, options['courses'], options['repeat'])
+            ratio = join_ms / subquery_ms if subquery_ms else 0
+            self.stdout.write(f"{size:>6} {join_ms:>12.2f} {subquery_ms:>15.2f} {ratio:>7.1f}x")
+
+    def _run(self, size, num_courses, repeat):
+        teacher = User.objects.create(username='bench-teacher')
+        users = User.objects.bulk_create([User(username=f'bench-{i}') for i in range(size)])
+        courses = Course.objects.bulk_create([
+            Course(name=f'Bench {i}', teacher=teacher) for i in range(num_courses)
+        ])
+        CourseMember.objects.bulk_create([
+            CourseMember(course_id=course, user_id=user) for course in courses for user in users
+        ], batch_size=1000)
+        CourseContent.objects.bulk_create([
+            CourseContent(course_id=course, name=f'Bab {i}') for course in courses for i in range(size)
+        ], batch_size=1000)
+
+        course_ids = [course.pk for course in courses]
+        joined = Course.objects.filter(pk__in=course_ids).annotate(
+            member_total=Count('coursemember', distinct=True),
+            content_total=Count('contents', distinct=True),
+        )
+        subqueried = annotate_course_counts(
+            Course.objects.filter(pk__in=course_ids), 'member_total', 'content_total'
+        )
+
+        join_rows = self._rows(joined)
+        subquery_rows = self._rows(subqueried)
+        assert join_rows == subquery_rows, "hasil join dan subquery berbeda"
+        return self._time(joined, repeat), self._time(subqueried, repeat)
+
+    @staticmethod
+    def _rows(queryset):
+        return sorted(queryset.values_list('pk', 'member_total', 'content_total'))
+
+    @staticmethod
+    def _time(queryset, repeat):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            list(queryset.values_list('pk', 'member_total', 'content_total'))
+            best = min(best, time.perf_counter() - start)
+        return best * 1000
@@ -0,0 +1,64 @@
+import csv
+import os
+import tempfile
+import time
+import tracemalloc
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import UploadedFile
+from django.core.management.base import BaseCommand
+
+from core.importer import import_content_from_csv
+from core.management.commands._bench import rollback_after
+from core.models import Course
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark impor konten CSV (streaming + bulk_create) untuk file besar. "
+        "Data yang diimpor di-rollback."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', default='100000,1000000', help="Jumlah baris per file, dipisah koma")
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--trace-memory', action='store_true',
+                            help="Ukur puncak alokasi Python dengan tracemalloc (lebih lambat)")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'baris':>9} {'ukuran (MB)':>12} {'waktu (s)':>10} {'baris/s':>10} {'puncak (MB)':>12}")
+        for rows in [int(n) for n in options['rows'].split(',')]:
+            with tempfile.NamedTemporaryFile('w', suffix='.csv', newline='', delete=False) as handle:
+                self._write_csv(handle, rows)
+            try:
+                self._run(handle.name, rows, options)
+            finally:
+                os.remove(handle.name)
+
+    @staticmethod
+    def _write_csv(handle, rows):
+        writer = csv.writer(handle)
+        writer.writerow(['name', 'description', 'video_url'])
+        for i in range(rows):
+            writer.writerow([f'Bab {i}', f'Deskripsi materi "{i}",\nbaris kedua', f'https://video.example/{i}'])
+
+    def _run(self, path, rows, options):
+        size_mb = os.path.getsize(path) / 1e6
+        peak_mb = float('nan')
+        with rollback_after():
+            teacher = User.objects.create(username='bench-import-teacher')
+            course = Course.objects.create(name='Bench Import', teacher=teacher)
+            with open(path, 'rb') as raw:
+                upload = UploadedFile(raw, name=os.path.basename(path), size=os.path.getsize(path))
+                if options['trace_memory']:
+                    tracemalloc.start()
+                start = time.perf_counter()
+                imported, error = import_content_from_csv(upload, course, options['batch_size'])
+                elapsed = time.perf_counter() - start
+                if options['trace_memory']:
+                    peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+                    tracemalloc.stop()
+            assert not error and imported == rows, error[:200]
+        self.stdout.write(
+            f"{rows:>9} {size_mb:>12.1f} {elapsed:>10.2f} {rows / elapsed:>10.0f} {peak_mb:>12.1f}"
+        )
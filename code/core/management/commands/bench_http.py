@@ -0,0 +1,114 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Load generator HTTP sederhana (asyncio, koneksi keep-alive) untuk "
+        "membandingkan throughput profil sync (gunicorn_config.py) dan ASGI "
+        "(gunicorn_asgi_config.py) pada concurrency tinggi. Jalankan terhadap "
+        "server yang sedang hidup, sekali per profil."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='+', help="URL yang diminta bergiliran, mis. http://127.0.0.1:8000/courses/list/")
+        parser.add_argument('--concurrency', type=int, default=200, help="Jumlah koneksi paralel")
+        parser.add_argument('--requests', type=int, default=5000, help="Total request")
+        parser.add_argument('--timeout', type=float, default=30.0, help="Batas waktu per request (detik)")
+        parser.add_argument('--cookie', default='', help="Header Cookie, mis. sessionid=... untuk halaman login")
+        parser.add_argument('--header', action='append', default=[], help="Header tambahan 'Nama: nilai'")
+
+    def handle(self, *args, **options):
+        targets = [urlsplit(url) for url in options['urls']]
+        hosts = {(t.hostname, t.port or 80) for t in targets}
+        if len(hosts) != 1 or any(t.scheme != 'http' for t in targets):
+            raise CommandError("Semua URL harus http:// ke host:port yang sama.")
+
+        headers = [f"Host: {targets[0].netloc}", "Connection: keep-alive"] + options['header']
+        if options['cookie']:
+            headers.append(f"Cookie: {options['cookie']}")
+        requests = [
+            (f"GET {t.path or '/'}{'?' + t.query if t.query else ''} HTTP/1.1\r\n"
+             + "\r\n".join(headers) + "\r\n\r\n").encode()
+            for t in targets
+        ]
+
+        result = asyncio.run(self._run(hosts.pop(), requests, options))
+        self._report(result, options)
+
+    async def _run(self, address, requests, options):
+        remaining = iter(range(options['requests']))
+        result = {'latencies': [], 'statuses': {}, 'errors': 0}
+
+        async def client():
+            reader = writer = None
+            for i in remaining:
+                try:
+                    if writer is None:
+                        reader, writer = await asyncio.open_connection(*address)
+                    start = time.perf_counter()
+                    writer.write(requests[i % len(requests)])
+                    status, keep_alive = await asyncio.wait_for(_read_response(reader), options['timeout'])
+                    result['latencies'].append(time.perf_counter() - start)
+                    result['statuses'][status] = result['statuses'].get(status, 0) + 1
+                    if not keep_alive:
+                        writer.close()
+                        writer = None
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+                    result['errors'] += 1
+                    if writer is not None:
+                        writer.close()
+                    writer = None
+            if writer is not None:
+                writer.close()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(options['concurrency'])))
+        result['elapsed'] = time.perf_counter() - start
+        return result
+
+    def _report(self, result, options):
+        latencies = sorted(result['latencies'])
+        done = len(latencies)
+        self.stdout.write(f"concurrency {options['concurrency']}, {done} request selesai, {result['errors']} error")
+        self.stdout.write(f"status: {dict(sorted(result['statuses'].items()))}")
+        if not done:
+            return
+        self.stdout.write(f"throughput: {done / result['elapsed']:.1f} req/s ({result['elapsed']:.2f} s)")
+        self.stdout.write(
+            "latensi (ms): p50 {:.1f}  p95 {:.1f}  p99 {:.1f}  max {:.1f}".format(
+                statistics.median(latencies) * 1000,
+                latencies[int(done * 0.95) - 1] * 1000,
+                latencies[int(done * 0.99) - 1] * 1000,
+                latencies[-1] * 1000,
+            )
+        )
+
+
+async def _read_response(reader):
+    """Baca satu respons HTTP/1.1 (Content-Length atau chunked). Return (status, keep_alive)."""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode('latin-1').split("\r\n")
+    status = int(lines[0].split()[1])
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip().lower()
+
+    if headers.get('transfer-encoding') == 'chunked':
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    elif 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length']))
+    else:
+        await reader.read()
+        return status, False
+    return status, headers.get('connection') != 'close'
@@ -0,0 +1,88 @@
+import json
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from django.core.management.base import BaseCommand
+from ninja.renderers import JSONRenderer
+from pydantic import TypeAdapter
+
+from core.apiv1 import CommentSchema, CourseContentSchema
+from core.renderers import ORJSONRenderer, project_rows, trusted_fields
+
+SCHEMAS = {'contents': CourseContentSchema, 'comments': CommentSchema}
+
+
+def _rows(name, count):
+    # bentuk sama dengan .values() endpoint /contents dan /comments (termasuk created_at untuk cursor)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    if name == 'contents':
+        return [
+            {'id': i, 'course_id': i % 50, 'name': f"Bab {i}", 'description': "Materi pertemuan " * 8,
+             'video_url': None, 'file_attachment': f"materi_{i}.pdf", 'created_at': start + timedelta(seconds=i)}
+            for i in range(count)
+        ]
+    return [
+        {'id': i, 'content_id': i % 300, 'member_id': i % 700, 'comment': f"Komentar ke-{i} 🙂",
+         'created_at': start + timedelta(seconds=i)}
+        for i in range(count)
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Ukur biaya serialisasi respons list API (tanpa database): validasi "
+        "pydantic per objek seperti bawaan ninja vs jalur trusted_values, "
+        "masing-masing dengan renderer JSON bawaan dan orjson."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000)
+        parser.add_argument('--runs', type=int, default=7)
+        parser.add_argument('--endpoint', choices=sorted(SCHEMAS), default='contents')
+
+    def handle(self, *args, **options):
+        schema = SCHEMAS[options['endpoint']]
+        rows = _rows(options['endpoint'], options['rows'])
+        adapter = TypeAdapter(List[schema])
+        fields = trusted_fields(schema)
+
+        def validated():
+            return adapter.dump_python(adapter.validate_python(rows))
+
+        try:
+            fast = ORJSONRenderer()
+        except Exception as e:
+            fast = None
+            self.stderr.write(f"orjson tidak tersedia ({e}); hanya renderer bawaan yang diukur.")
+
+        renderers = [('json', JSONRenderer())] + ([('orjson', fast)] if fast else [])
+        cases = [
+            (f"{path} + {label}", build, renderer)
+            for path, build in (('validasi', validated), ('trusted', lambda: project_rows(rows, fields)))
+            for label, renderer in renderers
+        ]
+
+        reference = None
+        self.stdout.write(f"{options['endpoint']}: {len(rows)} baris, median dari {options['runs']} run")
+        self.stdout.write(f"{'jalur':<22} {'total (ms)':>11} {'proyeksi (ms)':>14} {'render (ms)':>12} {'ukuran (KB)':>12}")
+        for label, build, renderer in cases:
+            timings = []
+            for _ in range(options['runs']):
+                start = time.perf_counter()
+                items = build()
+                built = time.perf_counter()
+                body = renderer.render(None, {'items': items, 'next_cursor': None, 'count': None}, response_status=200)
+                timings.append((built - start, time.perf_counter() - built))
+
+            parsed = json.loads(body)
+            if reference is None:
+                reference = parsed
+            elif parsed != reference:
+                self.stderr.write(self.style.ERROR(f"{label}: isi JSON berbeda dari jalur bawaan!"))
+
+            build_ms = statistics.median(t[0] for t in timings) * 1000
+            render_ms = statistics.median(t[1] for t in timings) * 1000
+            size = len(body.encode() if isinstance(body, str) else body) / 1024
+            self.stdout.write(f"{label:<22} {build_ms + render_ms:>11.1f} {build_ms:>14.1f} {render_ms:>12.1f} {size:>12.0f}")
@@ -0,0 +1,79 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Dijalankan di proses Python baru, seperti worker gunicorn yang baru di-fork
+# tanpa preload: import Django + proyek, lalu satu request lewat WSGI
+_PROBE = r'''
+import json, sys, time
+start = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+app = get_wsgi_application()
+ready = time.perf_counter()
+if sys.argv[2] == '1':
+    from core.startup import warmup
+    warmup()
+warm = time.perf_counter()
+
+from wsgiref.util import setup_testing_defaults
+environ = {'PATH_INFO': sys.argv[1]}
+setup_testing_defaults(environ)
+status = []
+body = app(environ, lambda s, h, exc_info=None: status.append(s))
+b''.join(body)
+body.close()
+done = time.perf_counter()
+
+from core.startup import loaded_heavy_modules
+rss = 0
+with open('/proc/self/status') as handle:
+    for line in handle:
+        if line.startswith('VmRSS:'):
+            rss = int(line.split()[1]) / 1024
+print(json.dumps({
+    'ready': ready - start, 'warmup': warm - ready, 'first': done - warm, 'rss': rss,
+    'status': status[0], 'heavy': loaded_heavy_modules(),
+}))
+'''
+
+
+class Command(BaseCommand):
+    help = (
+        "Ukur waktu boot worker sampai aplikasi WSGI siap, durasi request pertama "
+        "dan RSS, tanpa dan dengan warmup (core.startup). Setiap run memakai "
+        "proses Python baru. Membaca RSS dari /proc (Linux)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--path', default='/courses/list/', help="Path untuk request pertama")
+
+    def handle(self, *args, **options):
+        if not os.path.exists('/proc/self/status'):
+            raise CommandError("Benchmark ini membutuhkan /proc (Linux).")
+
+        self.stdout.write(
+            f"{'mode':<8} {'siap (ms)':>10} {'warmup (ms)':>12} {'req-1 (ms)':>11} {'RSS (MB)':>9}  modul berat"
+        )
+        for label, warm in (('dingin', '0'), ('warmup', '1')):
+            runs = [self._probe(options['path'], warm) for _ in range(options['runs'])]
+            median = {key: statistics.median(run[key] for run in runs) for key in ('ready', 'warmup', 'first', 'rss')}
+            heavy = sorted({name for run in runs for name in run['heavy']}) or '-'
+            self.stdout.write(
+                f"{label:<8} {median['ready'] * 1000:>10.0f} {median['warmup'] * 1000:>12.0f} "
+                f"{median['first'] * 1000:>11.1f} {median['rss']:>9.1f}  {heavy} ({runs[0]['status']})"
+            )
+
+    def _probe(self, path, warm):
+        result = subprocess.run(
+            [sys.executable, '-c', _PROBE, path, warm],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, env=os.environ.copy(),
+        )
+        if result.returncode:
+            raise CommandError(result.stderr.strip().splitlines()[-1] if result.stderr else "Probe gagal")
+        return json.loads(result.stdout.strip().splitlines()[-1])
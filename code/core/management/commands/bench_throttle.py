@@ -0,0 +1,55 @@
+import time
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from ninja import throttling
+
+from core.management.commands._bench import rollback_after
+from core.throttling import AnonRateThrottle, CacheBucketBackend, DatabaseBucketBackend
+
+
+class Command(BaseCommand):
+    help = (
+        "Microbenchmark overhead pengecekan throttle per request: riwayat timestamp "
+        "bawaan ninja vs token bucket di cache vs token bucket di database. "
+        "Baris throttle di database di-rollback setelah benchmark."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=5000)
+        parser.add_argument('--clients', type=int, default=50, help="Jumlah IP berbeda")
+        parser.add_argument('--rate', default='10/m')
+
+    def handle(self, *args, **options):
+        factory = RequestFactory()
+        requests = [
+            factory.get('/api/v1/hello', REMOTE_ADDR=f'10.0.{i // 250}.{i % 250}')
+            for i in range(options['clients'])
+        ]
+        n = options['requests']
+
+        self.stdout.write(f"{'throttle':<28} {'us/cek':>8} {'diizinkan':>10}")
+        caches['default'].clear()
+        self._report('ninja (riwayat di cache)', throttling.AnonRateThrottle(options['rate']), requests, n)
+
+        caches['default'].clear()
+        self._report('token bucket (cache)', self._bucket(options['rate'], CacheBucketBackend()), requests, n)
+
+        with rollback_after():
+            self._report('token bucket (database)', self._bucket(options['rate'], DatabaseBucketBackend()),
+                         requests, n)
+
+    @staticmethod
+    def _bucket(rate, backend):
+        throttle = AnonRateThrottle(rate)
+        throttle.backend = backend
+        return throttle
+
+    def _report(self, label, throttle, requests, n):
+        allowed = 0
+        start = time.perf_counter()
+        for i in range(n):
+            allowed += throttle.allow_request(requests[i % len(requests)])
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f"{label:<28} {elapsed / n * 1e6:>8.1f} {allowed:>10}")
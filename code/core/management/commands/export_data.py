@@ -0,0 +1,33 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from core.exports import EXPORT_FORMATS, EXPORT_NAMES, export_filename, iter_export
+
+
+class Command(BaseCommand):
+    help = "Export data course (streaming, memori tetap) ke CSV/NDJSON, opsional gzip."
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', choices=EXPORT_NAMES)
+        parser.add_argument('--format', choices=EXPORT_FORMATS, default='csv')
+        parser.add_argument('--course', type=int, help="Hanya data satu course")
+        parser.add_argument('--gzip', action='store_true')
+        parser.add_argument('--output', help="File tujuan; '-' untuk stdout (default: nama otomatis)")
+
+    def handle(self, *args, **options):
+        name, fmt, course, compress = options['name'], options['format'], options['course'], options['gzip']
+        output = options['output'] or export_filename(name, fmt, course, compress)
+        chunks = iter_export(name, fmt, course, compress)
+
+        if output == '-':
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            return
+
+        size = 0
+        with open(output, 'wb') as handle:
+            for chunk in chunks:
+                handle.write(chunk)
+                size += len(chunk)
+        self.stderr.write(self.style.SUCCESS(f"{name} ditulis ke {output} ({size / 1e6:.1f} MB)."))
@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.certificates import build_course_zip, build_queued_zip, eligible_members, queued_zip_courses
+from core.models import Course
+
+
+class Command(BaseCommand):
+    help = (
+        "Buat ZIP sertifikat untuk semua siswa yang sudah menyelesaikan seluruh konten sebuah course, "
+        "atau (--queued) proses ZIP yang diminta lewat web (CERTIFICATE_ZIP_RUNNER = 'command')."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_id', type=int, nargs='?')
+        parser.add_argument('--output', help="File ZIP tujuan (default: sertifikat_<course_id>.zip)")
+        parser.add_argument('--workers', type=int, help="Jumlah proses render (default: CERTIFICATE_BATCH_WORKERS/CPU)")
+        parser.add_argument('--queued', action='store_true', help="Proses antrean ZIP dari web lalu berhenti")
+
+    def handle(self, *args, **options):
+        if options['queued']:
+            for course_id, path in queued_zip_courses():
+                start = time.perf_counter()
+                build_queued_zip(course_id, path)
+                result = "siap" if path.exists() else "gagal"
+                self.stdout.write(f"ZIP course {course_id}: {result} ({time.perf_counter() - start:.1f} detik).")
+            return
+
+        if options['course_id'] is None:
+            raise CommandError("Sebutkan course_id atau gunakan --queued.")
+        try:
+            course = Course.objects.get(pk=options['course_id'])
+        except Course.DoesNotExist:
+            raise CommandError(f"Course {options['course_id']} tidak ditemukan.")
+
+        output = options['output'] or f"sertifikat_{course.pk}.zip"
+        total = eligible_members(course).count()
+        self.stdout.write(f"{total} siswa lulus di '{course.name}'.")
+
+        start = time.perf_counter()
+        build_course_zip(course, options['workers'], output)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(f"{total} sertifikat ditulis ke {output} dalam {elapsed:.1f} detik."))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Course
+from core.thumbnails import generate_thumbnails
+
+
+class Command(BaseCommand):
+    help = "Buat rendition thumbnail (THUMBNAIL_SIZES) untuk gambar course yang belum punya."
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_ids', nargs='*', type=int, help="ID course tertentu (default: semua course)")
+        parser.add_argument('--force', action='store_true', help="Tulis ulang rendition yang sudah ada")
+
+    def handle(self, *args, **options):
+        courses = Course.objects.exclude(image='').exclude(image__isnull=True)
+        if options['course_ids']:
+            courses = courses.filter(pk__in=options['course_ids'])
+
+        created = 0
+        for name in courses.values_list('image', flat=True).distinct().iterator():
+            created += len(generate_thumbnails(name, force=options['force']))
+        self.stdout.write(self.style.SUCCESS(f"{created} thumbnail berhasil dibuat."))
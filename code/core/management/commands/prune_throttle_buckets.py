@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from core.throttling import DatabaseBucketBackend, get_backend
+
+
+class Command(BaseCommand):
+    help = "Hapus baris core_throttlebucket yang sudah lama tidak dipakai (bucket-nya pasti penuh kembali)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int, default=24 * 60 * 60,
+                            help="Umur minimal bucket dalam detik (default: 1 hari)")
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        if not isinstance(backend, DatabaseBucketBackend):
+            self.stdout.write("THROTTLE_BACKEND bukan DatabaseBucketBackend, tidak ada yang dihapus.")
+            return
+
+        deleted = backend.prune(options['older_than'])
+        self.stdout.write(self.style.SUCCESS(f"{deleted} throttle bucket dihapus."))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from core.counters import rebuild_counters
+from core.models import Course
+
+
+class Command(BaseCommand):
+    help = "Hitung ulang counter terdenormalisasi pada Course (siswa, asisten, konten, komentar, penyelesaian)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_ids', nargs='*', type=int, help="ID course tertentu (default: semua course)")
+
+    def handle(self, *args, **options):
+        courses = Course.objects.all()
+        if options['course_ids']:
+            courses = courses.filter(pk__in=options['course_ids'])
+
+        updated = rebuild_counters(courses)
+        self.stdout.write(self.style.SUCCESS(f"Counter {updated} course berhasil dihitung ulang."))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from core.models import CourseMember
+from core.progress import rebuild_progress
+
+
+class Command(BaseCommand):
+    help = "Hitung ulang rollup MemberProgress dari Completion dan CourseContent."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course', type=int, action='append', dest='course_ids',
+                            help="Batasi ke course tertentu (boleh diulang)")
+
+    def handle(self, *args, **options):
+        members = CourseMember.objects.all()
+        if options['course_ids']:
+            members = members.filter(course_id__in=options['course_ids'])
+
+        updated = rebuild_progress(members)
+        self.stdout.write(self.style.SUCCESS(f"Progres {updated} anggota berhasil dihitung ulang."))
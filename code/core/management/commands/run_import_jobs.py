@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.jobs import requeue_stale_jobs, run_import_job
+from core.models import ImportJob
+
+
+class Command(BaseCommand):
+    help = "Worker job impor CSV (IMPORT_JOB_RUNNER = 'command'). Beberapa worker boleh berjalan bersamaan."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Proses antrean saat ini lalu berhenti")
+        parser.add_argument('--interval', type=float, default=2.0, help="Jeda polling antrean (detik)")
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            for job_id in requeue_stale_jobs():
+                self.stdout.write(f"Job #{job_id} tidak berdetak lagi, dikembalikan ke antrean.")
+            job_ids = list(
+                ImportJob.objects.filter(state='pending').order_by('created_at').values_list('pk', flat=True)[:10]
+            )
+            for job_id in job_ids:
+                if run_import_job(job_id):
+                    job = ImportJob.objects.get(pk=job_id)
+                    self.stdout.write(f"Job #{job.pk}: {job.state}, {job.rows_imported} konten diimpor.")
+            if options['once'] and not job_ids:
+                return
+            if not job_ids:
+                time.sleep(options['interval'])
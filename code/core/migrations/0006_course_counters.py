@@ -0,0 +1,81 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(model, course_path, outer='pk', **filters):
+    # Disalin dari core.counters saat migrasi ini dibuat: migrasi tidak boleh
+    # bergantung pada kode aplikasi yang bisa berubah
+    counts = (
+        model.objects.filter(**{course_path: OuterRef(outer)}, **filters)
+        .order_by()
+        .values(course_path)
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def fill_counters(apps, schema_editor):
+    Course = apps.get_model('core', 'Course')
+    CourseMember = apps.get_model('core', 'CourseMember')
+    CourseContent = apps.get_model('core', 'CourseContent')
+    Comment = apps.get_model('core', 'Comment')
+    Completion = apps.get_model('core', 'Completion')
+
+    Course.objects.update(
+        num_students=count_subquery(CourseMember, 'course_id', roles='std'),
+        num_assistants=count_subquery(CourseMember, 'course_id', roles='ast'),
+        num_contents=count_subquery(CourseContent, 'course_id'),
+        num_comments=count_subquery(Comment, 'content_id__course_id'),
+        num_completions=count_subquery(Completion, 'content_id__course_id'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_alter_coursecontent_course_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='num_assistants',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='jumlah asisten'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='num_comments',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='jumlah komentar'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='num_completions',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='jumlah penyelesaian'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='num_contents',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='jumlah konten'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='num_students',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='jumlah siswa'),
+        ),
+        migrations.AlterField(
+            model_name='comment',
+            name='content_id',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='core.coursecontent', verbose_name='konten'),
+        ),
+        migrations.AlterField(
+            model_name='coursecontent',
+            name='course_id',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='contents', to='core.course', verbose_name='contents'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
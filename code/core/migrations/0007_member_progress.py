@@ -0,0 +1,73 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(model, course_path, outer='pk', **filters):
+    # Disalin dari core.counters saat migrasi ini dibuat: migrasi tidak boleh
+    # bergantung pada kode aplikasi yang bisa berubah
+    counts = (
+        model.objects.filter(**{course_path: OuterRef(outer)}, **filters)
+        .order_by()
+        .values(course_path)
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def fill_progress(apps, schema_editor):
+    CourseMember = apps.get_model('core', 'CourseMember')
+    CourseContent = apps.get_model('core', 'CourseContent')
+    Completion = apps.get_model('core', 'Completion')
+    MemberProgress = apps.get_model('core', 'MemberProgress')
+
+    MemberProgress.objects.bulk_create(
+        (
+            MemberProgress(member_id_id=pk, user_id_id=user_pk, course_id_id=course_pk)
+            for pk, user_pk, course_pk in CourseMember.objects.values_list('pk', 'user_id', 'course_id').iterator()
+        ),
+        batch_size=1000,
+    )
+    MemberProgress.objects.update(
+        completed_count=count_subquery(Completion, 'member_id', outer='member_id'),
+        total_count=count_subquery(CourseContent, 'course_id', outer='course_id'),
+    )
+    MemberProgress.objects.update(fully_completed=Case(
+        When(Q(total_count__gt=0, completed_count=F('total_count')), then=Value(True)),
+        default=Value(False),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_course_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemberProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('completed_count', models.PositiveIntegerField(default=0, verbose_name='konten selesai')),
+                ('total_count', models.PositiveIntegerField(default=0, verbose_name='total konten')),
+                ('last_activity', models.DateTimeField(blank=True, null=True, verbose_name='aktivitas terakhir')),
+                ('fully_completed', models.BooleanField(default=False, verbose_name='selesai penuh')),
+                ('course_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.course', verbose_name='matkul')),
+                ('member_id', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='progress', to='core.coursemember', verbose_name='anggota')),
+                ('user_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='siswa')),
+            ],
+            options={
+                'verbose_name': 'Progres Anggota',
+                'verbose_name_plural': 'Progres Anggota',
+                'indexes': [models.Index(fields=['user_id', 'fully_completed'], name='progress_user_done_idx')],
+            },
+        ),
+        migrations.RunPython(fill_progress, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:20
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# Index dibuat CONCURRENTLY agar tabel besar tidak terkunci selama migrasi.
+# Index trigram memakai UPPER(kolom) supaya cocok dengan SQL icontains Django.
+SEARCH_INDEXES = [
+    ('course_search_vector_idx', 'core_course', 'gin (search_vector)'),
+    ('core_user_username_trgm_idx', 'auth_user', 'gin (UPPER(username::text) gin_trgm_ops)'),
+    ('core_user_email_trgm_idx', 'auth_user', 'gin (UPPER(email::text) gin_trgm_ops)'),
+    ('core_user_first_name_trgm_idx', 'auth_user', 'gin (UPPER(first_name::text) gin_trgm_ops)'),
+    ('core_user_last_name_trgm_idx', 'auth_user', 'gin (UPPER(last_name::text) gin_trgm_ops)'),
+]
+
+
+def fill_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    from django.contrib.postgres.search import SearchVector
+
+    config = getattr(settings, 'SEARCH_CONFIG', 'simple')
+    Course = apps.get_model('core', 'Course')
+    Course.objects.update(
+        search_vector=SearchVector('name', weight='A', config=config)
+        + SearchVector('description', weight='B', config=config)
+    )
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table, definition in SEARCH_INDEXES:
+        schema_editor.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} USING {definition}')
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _table, _definition in SEARCH_INDEXES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('core', '0007_member_progress'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='course',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(fill_search_vector, migrations.RunPython.noop),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='course',
+                    index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='course_search_vector_idx'),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(create_search_indexes, drop_search_indexes),
+            ],
+        ),
+    ]
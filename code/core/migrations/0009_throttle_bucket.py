@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_course_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ThrottleBucket',
+            fields=[
+                ('key', models.CharField(max_length=255, primary_key=True, serialize=False, verbose_name='key')),
+                ('tokens', models.FloatField(verbose_name='sisa token')),
+                ('updated_at', models.FloatField(verbose_name='diperbarui (epoch)')),
+                ('allowed', models.BooleanField(default=True, verbose_name='request terakhir diizinkan')),
+            ],
+            options={
+                'verbose_name': 'Throttle Bucket',
+                'verbose_name_plural': 'Throttle Bucket',
+            },
+        ),
+    ]
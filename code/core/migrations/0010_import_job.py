@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:40
+
+import core.models
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_throttle_bucket'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.FileField(blank=True, storage=core.models.import_upload_storage, upload_to='%Y/%m/', verbose_name='file CSV')),
+                ('state', models.CharField(choices=[('pending', 'Menunggu'), ('running', 'Berjalan'), ('done', 'Selesai'), ('failed', 'Gagal'), ('cancelled', 'Dibatalkan')], default='pending', max_length=10, verbose_name='status')),
+                ('rows_processed', models.PositiveIntegerField(default=0, verbose_name='baris diproses')),
+                ('rows_failed', models.PositiveIntegerField(default=0, verbose_name='baris gagal')),
+                ('rows_imported', models.PositiveIntegerField(default=0, verbose_name='baris diimpor')),
+                ('error', models.TextField(blank=True, verbose_name='pesan kesalahan')),
+                ('cancel_requested', models.BooleanField(default=False, verbose_name='minta dibatalkan')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='import_jobs', to='core.course', verbose_name='matkul')),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='pengunggah')),
+            ],
+            options={
+                'verbose_name': 'Job Impor',
+                'verbose_name_plural': 'Job Impor',
+                'indexes': [models.Index(fields=['state', 'created_at'], name='importjob_state_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,80 @@
+from django.db import migrations, models
+from django.db.models import Case, Count, F, IntegerField, Min, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(model, course_path, outer='pk', **filters):
+    # Disalin dari core.counters saat migrasi ini dibuat: migrasi tidak boleh
+    # bergantung pada kode aplikasi yang bisa berubah
+    counts = (
+        model.objects.filter(**{course_path: OuterRef(outer)}, **filters)
+        .order_by()
+        .values(course_path)
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def merge_duplicate_members(apps, schema_editor):
+    """
+    Gabungkan CourseMember ganda (course, user) ke baris tertua sebelum constraint
+    dipasang: komentar & penyelesaian dipindah, penyelesaian yang bentrok dihapus.
+    """
+    Course = apps.get_model('core', 'Course')
+    CourseMember = apps.get_model('core', 'CourseMember')
+    CourseContent = apps.get_model('core', 'CourseContent')
+    Comment = apps.get_model('core', 'Comment')
+    Completion = apps.get_model('core', 'Completion')
+    MemberProgress = apps.get_model('core', 'MemberProgress')
+
+    duplicates = (
+        CourseMember.objects.values('course_id', 'user_id')
+        .annotate(total=Count('pk'), keep=Min('pk'))
+        .filter(total__gt=1)
+    )
+    course_ids = set()
+    for group in duplicates.iterator():
+        extra = CourseMember.objects.filter(
+            course_id=group['course_id'], user_id=group['user_id']
+        ).exclude(pk=group['keep'])
+        done = Completion.objects.filter(member_id=group['keep']).values('content_id')
+        Completion.objects.filter(member_id__in=extra, content_id__in=done).delete()
+        Completion.objects.filter(member_id__in=extra).update(member_id=group['keep'])
+        Comment.objects.filter(member_id__in=extra).update(member_id=group['keep'])
+        MemberProgress.objects.filter(member_id__in=extra).delete()
+        extra.delete()
+        course_ids.add(group['course_id'])
+
+    if not course_ids:
+        return
+
+    Course.objects.filter(pk__in=course_ids).update(
+        num_students=count_subquery(CourseMember, 'course_id', roles='std'),
+        num_assistants=count_subquery(CourseMember, 'course_id', roles='ast'),
+        num_completions=count_subquery(Completion, 'content_id__course_id'),
+    )
+    MemberProgress.objects.filter(course_id__in=course_ids).update(
+        completed_count=count_subquery(Completion, 'member_id', outer='member_id'),
+        total_count=count_subquery(CourseContent, 'course_id', outer='course_id'),
+    )
+    # penyelesaian gabungan bisa menutup seluruh konten (sama seperti 0007)
+    MemberProgress.objects.filter(course_id__in=course_ids).update(fully_completed=Case(
+        When(total_count__gt=0, completed_count__gte=F('total_count'), then=Value(True)),
+        default=Value(False),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_import_job'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_members, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='coursemember',
+            constraint=models.UniqueConstraint(fields=('course_id', 'user_id'), name='unique_course_member'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_unique_course_member'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['content_id', 'created_at', 'id'], name='comment_content_created_idx'),
+        ),
+    ]
@@ -1,8 +1,16 @@
 # code/core/models.py
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
 from django.db import models
 from django.contrib.auth.models import User 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db.models.signals import post_save
 
+from .counters import COUNTER_FIELDS
+
+DERIVED_FIELDS = COUNTER_FIELDS + ('search_vector',)
+
 # TABLE COURSE ()
 class Course(models.Model):
     teacher = models.ForeignKey(User, on_delete=models.RESTRICT, verbose_name="pengajar") 
@@ -15,18 +23,42 @@ class Course(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Counter terdenormalisasi, dijaga oleh core/signals.py (lihat core/counters.py)
+    num_students = models.PositiveIntegerField("jumlah siswa", default=0, editable=False)
+    num_assistants = models.PositiveIntegerField("jumlah asisten", default=0, editable=False)
+    num_contents = models.PositiveIntegerField("jumlah konten", default=0, editable=False)
+    num_comments = models.PositiveIntegerField("jumlah komentar", default=0, editable=False)
+    num_completions = models.PositiveIntegerField("jumlah penyelesaian", default=0, editable=False)
+
+    # tsvector untuk full-text search, diperbarui oleh signal (lihat core/search.py)
+    search_vector = SearchVectorField(null=True, editable=False)
+
     class Meta:
         verbose_name = "Mata Kuliah"
         verbose_name_plural = "Mata Kuliah"
+        indexes = [
+            GinIndex(fields=['search_vector'], name='course_search_vector_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Counter & search_vector hanya diubah lewat UPDATE terpisah, jangan ditimpa nilai lama di memori
+        if not self._state.adding and self.pk and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in DERIVED_FIELDS
+            ]
+        super().save(*args, **kwargs)
 
     def student_count(self):
-        return CourseMember.objects.filter(course_id=self, roles='std').count()
+        return self.num_students
+    def member_count(self):
+        return self.num_students + self.num_assistants
     def content_count(self):
-        return self.contents.count()
+        return self.num_contents
     def comment_count(self):
-        return Comment.objects.filter(content_id__course_id=self).count()
-    def content_count(self):
-        return CourseContent.objects.filter(course_id=self).count()
+        return self.num_comments
+    def completion_count(self):
+        return self.num_completions
 
     def __str__(self) -> str:
         return f"{self.name} : Rp{self.price:,}"
@@ -44,6 +76,9 @@ class CourseMember(models.Model):
     class Meta:
         verbose_name = "Subscriber Kuliah"
         verbose_name_plural = "Subscriber Kuliah"
+        constraints = [
+            models.UniqueConstraint(fields=['course_id', 'user_id'], name='unique_course_member'),
+        ]
 
     def __str__(self) -> str:
         return f"{self.user_id.username} → {self.course_id.name} ({self.roles})"
@@ -82,6 +117,9 @@ class Comment(models.Model):
     class Meta:
         verbose_name = "Komentar"
         verbose_name_plural = "Komentar"
+        indexes = [
+            models.Index(fields=['content_id', 'created_at', 'id'], name='comment_content_created_idx'),
+        ]
 
     def __str__(self):
        return f"Komen oleh {self.member_id.user_id.username} pada konten: {self.content_id.name}"
@@ -97,4 +135,90 @@ class Completion(models.Model):
         unique_together = ('member_id', 'content_id') 
 
     def __str__(self):
-        return f"{self.member_id.user_id.username} completed {self.content_id.course_id.name}"
\ No newline at end of file
+        return f"{self.member_id.user_id.username} completed {self.content_id.course_id.name}"
+
+# TABLE MEMBER PROGRESS (rollup per anggota, dijaga oleh core/progress.py)
+class MemberProgress(models.Model):
+    member_id = models.OneToOneField(CourseMember, on_delete=models.CASCADE, verbose_name="anggota", related_name='progress')
+    user_id = models.ForeignKey(User, on_delete=models.CASCADE, verbose_name="siswa")
+    course_id = models.ForeignKey(Course, on_delete=models.CASCADE, verbose_name="matkul")
+
+    completed_count = models.PositiveIntegerField("konten selesai", default=0)
+    total_count = models.PositiveIntegerField("total konten", default=0)
+    last_activity = models.DateTimeField("aktivitas terakhir", null=True, blank=True)
+    fully_completed = models.BooleanField("selesai penuh", default=False)
+
+    class Meta:
+        verbose_name = "Progres Anggota"
+        verbose_name_plural = "Progres Anggota"
+        indexes = [
+            models.Index(fields=['user_id', 'fully_completed'], name='progress_user_done_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.member_id_id}: {self.completed_count}/{self.total_count}"
+
+
+class ThrottleBucket(models.Model):
+    """State token bucket per key throttle, dibagi oleh semua worker (core.throttling)."""
+    key = models.CharField("key", max_length=255, primary_key=True)
+    tokens = models.FloatField("sisa token")
+    updated_at = models.FloatField("diperbarui (epoch)")
+    allowed = models.BooleanField("request terakhir diizinkan", default=True)
+
+    class Meta:
+        verbose_name = "Throttle Bucket"
+        verbose_name_plural = "Throttle Bucket"
+
+    def __str__(self):
+        return f"{self.key}: {self.tokens:.2f}"
+
+
+# TABLE IMPORT JOB (impor CSV di background, core/jobs.py)
+def import_upload_storage():
+    # di luar MEDIA_ROOT: file upload mentah tidak boleh bisa diunduh publik
+    return FileSystemStorage(location=settings.IMPORT_UPLOAD_DIR)
+
+
+IMPORT_STATES = [
+    ('pending', "Menunggu"),
+    ('running', "Berjalan"),
+    ('done', "Selesai"),
+    ('failed', "Gagal"),
+    ('cancelled', "Dibatalkan"),
+]
+
+
+class ImportJob(models.Model):
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, verbose_name="matkul", related_name='import_jobs')
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, verbose_name="pengunggah")
+    file = models.FileField("file CSV", upload_to='%Y/%m/', storage=import_upload_storage, blank=True)
+
+    state = models.CharField("status", max_length=10, choices=IMPORT_STATES, default='pending')
+    rows_processed = models.PositiveIntegerField("baris diproses", default=0)
+    rows_failed = models.PositiveIntegerField("baris gagal", default=0)
+    rows_imported = models.PositiveIntegerField("baris diimpor", default=0)
+    error = models.TextField("pesan kesalahan", blank=True)
+    cancel_requested = models.BooleanField("minta dibatalkan", default=False)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # diperbarui berkala selama job 'running'; job yang berhenti berdetak dianggap mati (core.jobs)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    FINISHED_STATES = ('done', 'failed', 'cancelled')
+
+    class Meta:
+        verbose_name = "Job Impor"
+        verbose_name_plural = "Job Impor"
+        indexes = [
+            models.Index(fields=['state', 'created_at'], name='importjob_state_idx'),
+        ]
+
+    def __str__(self):
+        return f"Impor #{self.pk} {self.course_id} ({self.state})"
+
+    @property
+    def finished(self):
+        return self.state in self.FINISHED_STATES
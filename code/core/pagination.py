@@ -0,0 +1,128 @@
+# /code/core/pagination.py
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from ninja import Field, Schema
+from ninja.errors import ValidationError
+from ninja.pagination import PaginationBase
+
+
+def encode_cursor(values) -> str:
+    """Posisi terakhir (mis. created_at, id) -> token base64 yang opaque bagi klien."""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token: str, size: int) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError) as e:
+        raise ValidationError([{'cursor': 'Cursor tidak valid'}]) from e
+    if not isinstance(values, list) or len(values) != size:
+        raise ValidationError([{'cursor': 'Cursor tidak valid'}])
+    return [parse_datetime(v) or v if isinstance(v, str) else v for v in values]
+
+
+def _field(key):
+    # key berawalan '-' diurutkan menurun, mis. ('-similarity', 'date_joined', 'id')
+    return key.removeprefix('-')
+
+
+def keyset_filter(keys, values, descending=False) -> Q:
+    """
+    Kondisi "setelah posisi ini" untuk urutan komposit, mis. (created_at, id):
+    created_at > c OR (created_at = c AND id > i)
+    """
+    condition = Q()
+    for i, key in enumerate(keys):
+        op = 'lt' if descending != key.startswith('-') else 'gt'
+        step = Q(**{f'{_field(key)}__{op}': values[i]})
+        for prev_key, prev_value in zip(keys[:i], values[:i]):
+            step &= Q(**{_field(prev_key): prev_value})
+        condition |= step
+    return condition
+
+
+def item_position(item, keys) -> list:
+    if isinstance(item, dict):
+        return [item[_field(key)] for key in keys]
+    return [getattr(item, _field(key)) for key in keys]
+
+
+def _keyset_queryset(queryset, keys, cursor, descending):
+    order = [_field(key) if descending == key.startswith('-') else f'-{_field(key)}' for key in keys]
+    queryset = queryset.order_by(*order)
+    if cursor:
+        try:
+            queryset = queryset.filter(keyset_filter(keys, decode_cursor(cursor, len(keys)), descending))
+        except (DjangoValidationError, TypeError, ValueError) as e:
+            raise ValidationError([{'cursor': 'Cursor tidak valid'}]) from e
+    return queryset
+
+
+def _keyset_result(items, keys, page_size):
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        next_cursor = encode_cursor(item_position(items[-1], keys))
+    return items, next_cursor
+
+
+def keyset_page(queryset, keys=('created_at', 'id'), cursor=None, page_size=20, descending=False):
+    """
+    Ambil satu halaman dengan keyset pagination.
+    Return (items, next_cursor); next_cursor None berarti halaman terakhir.
+    """
+    queryset = _keyset_queryset(queryset, keys, cursor, descending)
+    # ambil satu baris ekstra untuk tahu apakah masih ada halaman berikutnya
+    return _keyset_result(list(queryset[:page_size + 1]), keys, page_size)
+
+
+async def akeyset_page(queryset, keys=('created_at', 'id'), cursor=None, page_size=20, descending=False):
+    """keyset_page untuk view async (ORM async, tanpa sync_to_async)."""
+    queryset = _keyset_queryset(queryset, keys, cursor, descending)
+    return _keyset_result([item async for item in queryset[:page_size + 1]], keys, page_size)
+
+
+class KeysetPagination(PaginationBase):
+    """
+    Cursor pagination berbasis (created_at, id) tanpa OFFSET, sehingga halaman
+    ke-N sama murahnya dengan halaman pertama. Total hanya dihitung jika diminta
+    lewat include_total=true.
+    """
+
+    class Input(Schema):
+        cursor: Optional[str] = None
+        page_size: Optional[int] = Field(None, ge=1)
+        include_total: bool = False
+
+    class Output(Schema):
+        items: List[Any]
+        next_cursor: Optional[str] = None
+        count: Optional[int] = None
+
+    def __init__(self, keys=('created_at', 'id'), descending=False, page_size=20, max_page_size=200, **kwargs):
+        self.keys = tuple(keys)
+        self.descending = descending
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+        super().__init__(**kwargs)
+
+    def paginate_queryset(self, queryset, pagination: Input, request, **params):
+        page_size = min(pagination.page_size or self.page_size, self.max_page_size)
+        items, next_cursor = keyset_page(
+            queryset, self.keys, pagination.cursor, page_size, self.descending
+        )
+        return {
+            'items': items,
+            'next_cursor': next_cursor,
+            'count': self._items_count(queryset) if pagination.include_total else None,
+        }
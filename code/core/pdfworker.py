@@ -0,0 +1,42 @@
+# /code/core/pdfworker.py
+"""
+Fungsi yang dijalankan di proses pool render sertifikat. Modul ini sengaja
+tidak mengimpor Django supaya proses worker tetap ringan; WeasyPrint baru
+diimpor saat render pertama (atau di init_worker untuk pool batch).
+"""
+import os
+
+_stylesheets = []
+_font_config = None
+
+
+def init_worker(css=None):
+    """
+    Initializer ProcessPoolExecutor untuk render batch: impor WeasyPrint,
+    siapkan FontConfiguration dan parse stylesheet sertifikat sekali per proses,
+    bukan sekali per PDF.
+    """
+    global _stylesheets, _font_config
+    from weasyprint import CSS
+    from weasyprint.text.fonts import FontConfiguration
+
+    _font_config = FontConfiguration()
+    _stylesheets = [CSS(string=css, font_config=_font_config)] if css else []
+
+
+def render_pdf(html, target):
+    """Tulis PDF dari `html` ke `target` secara atomik (tmp lalu rename)."""
+    from weasyprint import HTML
+
+    tmp = f'{target}.{os.getpid()}.tmp'
+    try:
+        with open(tmp, 'wb') as output:
+            if _font_config is None:
+                HTML(string=html).write_pdf(output)
+            else:
+                HTML(string=html).write_pdf(output, stylesheets=_stylesheets, font_config=_font_config)
+        os.replace(tmp, target)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return target
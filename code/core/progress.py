@@ -0,0 +1,74 @@
+# /code/core/progress.py
+from django.db.models import BooleanField, Case, F, Q, Value, When
+from django.db.models.functions import Greatest, Now
+from django.db.models.lookups import Exact, GreaterThan
+
+from .counters import count_subquery
+
+
+def _fully_completed(completed, total):
+    return Case(
+        When(Q(GreaterThan(total, 0)) & Q(Exact(completed, total)), then=Value(True)),
+        default=Value(False),
+        output_field=BooleanField(),
+    )
+
+
+def adjust_progress(queryset, completed=0, total=0, touch=False):
+    """
+    Geser completed_count/total_count secara atomik dan hitung ulang flag
+    fully_completed dari nilai baru dalam UPDATE yang sama.
+    """
+    if not (completed or total or touch):
+        return 0
+
+    new_completed = Greatest(F('completed_count') + completed, Value(0))
+    new_total = Greatest(F('total_count') + total, Value(0))
+    changes = {
+        'completed_count': new_completed,
+        'total_count': new_total,
+        'fully_completed': _fully_completed(new_completed, new_total),
+    }
+    if touch:
+        changes['last_activity'] = Now()
+    return queryset.update(**changes)
+
+
+def create_progress(member):
+    """Baris progres awal untuk anggota baru, total diambil dari counter course."""
+    from .models import Course, MemberProgress
+
+    total = Course.objects.filter(pk=member.course_id_id).values_list('num_contents', flat=True).first()
+    return MemberProgress.objects.get_or_create(
+        member_id=member,
+        defaults={
+            'user_id_id': member.user_id_id,
+            'course_id_id': member.course_id_id,
+            'total_count': total or 0,
+        },
+    )[0]
+
+
+def rebuild_progress(members=None):
+    """Hitung ulang rollup dari Completion & CourseContent, membuat baris yang belum ada."""
+    from .models import CourseContent, CourseMember, Completion, MemberProgress
+
+    if members is None:
+        members = CourseMember.objects.all()
+
+    missing = members.filter(progress__isnull=True).values_list('pk', 'user_id', 'course_id')
+    MemberProgress.objects.bulk_create(
+        (
+            MemberProgress(member_id_id=pk, user_id_id=user_pk, course_id_id=course_pk)
+            for pk, user_pk, course_pk in missing.iterator()
+        ),
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+    progress = MemberProgress.objects.filter(member_id__in=members.values('pk'))
+    progress.update(
+        completed_count=count_subquery(Completion, 'member_id', outer='member_id'),
+        total_count=count_subquery(CourseContent, 'course_id', outer='course_id'),
+    )
+    return progress.update(fully_completed=_fully_completed(F('completed_count'), F('total_count')))
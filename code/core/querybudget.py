@@ -0,0 +1,163 @@
+# /code/core/querybudget.py
+import logging
+import re
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('core.querybudget')
+
+_IN_LIST = re.compile(r'\bIN \((?:%s|\?)(?:, (?:%s|\?))*\)', re.IGNORECASE)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+\b')
+_SPACES = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def sql_shape(sql):
+    """Normalisasi SQL supaya query yang sama dengan parameter berbeda dianggap satu bentuk."""
+    shape = _STRING.sub('?', sql)
+    shape = _NUMBER.sub('?', shape)
+    shape = _IN_LIST.sub('IN (...)', shape)
+    return _SPACES.sub(' ', shape).strip()
+
+
+class QueryCounter:
+    """Dipasang lewat connection.execute_wrapper(); mencatat jumlah & bentuk query."""
+
+    def __init__(self):
+        self.count = 0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        self.shapes[sql_shape(sql)] += 1
+        return execute(sql, params, many, context)
+
+    def repeated(self, threshold):
+        """Bentuk SQL yang muncul >= threshold kali: kandidat N+1."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+    def violations(self, budget=None, repeat_threshold=None):
+        problems = []
+        if budget is not None and self.count > budget:
+            problems.append(f"{self.count} query melebihi budget {budget}")
+        if repeat_threshold:
+            for shape, n in self.repeated(repeat_threshold):
+                problems.append(f"N+1? {n}x: {shape[:200]}")
+        return problems
+
+
+@contextmanager
+def count_queries(using=None):
+    """Hitung query pada semua koneksi (atau alias tertentu) selama blok berjalan."""
+    counter = QueryCounter()
+    aliases = [using] if using else list(connections)
+    with ExitStack() as stack:
+        for alias in aliases:
+            stack.enter_context(connections[alias].execute_wrapper(counter))
+        yield counter
+
+
+def query_budget(max_queries):
+    """Dekorator untuk view Django biasa: deklarasi budget query per request."""
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(*args, **kwargs):
+            return view_func(*args, **kwargs)
+        wrapper.query_budget = max_queries
+        return wrapper
+    return decorator
+
+
+class QueryBudgetMiddleware:
+    """
+    Menghitung query per request dan melaporkan route yang melebihi budget atau
+    mengulang bentuk SQL yang sama (N+1). Budget diambil dari @query_budget pada
+    view, atau dari settings.QUERY_BUDGETS berdasarkan nama URL (mis.
+    'apiv1:list_contents'), lalu QUERY_BUDGET_DEFAULT.
+
+    Dengan QUERY_BUDGET_RAISE = True pelanggaran dilempar sebagai
+    QueryBudgetExceeded (cocok untuk development/CI), selain itu hanya di-log.
+    Query di dalam StreamingHttpResponse berjalan setelah middleware selesai
+    sehingga tidak ikut dihitung.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'QUERY_BUDGET_ENABLED', True)
+        self.budgets = getattr(settings, 'QUERY_BUDGETS', {})
+        self.default_budget = getattr(settings, 'QUERY_BUDGET_DEFAULT', None)
+        self.repeat_threshold = getattr(settings, 'QUERY_BUDGET_REPEAT_THRESHOLD', 5)
+        self.raise_errors = getattr(settings, 'QUERY_BUDGET_RAISE', False)
+        # di ASGI ikut async supaya request tidak ditahan di thread selama view berjalan
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        with count_queries() as counter:
+            response = self.get_response(request)
+        return self._check(request, response, counter)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        # koneksi database per thread: ORM async berjalan di thread sync_to_async
+        # (thread_sensitive) milik request ini, jadi counter dipasang di thread itu
+        scope = count_queries()
+        counter = await sync_to_async(scope.__enter__)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(scope.__exit__)(None, None, None)
+        return self._check(request, response, counter)
+
+    def _check(self, request, response, counter):
+        budget = None
+        match = request.resolver_match
+        if match is not None:
+            budget = getattr(match.func, 'query_budget', None)
+            if budget is None:
+                budget = self.budgets.get(match.view_name, self.default_budget)
+
+        problems = counter.violations(budget, self.repeat_threshold)
+        if settings.DEBUG:
+            response['X-Query-Count'] = str(counter.count)
+        if problems:
+            message = f"{request.method} {request.path}: " + "; ".join(problems)
+            if self.raise_errors:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+
+class QueryBudgetTestMixin:
+    """Helper untuk TestCase: gagal jika blok melebihi budget atau ada pola N+1."""
+
+    def assertQueryBudget(self, max_queries, repeat_threshold=None):
+        return _assert_budget(self, max_queries, repeat_threshold)
+
+
+@contextmanager
+def _assert_budget(testcase, max_queries, repeat_threshold):
+    with count_queries() as counter:
+        yield counter
+    problems = counter.violations(max_queries, repeat_threshold)
+    if problems:
+        testcase.fail("\n".join(problems))
@@ -0,0 +1,104 @@
+# /code/core/renderers.py
+"""
+Serialisasi respons NinjaAPI.
+
+- ORJSONRenderer: renderer opt-in (API_FAST_JSON = True) berbasis orjson.
+  Tanggal, Decimal, UUID, dll. tetap diformat oleh NinjaJSONEncoder sehingga
+  nilainya sama persis dengan renderer bawaan; yang berbeda hanya spasi.
+- trusted_values: jalur cepat untuk endpoint list yang mengembalikan baris
+  .values(). Baris dari database sudah bertipe benar, jadi validasi pydantic
+  per objek dilewati dan baris hanya diproyeksikan ke field schema.
+
+`manage.py bench_serialization` membandingkan biayanya.
+"""
+from functools import lru_cache, wraps
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse, HttpResponseBase
+from ninja.renderers import BaseRenderer, JSONRenderer
+from ninja.responses import NinjaJSONEncoder
+
+_encoder = NinjaJSONEncoder()
+
+
+class ORJSONRenderer(BaseRenderer):
+    media_type = 'application/json'
+
+    def __init__(self):
+        try:
+            import orjson
+        except ImportError as e:
+            raise ImproperlyConfigured("API_FAST_JSON membutuhkan paket orjson") from e
+        self._dumps = orjson.dumps
+        # datetime lewat encoder Django: format sama dengan renderer bawaan ("...123Z")
+        self._option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def render(self, request, data, *, response_status):
+        return self._dumps(data, default=_encoder.default, option=self._option)
+
+
+@lru_cache(maxsize=None)
+def api_renderer():
+    """Renderer yang dipakai semua NinjaAPI proyek (lihat settings.API_FAST_JSON)."""
+    if getattr(settings, 'API_FAST_JSON', False):
+        return ORJSONRenderer()
+    return JSONRenderer()
+
+
+def trusted_fields(schema):
+    """
+    Pasangan (key output, key di baris) untuk `schema`. Hanya schema berisi
+    field biasa yang boleh dilewati validasinya: resolver dan validator
+    mengubah nilai sehingga wajib lewat pydantic.
+    """
+    decorators = schema.__pydantic_decorators__
+    if schema._ninja_resolvers or decorators.field_validators or decorators.field_serializers:
+        raise ImproperlyConfigured(f"{schema.__name__} memakai resolver/validator; tidak bisa trusted_values")
+    return tuple((name, field.alias or name) for name, field in schema.model_fields.items())
+
+
+def project_rows(rows, fields):
+    return [{key: row[source] for key, source in fields} for row in rows]
+
+
+def row_serializer(schema):
+    """
+    Fungsi baris .values() -> dict output `schema` untuk respons di luar ninja
+    (streaming): proyeksi langsung bila schema trusted, selain itu lewat
+    pydantic sehingga resolver (mis. thumbnails) ikut dijalankan.
+    """
+    try:
+        fields = trusted_fields(schema)
+    except ImproperlyConfigured:
+        return lambda row: schema.model_validate(row).model_dump()
+    return lambda row: {key: row[source] for key, source in fields}
+
+
+def trusted_values(schema):
+    """
+    Dekorator endpoint ninja yang sudah di-@paginate dan mengembalikan
+    .values() berisi semua field `schema` (kolom ekstra seperti created_at
+    untuk cursor dibuang). Respons streaming dilewatkan apa adanya.
+
+        @apiv1.get('/members', response=List[CourseMemberSchema])
+        @trusted_values(CourseMemberSchema)
+        @streamable(schema=CourseMemberSchema)
+        @paginate(KeysetPagination)
+        def list_members(request): ...
+    """
+    fields = trusted_fields(schema)
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, **kwargs):
+            page = view_func(request, **kwargs)
+            if isinstance(page, HttpResponseBase):
+                return page
+            renderer = api_renderer()
+            body = renderer.render(request, dict(page, items=project_rows(page['items'], fields)), response_status=200)
+            return HttpResponse(body, content_type=f'{renderer.media_type}; charset={renderer.charset}')
+
+        return wrapper
+
+    return decorator
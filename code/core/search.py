@@ -0,0 +1,81 @@
+# /code/core/search.py
+from django.conf import settings
+from django.db import connection
+from django.db.models import F, Q
+from django.db.models.functions import Greatest, Upper
+
+# Kolom user yang dicari; index trigram dibuat di atas UPPER(kolom) supaya
+# lookup icontains bawaan Django (UPPER(..) LIKE UPPER(..)) ikut memakai index
+USER_SEARCH_FIELDS = ('username', 'first_name', 'last_name', 'email')
+USER_FUZZY_FIELDS = ('username', 'email')
+
+
+def is_postgres():
+    return connection.vendor == 'postgresql'
+
+
+def search_config():
+    return getattr(settings, 'SEARCH_CONFIG', 'simple')
+
+
+def course_search_vector():
+    from django.contrib.postgres.search import SearchVector
+
+    config = search_config()
+    return (
+        SearchVector('name', weight='A', config=config)
+        + SearchVector('description', weight='B', config=config)
+    )
+
+
+def _course_query(query):
+    from django.contrib.postgres.search import SearchQuery
+
+    return SearchQuery(query, search_type='websearch', config=search_config())
+
+
+def course_search_q(query):
+    """Kondisi pencarian course, bisa dipakai di filter() maupun FilterSchema."""
+    if not query:
+        return Q()
+    if is_postgres():
+        return Q(search_vector=_course_query(query))
+    return Q(name__icontains=query) | Q(description__icontains=query)
+
+
+def search_courses(queryset, query):
+    """Filter course dengan full-text search dan urutkan berdasarkan relevansi."""
+    if not query:
+        return queryset
+    queryset = queryset.filter(course_search_q(query))
+    if is_postgres():
+        from django.contrib.postgres.search import SearchRank
+
+        queryset = queryset.annotate(
+            rank=SearchRank(F('search_vector'), _course_query(query))
+        ).order_by('-rank', '-created_at')
+    return queryset
+
+
+def search_users(queryset, query):
+    """Cari user berdasarkan substring + kemiripan trigram (toleran typo)."""
+    if not query:
+        return queryset
+
+    condition = Q()
+    for field in USER_SEARCH_FIELDS:
+        condition |= Q(**{f'{field}__icontains': query})
+
+    if not is_postgres():
+        return queryset.filter(condition)
+
+    from django.contrib.postgres.search import TrigramSimilarity
+
+    needle = query.upper()
+    aliases = {f'_upper_{field}': Upper(field) for field in USER_FUZZY_FIELDS}
+    for alias in aliases:
+        condition |= Q(**{f'{alias}__trigram_similar': needle})
+
+    return queryset.alias(**aliases).filter(condition).annotate(
+        similarity=Greatest(*(TrigramSimilarity(Upper(field), needle) for field in USER_FUZZY_FIELDS))
+    ).order_by('-similarity', 'date_joined')
@@ -0,0 +1,79 @@
+# /code/core/services.py
+"""
+Logika baca bersama untuk handler apiv1 dan view HTML. Keduanya memanggil
+fungsi di sini secara in-process, bukan lewat HTTP ke API sendiri, sehingga
+satu page view tidak lagi memakan worker gunicorn kedua.
+"""
+from django.contrib.auth import get_user_model
+from django.core.paginator import Paginator
+
+from django.db.models import F
+
+from .pagination import akeyset_page, keyset_page
+from .search import is_postgres, search_users
+
+USER_ORDERING = ('date_joined', 'id')
+USERS_PER_PAGE = 5
+
+COMMENT_ORDERING = ('created_at', 'id')
+COMMENTS_PER_PAGE = 20
+
+
+def filter_users(search=None):
+    """Queryset user difilter `search` bila ada; urutannya ditentukan user_page."""
+    return search_users(get_user_model().objects.all(), search)
+
+
+def user_ordering(search=None):
+    """Kunci keyset daftar user: di Postgres hasil pencarian diurutkan dari yang paling mirip."""
+    if search and is_postgres():
+        return ('-similarity',) + USER_ORDERING
+    return USER_ORDERING
+
+
+def user_page(search=None, cursor=None, page_size=USERS_PER_PAGE, fields=None):
+    """
+    Satu halaman user (difilter `search` bila ada) dengan keyset pada
+    user_ordering(), dipakai apiv1 maupun view HTML sehingga urutan dan
+    halamannya sama. `fields` membatasi kolom lewat .values(); kolom kunci
+    ikut diambil untuk cursor. Return (users, next_cursor).
+    """
+    keys = user_ordering(search)
+    users = filter_users(search)
+    if fields:
+        users = users.values(*dict.fromkeys([*fields, *(key.removeprefix('-') for key in keys)]))
+    return keyset_page(users, keys, cursor, page_size)
+
+
+def _comment_rows(content):
+    from .models import Comment
+
+    return Comment.objects.filter(content_id=content).values(
+        'id', 'comment', 'created_at', user_pk=F('member_id__user_id'), username=F('member_id__user_id__username'),
+    )
+
+
+def comment_feed(content, cursor=None, page_size=COMMENTS_PER_PAGE):
+    """
+    Satu halaman komentar sebuah konten, terbaru lebih dulu, dengan keyset
+    (created_at, id) di atas indeks comment_content_created_idx. Hanya kolom
+    yang ditampilkan yang di-SELECT; username diambil lewat JOIN yang sama.
+    Return (komentar, next_cursor); cursor tidak valid -> ninja ValidationError.
+    """
+    return keyset_page(_comment_rows(content), COMMENT_ORDERING, cursor, page_size, descending=True)
+
+
+async def acomment_feed(content, cursor=None, page_size=COMMENTS_PER_PAGE):
+    return await akeyset_page(_comment_rows(content), COMMENT_ORDERING, cursor, page_size, descending=True)
+
+
+async def apaginate(queryset, per_page, number):
+    """
+    Paginator.get_page untuk view async: jumlah baris dihitung dengan acount()
+    dan isi halaman dimuat dengan async for, sehingga template tidak menyentuh ORM.
+    """
+    paginator = Paginator(queryset, per_page)
+    paginator.count = await queryset.acount()
+    page = paginator.get_page(number)
+    page.object_list = [item async for item in page.object_list]
+    return page
@@ -0,0 +1,177 @@
+# /code/core/signals.py
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Subquery
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from .counters import ROLE_COUNTERS, adjust_counters
+from .models import Course, CourseMember, CourseContent, Comment, Completion, MemberProgress
+from .progress import adjust_progress, create_progress, rebuild_progress
+from .search import course_search_vector, is_postgres
+from .catalog import bump_catalog_version, bump_table_version
+from .stats import invalidate_user_stats
+from .thumbnails import generate_thumbnails
+
+
+def _course_of(instance, field_name='course_id'):
+    """Ambil course dari relasi tanpa query tambahan jika objeknya sudah di-cache."""
+    field = instance._meta.get_field(field_name)
+    if field.is_cached(instance):
+        return getattr(instance, field_name)
+    return getattr(instance, field.attname)
+
+
+def _course_of_content(instance):
+    """Course milik sebuah Comment/Completion, lewat content_id."""
+    field = instance._meta.get_field('content_id')
+    if instance.content_id_id is None:
+        return None
+    if field.is_cached(instance):
+        return _course_of(instance.content_id)
+    return Subquery(
+        CourseContent.objects.filter(pk=instance.content_id_id).values('course_id')[:1]
+    )
+
+
+def _role_delta(roles, delta):
+    field = ROLE_COUNTERS.get(roles)
+    return {field: delta} if field else {}
+
+
+# --- KATALOG ---
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=CourseMember)
+@receiver(post_delete, sender=CourseMember)
+@receiver(post_save, sender=CourseContent)
+@receiver(post_delete, sender=CourseContent)
+def invalidate_catalog(sender, **kwargs):
+    # setelah commit: bila versi naik di dalam transaksi, request lain bisa
+    # membangun ulang cache dari data lama lalu menyimpannya di versi baru
+    transaction.on_commit(bump_catalog_version)
+
+
+@receiver(post_save, sender=CourseContent)
+@receiver(post_delete, sender=CourseContent)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_table(sender, **kwargs):
+    # validator ETag endpoint /contents dan /comments (core.conditional.table_state)
+    transaction.on_commit(lambda: bump_table_version(sender))
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=CourseMember)
+@receiver(post_delete, sender=CourseMember)
+def invalidate_stats(sender, update_fields=None, **kwargs):
+    # login hanya menulis last_login, tidak mengubah statistik
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    invalidate_user_stats()
+
+
+# --- COURSE ---
+
+@receiver(post_save, sender=Course)
+def refresh_search_vector(sender, instance, update_fields=None, **kwargs):
+    if not is_postgres():
+        return
+    if update_fields is not None and not {'name', 'description'} & set(update_fields):
+        return
+    Course.objects.filter(pk=instance.pk).update(search_vector=course_search_vector())
+
+
+@receiver(post_save, sender=Course)
+def create_image_thumbnails(sender, instance, update_fields=None, **kwargs):
+    if not instance.image or (update_fields is not None and 'image' not in update_fields):
+        return
+    # Rendition yang sudah ada dilewati, jadi hanya upload baru yang di-resize
+    name = instance.image.name
+    transaction.on_commit(lambda: generate_thumbnails(name))
+
+
+# --- COURSE MEMBER ---
+
+@receiver(pre_save, sender=CourseMember)
+def remember_member_state(sender, instance, **kwargs):
+    # Simpan course & peran lama supaya perpindahan peran bisa dihitung ulang
+    instance._previous_state = None
+    if instance.pk and not instance._state.adding:
+        instance._previous_state = CourseMember.objects.filter(pk=instance.pk).values_list(
+            'course_id', 'roles'
+        ).first()
+
+
+@receiver(post_save, sender=CourseMember)
+def count_member_saved(sender, instance, created, **kwargs):
+    if created:
+        adjust_counters(_course_of(instance), **_role_delta(instance.roles, 1))
+        create_progress(instance)
+        return
+
+    previous = getattr(instance, '_previous_state', None)
+    if previous is None:
+        return
+    old_course, old_roles = previous
+    if (old_course, old_roles) != (instance.course_id_id, instance.roles):
+        adjust_counters(old_course, **_role_delta(old_roles, -1))
+        adjust_counters(_course_of(instance), **_role_delta(instance.roles, 1))
+
+    if old_course != instance.course_id_id:
+        MemberProgress.objects.filter(member_id=instance).update(
+            course_id=instance.course_id_id, user_id=instance.user_id_id
+        )
+        rebuild_progress(CourseMember.objects.filter(pk=instance.pk))
+
+
+@receiver(post_delete, sender=CourseMember)
+def count_member_deleted(sender, instance, **kwargs):
+    adjust_counters(_course_of(instance), **_role_delta(instance.roles, -1))
+
+
+# --- COURSE CONTENT ---
+
+@receiver(post_save, sender=CourseContent)
+def count_content_saved(sender, instance, created, **kwargs):
+    if created:
+        adjust_counters(_course_of(instance), num_contents=1)
+        adjust_progress(MemberProgress.objects.filter(course_id=instance.course_id_id), total=1)
+
+
+@receiver(post_delete, sender=CourseContent)
+def count_content_deleted(sender, instance, **kwargs):
+    adjust_counters(_course_of(instance), num_contents=-1)
+    adjust_progress(MemberProgress.objects.filter(course_id=instance.course_id_id), total=-1)
+
+
+# --- COMMENT & COMPLETION ---
+
+@receiver(post_save, sender=Comment)
+def count_comment_saved(sender, instance, created, **kwargs):
+    if created:
+        adjust_counters(_course_of_content(instance), num_comments=1)
+
+
+@receiver(post_delete, sender=Comment)
+def count_comment_deleted(sender, instance, **kwargs):
+    adjust_counters(_course_of_content(instance), num_comments=-1)
+
+
+@receiver(post_save, sender=Completion)
+def count_completion_saved(sender, instance, created, **kwargs):
+    if created:
+        adjust_counters(_course_of_content(instance), num_completions=1)
+        adjust_progress(
+            MemberProgress.objects.filter(member_id=instance.member_id_id), completed=1, touch=True
+        )
+
+
+@receiver(post_delete, sender=Completion)
+def count_completion_deleted(sender, instance, **kwargs):
+    adjust_counters(_course_of_content(instance), num_completions=-1)
+    adjust_progress(MemberProgress.objects.filter(member_id=instance.member_id_id), completed=-1)
@@ -0,0 +1,69 @@
+# /code/core/startup.py
+"""
+Boot worker: daftar dependensi berat yang harus tetap lazy dan warmup opsional
+untuk gunicorn preload_app (lihat gunicorn_config.py).
+"""
+import logging
+import sys
+import time
+from pathlib import Path
+
+logger = logging.getLogger('core.startup')
+
+# Hanya boleh di-import saat pertama dipakai (render PDF di process pool,
+# thumbnail, dll.), bukan saat worker/manage.py boot
+HEAVY_MODULES = ('weasyprint', 'PIL', 'requests')
+
+
+def loaded_heavy_modules():
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+
+def _template_names():
+    """Template milik proyek (bukan admin/contrib) yang bisa ditemukan loader."""
+    from django.conf import settings
+    from django.template import engines
+
+    for engine in engines.all():
+        for directory in map(Path, engine.template_dirs):
+            if directory.is_relative_to(settings.BASE_DIR):
+                for path in directory.rglob('*.html'):
+                    yield path.relative_to(directory).as_posix()
+
+
+def warmup():
+    """
+    Siapkan semua yang biasanya dibayar request pertama tiap worker: resolver
+    URL (termasuk reverse), template terkompilasi di cached loader, hash
+    template sertifikat dan versi katalog. Dipanggil di master gunicorn sebelum
+    fork sehingga hasilnya dibagi ke semua worker (copy-on-write). Koneksi
+    database ditutup di akhir agar tidak ikut terbagi ke proses anak.
+    """
+    from django.db import connections
+    from django.template import TemplateSyntaxError
+    from django.template.loader import get_template
+    from django.urls import get_resolver
+
+    from .catalog import catalog_version
+    from .certificates import template_hash
+
+    start = time.perf_counter()
+    resolver = get_resolver()
+    resolver.reverse_dict  # memicu _populate() untuk semua namespace
+    for namespace in resolver.namespace_dict:
+        resolver.namespace_dict[namespace][1].reverse_dict
+
+    templates = 0
+    for name in _template_names():
+        try:
+            get_template(name)
+            templates += 1
+        except TemplateSyntaxError:
+            logger.warning("Template %s gagal dikompilasi saat warmup", name, exc_info=True)
+
+    template_hash()
+    catalog_version()
+    connections.close_all()
+
+    logger.info("Warmup selesai dalam %.0f ms (%d template)", (time.perf_counter() - start) * 1000, templates)
+    return templates
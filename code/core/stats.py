@@ -0,0 +1,37 @@
+# /code/core/stats.py
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, Exists, OuterRef, Q
+
+STATS_CACHE_KEY = 'stats:users'
+
+
+def compute_user_stats():
+    """Semua statistik halaman user dalam satu query agregat."""
+    from .models import Course
+
+    User = get_user_model()
+    teaches = Exists(Course.objects.filter(teacher=OuterRef('pk')))
+
+    # LEFT JOIN ke CourseMember melipatgandakan baris user, jadi semua hitungan distinct
+    row = User.objects.aggregate(
+        total_users=Count('pk', distinct=True),
+        admin=Count('pk', filter=Q(is_superuser=True), distinct=True),
+        staff=Count('pk', filter=Q(is_staff=True), distinct=True),
+        siswa=Count('pk', filter=Q(is_staff=False, is_superuser=False), distinct=True),
+        teacher=Count('pk', filter=Q(teaches), distinct=True),
+        total_course=Count('coursemember__course_id', distinct=True),
+        total_member=Count('coursemember__user_id', filter=Q(coursemember__roles='std'), distinct=True),
+    )
+    row['rata2'] = row['total_course'] / row['total_member'] if row['total_member'] > 0 else 0
+    return row
+
+
+def get_user_stats():
+    """Statistik user dari cache (TTL USER_STATS_TTL), dihitung ulang bila kosong."""
+    return cache.get_or_set(STATS_CACHE_KEY, compute_user_stats, getattr(settings, 'USER_STATS_TTL', 300))
+
+
+def invalidate_user_stats():
+    cache.delete(STATS_CACHE_KEY)
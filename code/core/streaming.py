@@ -0,0 +1,90 @@
+# /code/core/streaming.py
+from functools import wraps
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+from .renderers import row_serializer
+
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+DEFAULT_CHUNK_SIZE = 2000
+
+_encoder = DjangoJSONEncoder(separators=(',', ':'))
+
+
+def stream_format(request):
+    """'ndjson' / 'json' jika klien meminta respons streaming, selain itu None."""
+    fmt = request.GET.get('format')
+    if fmt in ('ndjson', 'json'):
+        return fmt
+    if NDJSON_CONTENT_TYPE in request.headers.get('Accept', ''):
+        return 'ndjson'
+    return None
+
+
+def _batched_rows(queryset, chunk_size, serialize=None):
+    # iterator() memakai server-side cursor di Postgres, jadi hanya satu chunk
+    # baris yang pernah ada di memori worker
+    batch = []
+    for row in queryset.iterator(chunk_size=chunk_size):
+        batch.append(_encoder.encode(serialize(row) if serialize else row))
+        if len(batch) >= chunk_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_ndjson(queryset, chunk_size=DEFAULT_CHUNK_SIZE, serialize=None):
+    for batch in _batched_rows(queryset, chunk_size, serialize):
+        yield '\n'.join(batch) + '\n'
+
+
+def iter_json_array(queryset, chunk_size=DEFAULT_CHUNK_SIZE, serialize=None):
+    yield '['
+    separator = ''
+    for batch in _batched_rows(queryset, chunk_size, serialize):
+        yield separator + ','.join(batch)
+        separator = ','
+    yield ']'
+
+
+def stream_response(queryset, fmt='ndjson', chunk_size=DEFAULT_CHUNK_SIZE, serialize=None):
+    """
+    StreamingHttpResponse dari queryset .values(); memori tetap datar berapapun
+    jumlah barisnya. `serialize` (opsional) mengubah setiap baris sebelum di-encode.
+    """
+    if fmt == 'json':
+        return StreamingHttpResponse(iter_json_array(queryset, chunk_size, serialize), content_type='application/json')
+    return StreamingHttpResponse(iter_ndjson(queryset, chunk_size, serialize), content_type=NDJSON_CONTENT_TYPE)
+
+
+def streamable(func=None, *, chunk_size=DEFAULT_CHUNK_SIZE, ordering=('created_at', 'id'), schema=None):
+    """
+    Dekorator untuk endpoint list yang sudah di-@paginate: dengan ?format=ndjson,
+    ?format=json atau header Accept: application/x-ndjson, seluruh hasil dikirim
+    sebagai stream tanpa pagination. Baris diurutkan seperti KeysetPagination
+    (`ordering`) dan, bila `schema` diberikan, dibentuk sama dengan item respons
+    biasa (kolom ekstra dibuang, resolver dijalankan).
+
+        @apiv1.get('/comments', response=List[CommentSchema])
+        @streamable(schema=CommentSchema)
+        @paginate(KeysetPagination)
+        def list_comments(request): ...
+    """
+    def decorator(view_func):
+        source = getattr(view_func, '__wrapped__', view_func)
+        serialize = row_serializer(schema) if schema is not None else None
+
+        @wraps(view_func)
+        def wrapper(request, **kwargs):
+            fmt = stream_format(request)
+            if fmt is None:
+                return view_func(request, **kwargs)
+            kwargs.pop('ninja_pagination', None)
+            queryset = source(request, **kwargs).order_by(*ordering)
+            return stream_response(queryset, fmt, chunk_size, serialize)
+
+        return wrapper
+
+    return decorator(func) if func is not None else decorator
@@ -0,0 +1,11 @@
+from django import template
+
+from core.thumbnails import thumbnail_url
+
+register = template.Library()
+
+
+@register.filter
+def thumbnail(image, size):
+    """{{ course.image|thumbnail:'card' }} -> URL rendition ukuran 'card' (lihat THUMBNAIL_SIZES)."""
+    return thumbnail_url(image, size)
@@ -1,8 +1,53 @@
-from django.test import TestCase
+import hashlib
+import io
+import csv
+import gzip
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import types
+import zipfile
+from datetime import timedelta
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from unittest import mock
+
+from django.conf import settings
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
 from django.contrib.auth.models import User
-from .models import Course, CourseMember, CourseContent
-from django.core.exceptions import ValidationError
-from django.db import IntegrityError
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile, UploadedFile
+from .search import search_courses, search_users
+from .aggregates import annotate_course_counts
+from .catalog import bump_catalog_version, get_or_build
+from . import certificates, pdfworker
+from .importer import ImportCancelled, import_content_from_csv
+from .jobs import requeue_stale_jobs
+from .stats import get_user_stats
+from .enrollment import bulk_enroll
+from .pagination import keyset_page
+from .services import USER_ORDERING, user_ordering
+from .completions import _insert_completions, complete_contents
+from .startup import warmup
+from . import thumbnails
+from .thumbnails import generate_thumbnails, thumbnail_name, thumbnail_url
+from .renderers import ORJSONRenderer, api_renderer, trusted_fields
+from . import async_views, urls as core_urls
+from .throttling import AnonRateThrottle, CacheBucketBackend, DatabaseBucketBackend
+from .querybudget import QueryBudgetExceeded, QueryBudgetTestMixin, sql_shape
+from .models import Course, CourseMember, CourseContent, Comment, Completion, MemberProgress, ThrottleBucket, ImportJob
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.db import IntegrityError, connection, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.utils import timezone
+from ninja_simple_jwt.jwt.key_retrieval import InMemoryJwtKeyPair
+from ninja_simple_jwt.jwt.token_operations import get_access_token_for_user
+
+# request API tanpa login melewati bucket AnonRateThrottle dan AuthRateThrottle (satu UPSERT masing-masing)
+THROTTLE_QUERIES = 2
 
 
 class CourseModelTest(TestCase):
@@ -191,4 +236,1540 @@ class CourseMemberEnrollmentTest(TestCase):
         CourseMember.objects.create(course_id=self.course, user_id=student2, roles='std')
 
         # Test method student_count() dari model Course
-        self.assertEqual(self.course.student_count(), 2)
\ No newline at end of file
+        self.assertEqual(self.course.student_count(), 2)
+
+class CourseCounterTest(TestCase):
+    """
+    Test counter terdenormalisasi pada Course yang dijaga oleh signal
+    """
+
+    def setUp(self):
+        self.teacher = User.objects.create(username='teacher1')
+        self.student = User.objects.create(username='student1')
+        self.course = Course.objects.create(name="Pemrograman Django", teacher=self.teacher)
+
+    def test_counters_follow_writes(self):
+        member = CourseMember.objects.create(course_id=self.course, user_id=self.student, roles='std')
+        content = CourseContent.objects.create(name="Intro", course_id=self.course)
+        Comment.objects.create(content_id=content, member_id=member, comment="Mantap")
+        Completion.objects.create(member_id=member, content_id=content)
+
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.student_count(), 1)
+        self.assertEqual(self.course.content_count(), 1)
+        self.assertEqual(self.course.comment_count(), 1)
+        self.assertEqual(self.course.completion_count(), 1)
+
+        member.roles = 'ast'
+        member.save()
+        self.course.refresh_from_db()
+        self.assertEqual((self.course.num_students, self.course.num_assistants), (0, 1))
+
+        content.delete()
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.content_count(), 0)
+        self.assertEqual(self.course.comment_count(), 0)
+        self.assertEqual(self.course.completion_count(), 0)
+
+    def test_course_save_does_not_overwrite_counters(self):
+        stale = Course.objects.get(pk=self.course.pk)
+        CourseMember.objects.create(course_id=self.course, user_id=self.student, roles='std')
+
+        stale.name = "Django Lanjut"
+        stale.save()
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.num_students, 1)
+
+    def test_rebuild_command(self):
+        CourseMember.objects.create(course_id=self.course, user_id=self.student, roles='std')
+        Course.objects.filter(pk=self.course.pk).update(num_students=99)
+
+        call_command('rebuild_course_counters', stdout=io.StringIO())
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.num_students, 1)
+
+
+class MemberProgressTest(TestCase):
+    """
+    Test rollup progres anggota yang dipakai dashboard siswa
+    """
+
+    def setUp(self):
+        self.teacher = User.objects.create(username='teacher1')
+        self.student = User.objects.create(username='student1')
+        self.course = Course.objects.create(name="Pemrograman Django", teacher=self.teacher)
+        self.content1 = CourseContent.objects.create(name="Bab 1", course_id=self.course)
+        self.member = CourseMember.objects.create(course_id=self.course, user_id=self.student, roles='std')
+
+    def test_progress_follows_completion_and_contents(self):
+        progress = MemberProgress.objects.get(member_id=self.member)
+        self.assertEqual((progress.completed_count, progress.total_count), (0, 1))
+
+        Completion.objects.create(member_id=self.member, content_id=self.content1)
+        progress.refresh_from_db()
+        self.assertTrue(progress.fully_completed)
+        self.assertIsNotNone(progress.last_activity)
+
+        content2 = CourseContent.objects.create(name="Bab 2", course_id=self.course)
+        progress.refresh_from_db()
+        self.assertEqual((progress.completed_count, progress.total_count), (1, 2))
+        self.assertFalse(progress.fully_completed)
+
+        content2.delete()
+        progress.refresh_from_db()
+        self.assertTrue(progress.fully_completed)
+
+    def test_rebuild_progress(self):
+        Completion.objects.create(member_id=self.member, content_id=self.content1)
+        MemberProgress.objects.all().delete()
+
+        call_command('rebuild_member_progress', stdout=io.StringIO())
+        progress = MemberProgress.objects.get(member_id=self.member)
+        self.assertEqual((progress.completed_count, progress.total_count), (1, 1))
+        self.assertTrue(progress.fully_completed)
+
+    def test_dashboard_query_count(self):
+        for i in range(5):
+            course = Course.objects.create(name=f"Kursus {i}", teacher=self.teacher)
+            CourseContent.objects.create(name="Bab", course_id=course)
+            CourseMember.objects.create(course_id=course, user_id=self.student, roles='std')
+
+        self.client.force_login(self.student)
+        # session + user + satu query progres, tidak bergantung jumlah kursus
+        with self.assertNumQueries(3):
+            response = self.client.get('/dashboard/')
+        self.assertEqual(len(response.context['courses']), 6)
+
+
+class SearchTest(TestCase):
+    """
+    Test pencarian course & user lewat jalur database yang sedang dipakai
+    (full-text/trigram di Postgres); fallback icontains dipaksa di test terpisah
+    """
+
+    def setUp(self):
+        self.teacher = User.objects.create(username='teacher1', email='guru@kampus.ac.id')
+        User.objects.create(username='budi', first_name='Budi', email='budi@kampus.ac.id')
+        Course.objects.create(name="Pemrograman Django", description="Web dengan Python", teacher=self.teacher)
+        Course.objects.create(name="Basis Data", description="SQL dasar", teacher=self.teacher)
+
+    def test_search_courses(self):
+        results = search_courses(Course.objects.all(), "Python")
+        self.assertEqual([c.name for c in results], ["Pemrograman Django"])
+
+    def test_search_users(self):
+        results = search_users(User.objects.order_by('date_joined'), "budi")
+        self.assertEqual([u.username for u in results], ["budi"])
+        self.assertEqual(search_users(User.objects.all(), "").count(), 2)
+
+    def test_course_list_view_search(self):
+        response = self.client.get('/courses/list/', {'q': 'SQL'})
+        self.assertEqual([c.name for c in response.context['courses']], ["Basis Data"])
+
+    def test_icontains_fallback(self):
+        with mock.patch('core.search.is_postgres', return_value=False):
+            self.assertEqual([c.name for c in search_courses(Course.objects.all(), "dasar")], ["Basis Data"])
+            self.assertEqual([u.username for u in search_users(User.objects.order_by('pk'), "KAMPUS.ac")], ['teacher1', 'budi'])
+            self.assertFalse(search_users(User.objects.all(), "bdi").exists())
+
+
+class KeysetPaginationTest(TestCase):
+    """
+    Test cursor pagination pada endpoint list apiv1
+    """
+
+    def setUp(self):
+        self.teacher = User.objects.create(username='teacher1')
+        self.course = Course.objects.create(name="Pemrograman Django", teacher=self.teacher)
+        for i in range(25):
+            CourseContent.objects.create(name=f"Bab {i}", course_id=self.course)
+
+    def test_pages_follow_cursor(self):
+        seen = []
+        response = self.client.get('/api/v1/contents', {'page_size': 10, 'include_total': 'true'})
+        data = response.json()
+        self.assertEqual(data['count'], 25)
+        seen += [item['id'] for item in data['items']]
+
+        while data['next_cursor']:
+            data = self.client.get('/api/v1/contents', {'page_size': 10, 'cursor': data['next_cursor']}).json()
+            self.assertIsNone(data['count'])
+            seen += [item['id'] for item in data['items']]
+
+        self.assertEqual(seen, list(CourseContent.objects.order_by('created_at', 'id').values_list('id', flat=True)))
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/v1/contents', {'cursor': 'bukan-cursor'})
+        self.assertEqual(response.status_code, 422)
+
+
+class StreamingResponseTest(TestCase):
+    """
+    Test mode streaming NDJSON/JSON pada endpoint list
+    """
+
+    def setUp(self):
+        cache.clear()
+        teacher = User.objects.create(username='teacher1')
+        course = Course.objects.create(name="Pemrograman Django", teacher=teacher)
+        for i in range(30):
+            CourseContent.objects.create(name=f"Bab {i}", course_id=course)
+
+    def test_ndjson(self):
+        response = self.client.get('/api/v1/contents', {'format': 'ndjson'})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 30)
+        self.assertEqual(json.loads(lines[0])['name'], "Bab 0")
+
+    def test_json_array_and_accept_header(self):
+        response = self.client.get('/api/v1/contents', {'format': 'json'})
+        rows = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(len(rows), 30)
+
+        response = self.client.get('/api/v1/contents', HTTP_ACCEPT='application/x-ndjson')
+        self.assertTrue(response.streaming)
+
+    def test_rows_match_paginated_items(self):
+        # created_at sengaja dibuat tidak searah dengan id: urutan harus (created_at, id) seperti cursor
+        first = CourseContent.objects.order_by('id').first()
+        CourseContent.objects.filter(pk=first.pk).update(created_at=first.created_at + timedelta(days=1))
+        paged = self.client.get('/api/v1/contents', {'page_size': 200}).json()['items']
+        streamed = json.loads(b''.join(self.client.get('/api/v1/contents', {'format': 'json'}).streaming_content))
+        self.assertEqual(streamed, paged)
+        self.assertEqual(streamed[-1]['name'], "Bab 0")
+
+        # schema dengan resolver: thumbnails ikut, kolom image/created_at tidak
+        paged = self.client.get('/api/v1/courses-public/').json()['items']
+        response = self.client.get('/api/v1/courses-public/', {'format': 'ndjson'})
+        streamed = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual(streamed, paged)
+        self.assertEqual(set(streamed[0]), {'id', 'name', 'description', 'price', 'teacher', 'thumbnails'})
+
+
+class QueryBudgetTest(QueryBudgetTestMixin, TestCase):
+    """
+    Test budget query: jumlah query tidak boleh tumbuh mengikuti jumlah baris
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.teacher = User.objects.create(username='teacher1')
+        self.course = Course.objects.create(name="Pemrograman Django", teacher=self.teacher)
+        self.content = CourseContent.objects.create(name="Bab 1", course_id=self.course)
+        for i in range(10):
+            student = User.objects.create(username=f'student{i}')
+            member = CourseMember.objects.create(course_id=self.course, user_id=student, roles='std')
+            Comment.objects.create(content_id=self.content, member_id=member, comment=f"Komentar {i}")
+        self.student = student
+
+    def test_sql_shape(self):
+        self.assertEqual(
+            sql_shape("SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'x'"),
+            "SELECT * FROM t WHERE id IN (...) AND name = ?",
+        )
+
+    def test_content_detail_has_constant_queries(self):
+        self.client.force_login(self.student)
+        with self.assertQueryBudget(8, repeat_threshold=3):
+            response = self.client.get(f'/course/{self.course.pk}/content/{self.content.pk}/')
+        self.assertEqual(len(response.context['comments']), 10)
+
+    def test_api_lists_have_constant_queries(self):
+        for url in ['/api/v1/comments', '/api/v1/members', '/api/v1/contents', '/api/v1/courses-public/']:
+            with self.assertQueryBudget(2 + THROTTLE_QUERIES, repeat_threshold=THROTTLE_QUERIES + 1):
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+    @override_settings(QUERY_BUDGET_RAISE=True, QUERY_BUDGETS={'apiv1:list_comments': 0})
+    def test_middleware_raises_over_budget(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get('/api/v1/comments')
+
+
+class CourseAggregateTest(TestCase):
+    """
+    Test hitungan member/konten via subquery (tanpa JOIN members x contents)
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.teacher = User.objects.create(username='teacher1')
+        self.course = Course.objects.create(name="Pemrograman Django", teacher=self.teacher)
+        Course.objects.create(name="Kosong", teacher=self.teacher)
+        for i in range(3):
+            student = User.objects.create(username=f'student{i}')
+            CourseMember.objects.create(course_id=self.course, user_id=student, roles='std' if i else 'ast')
+            CourseContent.objects.create(name=f"Bab {i}", course_id=self.course)
+
+    def test_annotate_course_counts(self):
+        rows = dict(
+            (name, (members, students, contents))
+            for name, members, students, contents in annotate_course_counts(Course.objects.all()).values_list(
+                'name', 'member_total', 'student_total', 'content_total'
+            )
+        )
+        self.assertEqual(rows, {"Pemrograman Django": (3, 2, 3), "Kosong": (0, 0, 0)})
+
+    def test_list_all_course_endpoint(self):
+        response = self.client.get('/api/v1/courses/', HTTP_AUTHORIZATION='Bearer token')
+        items = {item['name']: item for item in response.json()['items']}
+        self.assertEqual(items["Pemrograman Django"]['num_members'], 3)
+        self.assertEqual(items["Pemrograman Django"]['num_contents'], 3)
+        self.assertEqual(items["Kosong"]['num_members'], 0)
+
+
+class CatalogCacheTest(TestCase):
+    """
+    Test cache katalog berversi (invalidasi lewat signal & stale-while-revalidate)
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.teacher = User.objects.create(username='teacher1')
+        Course.objects.create(name="Pemrograman Django", teacher=self.teacher)
+
+    def test_get_or_build_until_version_bump(self):
+        calls = []
+        build = lambda: calls.append(1) or len(calls)
+
+        self.assertEqual(get_or_build('tes', build), 1)
+        self.assertEqual(get_or_build('tes', build), 1)
+        bump_catalog_version()
+        self.assertEqual(get_or_build('tes', build), 2)
+
+    def test_stale_value_served_while_rebuilding(self):
+        get_or_build('tes', lambda: 'lama')
+        bump_catalog_version()
+        # request lain sedang membangun ulang (memegang lock)
+        key = 'catalog:' + hashlib.sha1(b'tes').hexdigest()
+        cache.add(f'{key}:lock', 1)
+        self.assertEqual(get_or_build('tes', lambda: 'baru'), 'lama')
+
+    def test_public_courses_invalidated_by_writes(self):
+        with self.assertNumQueries(1 + THROTTLE_QUERIES):
+            first = self.client.get('/api/v1/courses-public/').json()
+        with self.assertNumQueries(THROTTLE_QUERIES):
+            self.assertEqual(self.client.get('/api/v1/courses-public/').json(), first)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Course.objects.create(name="Basis Data", teacher=self.teacher)
+            # versi katalog baru naik setelah commit
+            with self.assertNumQueries(THROTTLE_QUERIES):
+                self.assertEqual(self.client.get('/api/v1/courses-public/').json(), first)
+        names = [c['name'] for c in self.client.get('/api/v1/courses-public/').json()['items']]
+        self.assertEqual(names, ["Pemrograman Django", "Basis Data"])
+
+
+@contextmanager
+def jwt_keys():
+    """Kunci HS256 sementara untuk ninja_simple_jwt (kunci RSA asli tidak ada di test)."""
+    with override_settings(NINJA_SIMPLE_JWT={
+        'JWT_ALGORITHM': 'HS256', 'JWT_PRIVATE_KEY': 'kunci-test', 'JWT_PUBLIC_KEY': 'kunci-test',
+    }):
+        InMemoryJwtKeyPair.clear()
+        try:
+            yield
+        finally:
+            InMemoryJwtKeyPair.clear()
+
+
+def access_token(user):
+    return get_access_token_for_user(user)[0]
+
+
+class UserStatsTest(TestCase):
+    """
+    Test statistik user: satu query agregat, di-cache, diinvalidasi saat ada penulisan
+    """
+
+    def setUp(self):
+        cache.clear()
+        User.objects.create(username='admin', is_superuser=True, is_staff=True)
+        self.teacher = User.objects.create(username='teacher1', is_staff=True)
+        self.course = Course.objects.create(name="Pemrograman Django", teacher=self.teacher)
+        other = Course.objects.create(name="Basis Data", teacher=self.teacher)
+        for i in range(2):
+            student = User.objects.create(username=f'student{i}')
+            CourseMember.objects.create(course_id=self.course, user_id=student)
+            CourseMember.objects.create(course_id=other, user_id=student)
+
+    def test_stats_single_query_then_cached(self):
+        with self.assertNumQueries(1):
+            stats = get_user_stats()
+        self.assertEqual(stats, {
+            'total_users': 4, 'admin': 1, 'staff': 2, 'siswa': 2, 'teacher': 1,
+            'total_course': 2, 'total_member': 2, 'rata2': 1.0,
+        })
+        with self.assertNumQueries(0):
+            get_user_stats()
+
+    def test_stats_invalidated_by_writes(self):
+        get_user_stats()
+        User.objects.create(username='student9')
+        self.assertEqual(get_user_stats()['siswa'], 3)
+
+        # login (hanya last_login) tidak menghapus cache
+        user = User.objects.get(username='student9')
+        user.save(update_fields=['last_login'])
+        with self.assertNumQueries(0):
+            get_user_stats()
+
+    def test_stats_endpoint(self):
+        self.assertEqual(self.client.get('/api/v1/stats', HTTP_AUTHORIZATION='Bearer token').status_code, 401)
+
+        self.client.force_login(User.objects.get(username='student0'))
+        self.assertEqual(self.client.get('/api/v1/stats').status_code, 403)
+
+        self.client.force_login(self.teacher)
+        response = self.client.get('/api/v1/stats')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['total_users'], 4)
+
+    def test_stats_endpoint_with_jwt(self):
+        self.client.logout()
+        with jwt_keys():
+            response = self.client.get('/api/v1/stats', HTTP_AUTHORIZATION=f'Bearer {access_token(self.teacher)}')
+        self.assertEqual(response.status_code, 200)
+
+
+class UserServiceTest(TestCase):
+    """
+    Test layanan user bersama antara apiv1 dan view HTML (tanpa loopback HTTP)
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create(username='admin', is_staff=True, is_superuser=True)
+        for i in range(6):
+            User.objects.create(username=f'siswa{i}', email=f'siswa{i}@mail.com')
+
+    def test_users_view_paginates_in_process(self):
+        self.client.force_login(self.admin)
+        first = self.client.get('/users/', {'q': 'siswa'})
+        self.assertEqual([u.username for u in first.context['page_obj']], [f'siswa{i}' for i in range(5)])
+
+        response = self.client.get('/users/', {'q': 'siswa', 'cursor': first.context['next_cursor'], 'start': 6})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([u.username for u in response.context['page_obj']], ['siswa5'])
+        self.assertIsNone(response.context['next_cursor'])
+        self.assertContains(response, '<th scope="row">6</th>', html=True)
+
+        # cursor tidak valid jatuh ke halaman pertama
+        response = self.client.get('/users/', {'cursor': 'abc', 'start': 'x'})
+        self.assertEqual(response.context['start'], 1)
+        self.assertEqual(response.context['page_obj'][0].username, 'admin')
+
+    def test_api_and_view_share_pages(self):
+        api = self.client.get('/api/v1/users', {'search': 'siswa', 'page_size': 5, 'include_total': True}).json()
+        self.client.force_login(self.admin)
+        view = self.client.get('/users/', {'q': 'siswa'}).context
+        self.assertEqual([u['username'] for u in api['items']], [u.username for u in view['page_obj']])
+        self.assertEqual(api['next_cursor'], view['next_cursor'])
+        self.assertEqual(api['count'], 6)
+
+    def test_ranked_keys_follow_direction(self):
+        # kunci berawalan '-' (mis. -similarity di Postgres) menurun di ORDER BY maupun di cursor
+        users = User.objects.filter(username__startswith='siswa')
+        items, cursor = keyset_page(users, ('-username', 'id'), page_size=4)
+        self.assertEqual([u.username for u in items], ['siswa5', 'siswa4', 'siswa3', 'siswa2'])
+        items, cursor = keyset_page(users, ('-username', 'id'), cursor, page_size=4)
+        self.assertEqual([u.username for u in items], ['siswa1', 'siswa0'])
+        self.assertIsNone(cursor)
+        self.assertEqual(user_ordering(), USER_ORDERING)
+
+
+class TokenBucketThrottleTest(TestCase):
+    """
+    Test token bucket throttle (backend database & cache)
+    """
+
+    def assertBucket(self, backend):
+        # kapasitas 3, terisi 1 token per detik
+        results = [backend.consume('tes', 3, 1.0, 100.0)[0] for _ in range(4)]
+        self.assertEqual(results, [True, True, True, False])
+        self.assertEqual(backend.consume('tes', 3, 1.0, 101.0), (True, 0.0))
+        self.assertFalse(backend.consume('tes', 3, 1.0, 101.5)[0])
+        # key lain punya bucket sendiri
+        self.assertTrue(backend.consume('lain', 3, 1.0, 101.5)[0])
+
+    def test_database_backend(self):
+        self.assertBucket(DatabaseBucketBackend())
+        bucket = ThrottleBucket.objects.get(key='tes')
+        self.assertFalse(bucket.allowed)
+        self.assertEqual(bucket.tokens, 0.5)
+
+    def test_cache_backend(self):
+        cache.clear()
+        self.assertBucket(CacheBucketBackend())
+
+    def test_api_throttled_across_requests(self):
+        statuses = [self.client.get('/api/v1/hello').status_code for _ in range(11)]
+        self.assertEqual(statuses, [200] * 10 + [429])
+        self.assertTrue(ThrottleBucket.objects.filter(key__startswith='throttle_anon_').exists())
+
+    def test_wait_not_overwritten_by_concurrent_request(self):
+        throttle = AnonRateThrottle('1/m')
+        throttle.backend = CacheBucketBackend()
+        cache.clear()
+        factory = RequestFactory()
+        rejected = factory.get('/', REMOTE_ADDR='10.0.0.1')
+        self.assertTrue(throttle.allow_request(rejected))
+        self.assertFalse(throttle.allow_request(rejected))
+
+        # request lain (IP lain) lewat instance yang sama di thread lain
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            self.assertTrue(pool.submit(throttle.allow_request, factory.get('/', REMOTE_ADDR='10.0.0.2')).result())
+        self.assertAlmostEqual(throttle.wait(), 60, delta=1)
+
+
+class CertificateTest(TestCase):
+    """
+    Test render sertifikat di background dengan cache disk content-addressed
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.user = User.objects.create(username='siswa', first_name='Budi')
+        self.course = Course.objects.create(name="Pemrograman Django", teacher=self.user)
+        self.url = f'/course/{self.course.pk}/certificate/'
+        self.client.force_login(self.user)
+
+    def test_inline_render_cached_on_disk(self):
+        with override_settings(CERTIFICATE_CACHE_DIR=self.tmp.name, CERTIFICATE_WORKERS=0), \
+                mock.patch('core.certificates.render_pdf', wraps=certificates.render_pdf) as render:
+            first = self.client.get(self.url)
+            second = self.client.get(self.url)
+            self.assertEqual(render.call_count, 1)
+
+            # nama yang tercetak berubah -> sertifikat baru
+            self.user.first_name = 'Budi Santoso'
+            self.user.save()
+            self.client.get(self.url)
+            self.assertEqual(render.call_count, 2)
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first['Content-Type'], 'application/pdf')
+        self.assertIn('Sertifikat_Budi.pdf', first['Content-Disposition'])
+        self.assertEqual(b''.join(first.streaming_content), b''.join(second.streaming_content))
+
+    def test_pending_returns_202_with_poll_url(self):
+        executor = mock.Mock()
+        executor.submit.return_value = Future()
+        with override_settings(CERTIFICATE_CACHE_DIR=self.tmp.name, CERTIFICATE_WORKERS=2), \
+                mock.patch('core.certificates._get_executor', return_value=executor):
+            response = self.client.get(self.url, HTTP_ACCEPT='application/json')
+            # request kedua (bisa dari worker lain) tidak menjadwalkan render ulang
+            self.client.get(self.url)
+            status = self.client.get(response['Location']).json()
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['poll_url'], f'/course/{self.course.pk}/certificate/status/')
+        self.assertEqual(executor.submit.call_count, 1)
+        self.assertEqual(status['status'], 'pending')
+
+    def _executor(self):
+        self.futures = []
+
+        def submit(*args):
+            self.futures.append(Future())
+            return self.futures[-1]
+
+        return mock.Mock(submit=mock.Mock(side_effect=submit))
+
+    def test_failed_render_reported_and_retried(self):
+        executor = self._executor()
+        status_url = f'/course/{self.course.pk}/certificate/status/'
+        with override_settings(CERTIFICATE_CACHE_DIR=self.tmp.name, CERTIFICATE_WORKERS=2), \
+                mock.patch('core.certificates._get_executor', return_value=executor):
+            self.client.get(self.url)
+            with self.assertLogs('core.certificates', 'ERROR'):
+                self.futures[0].set_exception(OSError("render gagal"))
+            self.assertEqual(self.client.get(status_url).json()['status'], 'failed')
+            self.assertEqual(len(self.futures), 1)
+
+            # membuka halaman sertifikat lagi menjadwalkan ulang
+            self.assertEqual(self.client.get(self.url).status_code, 202)
+            self.assertEqual(self.client.get(status_url).json()['status'], 'pending')
+            self.assertEqual(len(self.futures), 2)
+
+    def test_lost_render_requeued_by_poll(self):
+        executor = self._executor()
+        with override_settings(CERTIFICATE_CACHE_DIR=self.tmp.name, CERTIFICATE_WORKERS=2,
+                               CERTIFICATE_RENDER_TIMEOUT=0), \
+                mock.patch('core.certificates._get_executor', return_value=executor):
+            self.client.get(self.url)
+            # worker yang merender mati: lock tertinggal dan callback tidak pernah jalan
+            status = self.client.get(f'/course/{self.course.pk}/certificate/status/').json()
+        self.assertEqual(status['status'], 'pending')
+        self.assertEqual(len(self.futures), 2)
+
+
+def _thread_pool(max_workers, mp_context, initializer, initargs):
+    return ThreadPoolExecutor(max_workers, initializer=initializer, initargs=initargs)
+
+
+class BatchCertificateTest(TestCase):
+    """
+    Test ZIP sertifikat untuk semua siswa yang lulus satu course
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.teacher = User.objects.create(username='guru', is_staff=True)
+        self.course = Course.objects.create(name="Pemrograman Django", teacher=self.teacher)
+        contents = [CourseContent.objects.create(name=f"Bab {i}", course_id=self.course) for i in range(2)]
+        for i in range(3):
+            member = CourseMember.objects.create(
+                course_id=self.course, user_id=User.objects.create(username=f'siswa{i}')
+            )
+            # siswa2 baru menyelesaikan satu konten
+            for content in contents[:1 if i == 2 else 2]:
+                Completion.objects.create(member_id=member, content_id=content)
+
+    def test_eligible_members_single_query(self):
+        with self.assertNumQueries(1):
+            usernames = [m.user_id.username for m in certificates.eligible_members(self.course)]
+        self.assertEqual(usernames, ['siswa0', 'siswa1'])
+
+    def _thread_renders(self):
+        # initializer pool thread mengisi state global pdfworker di proses test
+        self.addCleanup(setattr, pdfworker, '_font_config', None)
+        return mock.patch('core.certificates.ProcessPoolExecutor', _thread_pool)
+
+    @override_settings(CERTIFICATE_ZIP_RUNNER='sync')
+    def test_zip_for_teacher(self):
+        self.client.force_login(self.teacher)
+        with override_settings(CERTIFICATE_CACHE_DIR=self.tmp.name), self._thread_renders():
+            response = self.client.get(f'/course/{self.course.pk}/certificates.zip')
+            archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        self.assertEqual(archive.namelist(), ['Sertifikat_siswa0.pdf', 'Sertifikat_siswa1.pdf'])
+        self.assertTrue(archive.read('Sertifikat_siswa0.pdf').startswith(b'%PDF'))
+
+    @override_settings(CERTIFICATE_ZIP_RUNNER='command')
+    def test_zip_built_outside_request(self):
+        self.client.force_login(self.teacher)
+        url = f'/course/{self.course.pk}/certificates.zip'
+        with override_settings(CERTIFICATE_CACHE_DIR=self.tmp.name), self._thread_renders(), \
+                mock.patch('core.certificates.render_pdf', wraps=certificates.render_pdf) as render:
+            response = self.client.get(url, HTTP_ACCEPT='application/json')
+            self.assertEqual(response.status_code, 202)
+            self.assertEqual(render.call_count, 0)
+            self.assertEqual(self.client.get(response['Location']).json()['status'], 'pending')
+
+            call_command('generate_course_certificates', queued=True, stdout=io.StringIO())
+            self.assertEqual(render.call_count, 2)
+            self.assertEqual(self.client.get(response['Location']).json()['status'], 'ready')
+            response = self.client.get(url)
+            self.assertEqual(response['Content-Type'], 'application/zip')
+            self.assertEqual(len(zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content))).namelist()), 2)
+
+            # siswa2 lulus: daftar berubah -> ZIP baru dijadwalkan, sertifikat lama dipakai ulang
+            member = CourseMember.objects.get(user_id__username='siswa2')
+            Completion.objects.create(member_id=member, content_id=CourseContent.objects.order_by('pk').last())
+            self.assertEqual(self.client.get(url).status_code, 202)
+            call_command('generate_course_certificates', queued=True, stdout=io.StringIO())
+            self.assertEqual(render.call_count, 3)
+            # ZIP lama course ini dihapus
+            self.assertEqual(len(list(certificates._zip_dir().glob('*.zip'))), 1)
+
+    def test_zip_forbidden_for_students(self):
+        self.client.force_login(User.objects.get(username='siswa0'))
+        response = self.client.get(f'/course/{self.course.pk}/certificates.zip')
+        self.assertEqual(response.status_code, 302)
+
+
+class CsvImportTest(TestCase):
+    """
+    Test impor konten CSV streaming dengan bulk_create
+    """
+
+    def setUp(self):
+        self.teacher = User.objects.create(username='guru')
+        self.course = Course.objects.create(name="Pemrograman Django", teacher=self.teacher)
+        student = User.objects.create(username='siswa')
+        CourseMember.objects.create(course_id=self.course, user_id=student)
+
+    def upload(self, text):
+        upload = UploadedFile(io.BytesIO(text.encode('utf-8-sig')), name='konten.csv')
+        # chunk kecil supaya karakter multibyte & baris terpotong di batas chunk
+        upload.DEFAULT_CHUNK_SIZE = 7
+        return upload
+
+    def test_import_in_batches(self):
+        text = 'name,description,video_url\n' + ''.join(
+            f'Bab {i} – ü,"baris satu\nbaris dua",https://v/{i}\n' for i in range(5)
+        )
+        self.assertEqual(import_content_from_csv(self.upload(text), self.course, batch_size=2), (5, ""))
+
+        contents = CourseContent.objects.filter(course_id=self.course).order_by('id')
+        self.assertEqual(contents[4].name, 'Bab 4 – ü')
+        self.assertEqual(contents[0].description, 'baris satu\nbaris dua')
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.num_contents, 5)
+        self.assertEqual(MemberProgress.objects.get(course_id=self.course).total_count, 5)
+
+    def test_all_or_nothing_with_row_errors(self):
+        text = 'name,description,video_url\n' + ''.join(
+            f'Bab {i},d,u\n' if i % 3 else ',d,u\n' for i in range(7)
+        )
+        count, error = import_content_from_csv(self.upload(text), self.course, batch_size=2)
+
+        self.assertEqual(count, 0)
+        self.assertIn("Baris 2:", error)
+        self.assertIn("Baris 8:", error)
+        self.assertFalse(CourseContent.objects.filter(course_id=self.course).exists())
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.num_contents, 0)
+
+    def test_missing_header(self):
+        count, error = import_content_from_csv(self.upload('name,description\nBab 1,d\n'), self.course)
+        self.assertEqual(count, 0)
+        self.assertIn("Header CSV tidak lengkap", error)
+
+    def test_progress_callback_can_cancel(self):
+        text = 'name,description,video_url\n' + ''.join(f'Bab {i},d,u\n' for i in range(6))
+        calls = []
+        with self.assertRaises(ImportCancelled):
+            import_content_from_csv(self.upload(text), self.course, batch_size=2,
+                                    progress=lambda done, failed: calls.append(done) or len(calls) < 2)
+        self.assertEqual(calls, [2, 4])
+        self.assertFalse(CourseContent.objects.filter(course_id=self.course).exists())
+
+
+class ImportJobTest(TestCase):
+    """
+    Test job impor CSV di background beserta endpoint progres & pembatalan
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.teacher = User.objects.create(username='guru', is_staff=True)
+        self.course = Course.objects.create(name="Pemrograman Django", teacher=self.teacher)
+        self.url = f'/course/{self.course.pk}/contents/csv/'
+        self.client.force_login(self.teacher)
+
+    def post_csv(self, text):
+        return self.client.post(self.url, {'csv_file': SimpleUploadedFile('konten.csv', text.encode())})
+
+    def test_sync_job_and_status(self):
+        with override_settings(IMPORT_UPLOAD_DIR=self.tmp.name, IMPORT_JOB_RUNNER='sync'):
+            response = self.post_csv('name,description,video_url\nBab 1,d,u\nBab 2,d,u\n')
+        job = ImportJob.objects.get()
+        self.assertRedirects(response, f'{self.url}{job.pk}/')
+
+        status = self.client.get(f'{self.url}{job.pk}/status/').json()
+        self.assertEqual((status['state'], status['rows_processed'], status['rows_imported']), ('done', 2, 2))
+        self.assertEqual(CourseContent.objects.filter(course_id=self.course).count(), 2)
+        # file upload dihapus setelah diproses
+        self.assertFalse(job.file)
+
+    def test_failed_job_reports_rows(self):
+        with override_settings(IMPORT_UPLOAD_DIR=self.tmp.name, IMPORT_JOB_RUNNER='sync'):
+            self.post_csv('name,description,video_url\n,d,u\nBab 2,d,u\n')
+        job = ImportJob.objects.get()
+        self.assertEqual((job.state, job.rows_failed, job.rows_imported), ('failed', 1, 0))
+        self.assertIn("Baris 2:", job.error)
+
+    def test_cancel_pending_job(self):
+        with override_settings(IMPORT_UPLOAD_DIR=self.tmp.name, IMPORT_JOB_RUNNER='command'):
+            self.post_csv('name,description,video_url\nBab 1,d,u\n')
+            job = ImportJob.objects.get()
+            self.assertEqual(job.state, 'pending')
+
+            status = self.client.post(f'{self.url}{job.pk}/cancel/').json()
+            self.assertEqual(status['state'], 'cancelled')
+            call_command('run_import_jobs', once=True, stdout=io.StringIO())
+        self.assertFalse(CourseContent.objects.filter(course_id=self.course).exists())
+
+    def _stale_running_job(self, **fields):
+        with override_settings(IMPORT_UPLOAD_DIR=self.tmp.name, IMPORT_JOB_RUNNER='command'):
+            self.post_csv('name,description,video_url\nBab 1,d,u\n')
+        job = ImportJob.objects.get()
+        # worker mati di tengah impor: state tetap 'running', heartbeat berhenti
+        long_ago = timezone.now() - timedelta(minutes=10)
+        ImportJob.objects.filter(pk=job.pk).update(state='running', started_at=long_ago, heartbeat_at=long_ago, **fields)
+        return job
+
+    def test_stale_running_job_requeued_by_worker(self):
+        job = self._stale_running_job()
+        # job yang masih berdetak tidak disentuh
+        ImportJob.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now())
+        self.assertEqual(requeue_stale_jobs(), [])
+
+        ImportJob.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(minutes=10))
+        with override_settings(IMPORT_UPLOAD_DIR=self.tmp.name):
+            call_command('run_import_jobs', once=True, stdout=io.StringIO())
+        job.refresh_from_db()
+        self.assertEqual((job.state, job.rows_imported), ('done', 1))
+
+    def test_stale_thread_job_resumed_on_poll(self):
+        job = self._stale_running_job()
+        with override_settings(IMPORT_UPLOAD_DIR=self.tmp.name, IMPORT_JOB_RUNNER='thread'), \
+                mock.patch('core.jobs._start_thread') as start:
+            status = self.client.get(f'{self.url}{job.pk}/status/').json()
+        start.assert_called_once_with(job.pk)
+        self.assertEqual(status['state'], 'pending')
+
+        # yang sudah minta dibatalkan tidak dijalankan ulang
+        ImportJob.objects.all().delete()
+        job = self._stale_running_job(cancel_requested=True)
+        self.assertEqual(requeue_stale_jobs(), [])
+        job.refresh_from_db()
+        self.assertEqual(job.state, 'cancelled')
+
+    def test_other_users_cannot_see_job(self):
+        with override_settings(IMPORT_UPLOAD_DIR=self.tmp.name, IMPORT_JOB_RUNNER='command'):
+            self.post_csv('name,description,video_url\nBab 1,d,u\n')
+        self.client.force_login(User.objects.create(username='siswa'))
+        job = ImportJob.objects.get()
+        self.assertEqual(self.client.get(f'{self.url}{job.pk}/status/').status_code, 404)
+
+
+class ExportTest(TestCase):
+    """
+    Test export streaming CSV/NDJSON (opsional gzip)
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create(username='admin', is_staff=True)
+        self.course = Course.objects.create(name="Pemrograman Django", teacher=self.admin)
+        other = Course.objects.create(name="Basis Data", teacher=self.admin)
+        for i in range(3):
+            CourseContent.objects.create(name=f"Bab {i}, \"awal\"", course_id=self.course)
+        CourseContent.objects.create(name="Lain", course_id=other)
+        self.client.force_login(self.admin)
+
+    def test_csv_export(self):
+        response = self.client.get('/export/contents/')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('attachment; filename="contents_', response['Content-Disposition'])
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(rows[0][:4], ['id', 'course_id', 'parent_id', 'name'])
+        self.assertEqual([row[3] for row in rows[1:]], ['Bab 0, "awal"', 'Bab 1, "awal"', 'Bab 2, "awal"', 'Lain'])
+
+    def test_ndjson_gzip_per_course(self):
+        response = self.client.get('/export/contents/', {'format': 'ndjson', 'gzip': '1', 'course': self.course.pk})
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        lines = gzip.decompress(b''.join(response.streaming_content)).decode().splitlines()
+        self.assertEqual([json.loads(line)['name'] for line in lines], ['Bab 0, "awal"', 'Bab 1, "awal"', 'Bab 2, "awal"'])
+
+    def test_export_requires_staff(self):
+        self.client.force_login(User.objects.create(username='siswa'))
+        self.assertEqual(self.client.get('/export/contents/').status_code, 302)
+        self.client.force_login(self.admin)
+        self.assertEqual(self.client.get('/export/passwords/').status_code, 404)
+
+    def test_export_command(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'courses.csv')
+            call_command('export_data', 'courses', output=path, stderr=io.StringIO())
+            with open(path, newline='') as handle:
+                rows = list(csv.DictReader(handle))
+        self.assertEqual([row['name'] for row in rows], ["Pemrograman Django", "Basis Data"])
+        self.assertEqual(rows[0]['teacher__username'], 'admin')
+
+
+class BulkEnrollmentTest(TestCase):
+    """
+    Test pendaftaran massal dan constraint unik (course, user)
+    """
+
+    def setUp(self):
+        self.teacher = User.objects.create(username='teacher1')
+        self.course = Course.objects.create(name="Pemrograman Python", teacher=self.teacher)
+        CourseContent.objects.create(name="Bab 1", course_id=self.course)
+        self.students = [User.objects.create(username=f'siswa{i}') for i in range(5)]
+        CourseMember.objects.create(course_id=self.course, user_id=self.students[0])
+
+    def test_bulk_enroll_counts(self):
+        ids = [user.pk for user in self.students[:3]] + [999999]
+        with self.captureOnCommitCallbacks(execute=True):
+            result = bulk_enroll(self.course, ids, ['siswa3', 'siswa0', 'tidak-ada'], batch_size=2)
+
+        self.assertEqual(result['requested'], 6)
+        self.assertEqual(result['created'], 3)
+        self.assertEqual(result['already_enrolled'], 1)
+        self.assertEqual(result['not_found'], [999999, 'tidak-ada'])
+
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.num_students, 4)
+        self.assertEqual(MemberProgress.objects.filter(course_id=self.course, total_count=1).count(), 4)
+
+        again = bulk_enroll(self.course, ids)
+        self.assertEqual((again['created'], again['already_enrolled']), (0, 3))
+
+    def test_unique_constraint(self):
+        with self.assertRaises(IntegrityError):
+            CourseMember.objects.create(course_id=self.course, user_id=self.students[0])
+
+    def test_bulk_enroll_api(self):
+        url = f'/api/v1/course/{self.course.pk}/enroll/bulk/'
+        data = {'usernames': ['siswa1', 'siswa2'], 'roles': 'ast'}
+        response = self.client.post(url, data, content_type='application/json', HTTP_AUTHORIZATION='Bearer token')
+        self.assertEqual(response.status_code, 401)
+
+        # siswa tidak boleh mendaftarkan orang lain
+        self.client.force_login(self.students[0])
+        self.assertEqual(self.client.post(url, data, content_type='application/json').status_code, 403)
+
+        self.client.force_login(self.teacher)
+        response = self.client.post(url, data, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['created'], 2)
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.num_assistants, 2)
+
+        response = self.client.post('/api/v1/course/999999/enroll/bulk/', {'user_ids': [1]}, content_type='application/json')
+        self.assertEqual(response.status_code, 404)
+
+    def test_bulk_enroll_api_staff_with_jwt(self):
+        staff = User.objects.create(username='admin', is_staff=True)
+        with jwt_keys():
+            response = self.client.post(
+                f'/api/v1/course/{self.course.pk}/enroll/bulk/', {'usernames': ['siswa1']},
+                content_type='application/json', HTTP_AUTHORIZATION=f'Bearer {access_token(staff)}',
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['created'], 1)
+
+
+class BatchCompletionTest(TestCase):
+    """
+    Test penandaan selesai banyak konten sekaligus
+    """
+
+    def setUp(self):
+        self.user = User.objects.create(username='siswa1')
+        self.course = Course.objects.create(name="Pemrograman Python", teacher=self.user)
+        self.contents = [CourseContent.objects.create(name=f"Bab {i}", course_id=self.course) for i in range(4)]
+        other = Course.objects.create(name="Basis Data", teacher=self.user)
+        self.foreign = CourseContent.objects.create(name="Lain", course_id=other)
+        self.member = CourseMember.objects.create(course_id=self.course, user_id=self.user)
+        Completion.objects.create(member_id=self.member, content_id=self.contents[0])
+
+    def test_complete_contents(self):
+        ids = [self.contents[0].pk, self.contents[1].pk, self.foreign.pk]
+        with self.assertNumQueries(8):
+            result = complete_contents(self.member, ids)
+        self.assertEqual((result['created'], result['already_completed']), (1, 1))
+        self.assertEqual(result['not_found'], [self.foreign.pk])
+        self.assertEqual(result['progress']['completed_count'], 2)
+
+        result = complete_contents(self.member, up_to=self.contents[-1].pk)
+        self.assertEqual((result['created'], result['already_completed']), (2, 2))
+        self.assertTrue(result['progress']['fully_completed'])
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.num_completions, 4)
+        self.assertEqual(Completion.objects.filter(member_id=self.member).count(), 4)
+
+    def test_created_counts_only_inserted_rows(self):
+        # baris contents[1] sudah ditulis request lain setelah status konten dibaca
+        Completion.objects.create(member_id=self.member, content_id=self.contents[1])
+        self.assertEqual(_insert_completions(self.member, [self.contents[1].pk, self.contents[2].pk]), 1)
+        self.assertEqual(Completion.objects.filter(member_id=self.member).count(), 3)
+
+    def test_completion_api(self):
+        url = f'/api/v1/course/{self.course.pk}/complete/'
+        data = {'up_to': self.contents[1].pk}
+        response = self.client.post(url, data, content_type='application/json', HTTP_AUTHORIZATION='Bearer token')
+        self.assertEqual(response.status_code, 401)
+
+        # user lain (anggota pertama di database bukan pemanggil) tidak bisa menandai progres siswa1
+        self.client.force_login(User.objects.create(username='siswa2'))
+        self.assertEqual(self.client.post(url, data, content_type='application/json').status_code, 403)
+
+        self.client.logout()
+        with jwt_keys():
+            token = access_token(self.user)
+            response = self.client.post(url, data, content_type='application/json', HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['progress']['completed_count'], 2)
+
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.post(url, {}, content_type='application/json').status_code, 400)
+
+
+class CommentFeedTest(TestCase):
+    """
+    Test feed komentar keyset di halaman detail konten
+    """
+
+    def setUp(self):
+        self.user = User.objects.create(username='siswa1')
+        self.course = Course.objects.create(name="Pemrograman Python", teacher=self.user)
+        self.content = CourseContent.objects.create(name="Bab 1", course_id=self.course)
+        member = CourseMember.objects.create(course_id=self.course, user_id=self.user)
+        Comment.objects.bulk_create(
+            [Comment(content_id=self.content, member_id=member, comment=f"komentar {i}") for i in range(25)]
+        )
+        self.url = f'/course/{self.course.pk}/content/{self.content.pk}/comments/'
+        self.client.force_login(self.user)
+
+    def test_detail_page_shows_first_page(self):
+        response = self.client.get(f'/course/{self.course.pk}/content/{self.content.pk}/')
+        self.assertEqual(len(response.context['comments']), 20)
+        self.assertEqual(response.context['comments'][0]['comment'], "komentar 24")
+        self.assertContains(response, 'id="load-more-comments"')
+
+    def test_load_more(self):
+        first = self.client.get(f'/course/{self.course.pk}/content/{self.content.pk}/')
+        with self.assertNumQueries(6):
+            data = self.client.get(self.url, {'cursor': first.context['next_cursor']}).json()
+        self.assertEqual([c['comment'] for c in data['comments']], [f"komentar {i}" for i in range(4, -1, -1)])
+        self.assertIsNone(data['next_cursor'])
+        self.assertIn('komentar 0', data['html'])
+
+    def test_load_more_errors(self):
+        self.assertEqual(self.client.get(self.url, {'cursor': 'bukan-cursor'}).status_code, 400)
+        self.client.force_login(User.objects.create(username='orang-lain'))
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+def _async_urlconf():
+    """URLconf proyek dengan view baca async, seperti saat ASYNC_VIEWS aktif."""
+    from django.contrib import admin
+    from django.urls import include, path
+
+    swap = {
+        'course_list': async_views.course_list,
+        'course_detail': async_views.course_detail,
+        'course_content_list': async_views.course_content_list,
+        'course_content_detail': async_views.course_content_detail,
+        'content_comments': async_views.content_comments,
+    }
+    patterns = [
+        path(str(p.pattern), swap[p.name], name=p.name) if getattr(p, 'name', None) in swap else p
+        for p in core_urls.urlpatterns
+    ]
+    module = types.ModuleType('async_urls')
+    module.urlpatterns = [
+        path('admin/', admin.site.urls),
+        path('accounts/', include('django.contrib.auth.urls')),
+        path('', include(patterns)),
+    ]
+    return module
+
+
+@override_settings(ROOT_URLCONF=_async_urlconf())
+class AsyncViewTest(TestCase):
+    """
+    Test view baca async (profil ASGI) lewat AsyncClient
+    """
+
+    def setUp(self):
+        self.user = User.objects.create(username='siswa1')
+        self.course = Course.objects.create(name="Pemrograman Python", teacher=self.user)
+        for i in range(8):
+            CourseContent.objects.create(name=f"Bab {i}", course_id=self.course)
+        member = CourseMember.objects.create(course_id=self.course, user_id=self.user)
+        self.content = CourseContent.objects.first()
+        Comment.objects.bulk_create(
+            [Comment(content_id=self.content, member_id=member, comment=f"komentar {i}") for i in range(22)]
+        )
+
+    async def test_catalog_and_detail(self):
+        response = await self.async_client.get('/courses/list/', {'sort': 'harga_asc'})
+        self.assertEqual([c.name for c in response.context['courses']], ["Pemrograman Python"])
+        self.assertEqual(response.context['sort_message'], 'Harga Termurah')
+
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(f'/course/{self.course.pk}/')
+        self.assertTrue(response.context['is_joined'])
+        self.assertEqual((await self.async_client.get('/course/999999/')).status_code, 404)
+
+    async def test_content_pages(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(f'/course/{self.course.pk}/contents/', {'page': 2})
+        self.assertEqual([c.name for c in response.context['page_obj']], ["Bab 6", "Bab 7"])
+        self.assertEqual(response.context['total'], 1)
+
+        response = await self.async_client.get(f'/course/{self.course.pk}/content/{self.content.pk}/')
+        self.assertEqual(len(response.context['comments']), 20)
+        data = (await self.async_client.get(
+            f'/course/{self.course.pk}/content/{self.content.pk}/comments/', {'cursor': response.context['next_cursor']}
+        )).json()
+        self.assertEqual([c['comment'] for c in data['comments']], ["komentar 1", "komentar 0"])
+
+    async def test_non_member_redirected(self):
+        await self.async_client.aforce_login(await User.objects.acreate(username='orang-lain'))
+        response = await self.async_client.get(f'/course/{self.course.pk}/contents/')
+        self.assertRedirects(response, f'/course/{self.course.pk}/', fetch_redirect_response=False)
+
+    @override_settings(DEBUG=True)
+    async def test_query_budget_counts_async_queries(self):
+        response = await self.async_client.get(f'/course/{self.course.pk}/')
+        # validator conditional GET (di thread) + course
+        self.assertEqual(response['X-Query-Count'], '2')
+
+    def test_async_api_endpoints(self):
+        data = self.client.get(f'/api/v1/courses/{self.course.pk}/').json()
+        self.assertEqual((data['num_members'], data['num_contents']), (1, 8))
+        self.assertEqual(self.client.get('/api/v1/courses/999999/').status_code, 404)
+
+        data = self.client.get(f'/api/v1/contents/{self.content.pk}/comments/').json()
+        self.assertEqual(len(data['items']), 20)
+        data = self.client.get(f'/api/v1/contents/{self.content.pk}/comments/', {'cursor': data['next_cursor']}).json()
+        self.assertEqual([c['username'] for c in data['items']], ['siswa1', 'siswa1'])
+        self.assertIsNone(data['next_cursor'])
+
+
+class StartupTest(TestCase):
+    """
+    Test boot worker: dependensi berat tetap lazy, warmup menyiapkan template
+    """
+
+    def test_boot_does_not_import_heavy_modules(self):
+        script = (
+            "from django.core.wsgi import get_wsgi_application; get_wsgi_application();"
+            "from django.urls import get_resolver; get_resolver().url_patterns;"
+            "from core.startup import loaded_heavy_modules; print(','.join(loaded_heavy_modules()))"
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', script], cwd=settings.BASE_DIR, capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result.stdout.strip(), '')
+
+    def test_warmup_compiles_templates(self):
+        # warmup menutup koneksi untuk master gunicorn; jangan di dalam transaksi test
+        with mock.patch.object(connections, 'close_all') as close_all:
+            self.assertGreater(warmup(), 10)
+        close_all.assert_called_once()
+
+
+@override_settings(THUMBNAIL_SIZES={'card': (600, 400), 'detail': (1200, 800)}, THUMBNAIL_FORMAT='WEBP')
+class ThumbnailTest(TestCase):
+    """
+    Test rendition gambar course: dibuat saat upload, nama deterministik, fallback
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        media = override_settings(MEDIA_ROOT=self.tmp.name)
+        media.enable()
+        self.addCleanup(media.disable)
+        # keberadaan rendition diingat di cache; nama file sama di setiap test
+        cache.clear()
+        self.user = User.objects.create(username='guru')
+
+    def _rendition(self, course, size):
+        return os.path.join(self.tmp.name, thumbnail_name(course.image, size))
+
+    def _upload(self, size=(2400, 1600)):
+        from PIL import Image
+
+        buffer = io.BytesIO()
+        Image.new('RGB', size, (13, 110, 253)).save(buffer, 'JPEG')
+        image = SimpleUploadedFile('sampul.jpg', buffer.getvalue(), content_type='image/jpeg')
+        with self.captureOnCommitCallbacks(execute=True):
+            return Course.objects.create(name="Fotografi", teacher=self.user, image=image)
+
+    def test_renditions_created_on_upload(self):
+        from PIL import Image
+
+        course = self._upload()
+        self.assertEqual(thumbnail_name(course.image, 'card'), 'course_images/sampul.card-600x400.webp')
+        for size, box in (('card', (600, 400)), ('detail', (1200, 800))):
+            with Image.open(self._rendition(course, size)) as rendition:
+                self.assertEqual((rendition.format, rendition.size), ('WEBP', box))
+
+        # sudah ada -> tidak ditulis ulang
+        self.assertEqual(generate_thumbnails(course.image), [])
+        self.assertEqual(thumbnail_url(course.image, 'card'), '/media/course_images/sampul.card-600x400.webp')
+
+    def test_small_image_is_not_upscaled(self):
+        course = self._upload(size=(300, 100))
+        from PIL import Image
+
+        with Image.open(os.path.join(self.tmp.name, thumbnail_name(course.image, 'detail'))) as rendition:
+            self.assertEqual(rendition.size, (300, 100))
+
+    def test_missing_rendition_falls_back_without_inline_render(self):
+        course = self._upload()
+        os.remove(self._rendition(course, 'card'))
+        cache.clear()
+
+        # default: tidak pernah me-resize di request, URL file asli dipakai
+        self.assertEqual(thumbnail_url(course.image, 'card'), course.image.url)
+        self.assertFalse(os.path.exists(self._rendition(course, 'card')))
+
+        with override_settings(THUMBNAIL_GENERATE_ON_REQUEST=True):
+            self.assertEqual(thumbnail_url(course.image, 'card'), course.image.url)
+            thumbnails._executor.submit(lambda: None).result()  # satu worker: tunggu antrean selesai
+        self.assertTrue(os.path.exists(self._rendition(course, 'card')))
+        self.assertEqual(thumbnail_url(course.image, 'card'), '/media/course_images/sampul.card-600x400.webp')
+
+        broken = Course.objects.create(
+            name="Rusak", teacher=self.user, image=SimpleUploadedFile('rusak.jpg', b'bukan gambar')
+        )
+        with self.assertLogs('core.thumbnails', 'WARNING'):
+            self.assertEqual(generate_thumbnails(broken.image), [])
+        self.assertEqual(thumbnail_url(broken.image, 'card'), broken.image.url)
+        self.assertEqual(thumbnail_url(Course(name="Kosong").image, 'card'), '')
+
+    def test_existence_is_cached(self):
+        course = self._upload()
+        # rendition dari signal upload sudah diingat: tidak ada storage.exists() per ukuran
+        with mock.patch('django.core.files.storage.FileSystemStorage.exists') as exists:
+            self.assertEqual(
+                set(thumbnails.thumbnail_urls(course.image).values()),
+                {'/media/course_images/sampul.card-600x400.webp', '/media/course_images/sampul.detail-1200x800.webp'},
+            )
+        exists.assert_not_called()
+
+    def test_concurrent_writers_leave_no_orphans(self):
+        course = self._upload()
+        os.remove(self._rendition(course, 'card'))
+        render = thumbnails._render
+
+        def racing_render(*args):
+            # penulis lain menyimpan rendition di antara exists() dan save()
+            with open(self._rendition(course, 'card'), 'wb') as other:
+                other.write(render(*args))
+            return render(*args)
+
+        with mock.patch.object(thumbnails, '_render', racing_render):
+            self.assertEqual(generate_thumbnails(course.image), [])
+        self.assertEqual(generate_thumbnails(course.image, force=True), [
+            'course_images/sampul.card-600x400.webp', 'course_images/sampul.detail-1200x800.webp',
+        ])
+        self.assertEqual(sorted(os.listdir(os.path.join(self.tmp.name, 'course_images'))), [
+            'sampul.card-600x400.webp', 'sampul.detail-1200x800.webp', 'sampul.jpg',
+        ])
+
+    def test_catalog_and_api_use_thumbnails(self):
+        course = self._upload()
+        response = self.client.get('/courses/list/')
+        self.assertContains(response, 'src="/media/course_images/sampul.card-600x400.webp"')
+
+        items = self.client.get('/api/v1/courses-public/').json()['items']
+        self.assertEqual(items[0]['thumbnails'], {
+            'card': '/media/course_images/sampul.card-600x400.webp',
+            'detail': '/media/course_images/sampul.detail-1200x800.webp',
+        })
+        data = self.client.get(f'/api/v1/courses/{course.pk}/').json()
+        self.assertEqual(set(data['thumbnails']), {'card', 'detail'})
+
+
+class DownloadTest(TestCase):
+    """
+    Test download lampiran konten: akses anggota, Range/206, ETag, offload proxy
+    """
+
+    DATA = bytes(range(256)) * 40
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        media = override_settings(MEDIA_ROOT=self.tmp.name, DOWNLOAD_OFFLOAD=None)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.user = User.objects.create(username='siswa1')
+        self.course = Course.objects.create(name="Pemrograman Python", teacher=self.user)
+        CourseMember.objects.create(course_id=self.course, user_id=self.user)
+        self.content = CourseContent.objects.create(
+            name="Bab 1", course_id=self.course, file_attachment=SimpleUploadedFile('materi.pdf', self.DATA)
+        )
+        self.url = f'/course/{self.course.pk}/content/{self.content.pk}/download/'
+        self.client.force_login(self.user)
+
+    def test_full_download(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.DATA)
+        self.assertEqual(response['Content-Length'], str(len(self.DATA)))
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="materi.pdf"')
+
+    def test_range_requests(self):
+        size = len(self.DATA)
+        for header, expected, content_range in (
+            ('bytes=100-199', self.DATA[100:200], f'bytes 100-199/{size}'),
+            ('bytes=10000-', self.DATA[10000:], f'bytes 10000-{size - 1}/{size}'),
+            ('bytes=-10', self.DATA[-10:], f'bytes {size - 10}-{size - 1}/{size}'),
+            ('bytes=10200-99999', self.DATA[10200:], f'bytes 10200-{size - 1}/{size}'),
+        ):
+            response = self.client.get(self.url, HTTP_RANGE=header)
+            self.assertEqual(response.status_code, 206, header)
+            self.assertEqual(b''.join(response.streaming_content), expected)
+            self.assertEqual(response['Content-Range'], content_range)
+            self.assertEqual(response['Content-Length'], str(len(expected)))
+
+        response = self.client.get(self.url, HTTP_RANGE=f'bytes={size}-')
+        self.assertEqual((response.status_code, response['Content-Range']), (416, f'bytes */{size}'))
+        # multi-range tidak didukung -> file utuh
+        self.assertEqual(self.client.get(self.url, HTTP_RANGE='bytes=0-1,5-6').status_code, 200)
+
+    def test_conditional_requests(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+        self.assertEqual(self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=etag).status_code, 206)
+        self.assertEqual(self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"basi"').status_code, 200)
+
+    def test_access_control(self):
+        outsider = User.objects.create(username='luar')
+        self.client.force_login(outsider)
+        self.assertRedirects(self.client.get(self.url), f'/course/{self.course.pk}/', fetch_redirect_response=False)
+
+        outsider.is_staff = True
+        outsider.save()
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        no_file = CourseContent.objects.create(name="Bab 2", course_id=self.course)
+        self.assertEqual(self.client.get(f'/course/{self.course.pk}/content/{no_file.pk}/download/').status_code, 404)
+        self.assertEqual(self.client.get(f'/course/999/content/{self.content.pk}/download/').status_code, 404)
+
+    def test_proxy_offload(self):
+        with override_settings(DOWNLOAD_OFFLOAD='x-accel', DOWNLOAD_ACCEL_PREFIX='/protected-media/'):
+            response = self.client.get(self.url, HTTP_RANGE='bytes=0-9')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{self.content.file_attachment.name}')
+        self.assertEqual(response.content, b'')
+
+        with override_settings(DOWNLOAD_OFFLOAD='x-sendfile'):
+            response = self.client.get(self.url)
+        self.assertEqual(response['X-Sendfile'], self.content.file_attachment.path)
+
+    async def test_asgi_streams_without_buffering(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(self.url, headers={'Range': 'bytes=256-511'})
+        self.assertTrue(response.is_async)
+        self.assertEqual(b''.join([chunk async for chunk in response.streaming_content]), self.DATA[256:512])
+
+
+class ConditionalGetTest(TestCase):
+    """
+    Test ETag/304 pada halaman course & konten serta endpoint list API
+    """
+
+    def setUp(self):
+        self.user = User.objects.create(username='siswa1')
+        self.course = Course.objects.create(name="Pemrograman Python", teacher=self.user)
+        self.member = CourseMember.objects.create(course_id=self.course, user_id=self.user)
+        self.content = CourseContent.objects.create(name="Bab 1", course_id=self.course)
+        self.client.force_login(self.user)
+
+    def _revalidate(self, url, response):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_course_detail(self):
+        url = f'/course/{self.course.pk}/'
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('no-cache', first['Cache-Control'])
+        self.assertIn('Last-Modified', first)
+
+        with self.assertNumQueries(3):  # session, user, validator
+            response = self._revalidate(url, first)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], first['ETag'])
+        self.assertFalse(response.templates)
+
+        # counter berubah lewat F() (updated_at tetap) -> ETag baru
+        CourseMember.objects.create(course_id=self.course, user_id=User.objects.create(username='siswa2'))
+        self.assertEqual(self._revalidate(url, first).status_code, 200)
+
+        # user lain tidak boleh memakai ETag user ini
+        second = self.client.get(url)
+        self.client.force_login(User.objects.get(username='siswa2'))
+        self.assertEqual(self._revalidate(url, second).status_code, 200)
+
+    def test_content_pages(self):
+        list_url = f'/course/{self.course.pk}/contents/'
+        detail_url = f'/course/{self.course.pk}/content/{self.content.pk}/'
+        first_list, first_detail = self.client.get(list_url), self.client.get(detail_url)
+        self.assertEqual(self._revalidate(list_url, first_list).status_code, 304)
+        self.assertEqual(self._revalidate(detail_url, first_detail).status_code, 304)
+        self.assertNotEqual(self.client.get(list_url, {'page': 2})['ETag'], first_list['ETag'])
+
+        Comment.objects.create(content_id=self.content, member_id=self.member, comment="Halo")
+        self.assertEqual(self._revalidate(detail_url, first_detail).status_code, 200)
+        first_detail = self.client.get(detail_url)
+        Completion.objects.create(member_id=self.member, content_id=self.content)
+        self.assertEqual(self._revalidate(detail_url, first_detail).status_code, 200)
+
+        self.content.name = "Bab 1 (revisi)"
+        self.content.save()
+        self.assertEqual(self._revalidate(list_url, first_list).status_code, 200)
+
+    def test_pending_message_is_rendered(self):
+        url = f'/course/{self.course.pk}/'
+        first = self.client.get(url)
+        self.client.post(f'/course/{self.course.pk}/exit/')
+        self.assertEqual(self._revalidate(url, first).status_code, 200)
+
+    def _shared_cache(self):
+        # versi katalog/tabel hanya dipakai sebagai ETag dengan cache bersama
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        return override_settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': tmp.name},
+        })
+
+    def test_api_lists(self):
+        with self._shared_cache():
+            for url in ('/api/v1/contents', '/api/v1/comments', '/api/v1/courses-public/'):
+                first = self.client.get(url)
+                self.assertEqual(self._revalidate(url, first).status_code, 304, url)
+                self.assertNotIn('private', first['Cache-Control'])
+
+            # katalog dari cache: hanya bucket throttle; 304 dijawab sebelum throttle
+            with self.assertNumQueries(THROTTLE_QUERIES):
+                first = self.client.get('/api/v1/courses-public/')
+            with self.assertNumQueries(0):
+                self.assertEqual(self._revalidate('/api/v1/courses-public/', first).status_code, 304)
+
+            # versi tabel: tanpa COUNT/MAX per poll, naik setelah commit
+            first = self.client.get('/api/v1/contents')
+            with self.assertNumQueries(0):
+                self.assertEqual(self._revalidate('/api/v1/contents', first).status_code, 304)
+            with self.captureOnCommitCallbacks(execute=True):
+                self.content.delete()
+            self.assertEqual(self._revalidate('/api/v1/contents', first).status_code, 200)
+
+            first = self.client.get('/api/v1/comments')
+            with self.captureOnCommitCallbacks(execute=True):
+                Comment.objects.create(content_id=CourseContent.objects.create(name="Bab 2", course_id=self.course))
+            self.assertEqual(self._revalidate('/api/v1/comments', first).status_code, 200)
+
+            # impor CSV memakai bulk_create (tanpa signal) tapi tetap menaikkan versi
+            first = self.client.get('/api/v1/contents')
+            upload = UploadedFile(io.BytesIO(b'name,description,video_url\nBab 3,d,\n'), name='konten.csv')
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertEqual(import_content_from_csv(upload, self.course), (1, ""))
+            self.assertEqual(self._revalidate('/api/v1/contents', first).status_code, 200)
+
+    def test_api_lists_without_shared_cache(self):
+        # LocMem: versi per proses, worker lain bisa punya nomor sama untuk isi berbeda
+        for url in ('/api/v1/contents', '/api/v1/comments', '/api/v1/courses-public/'):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertNotIn('ETag', response)
+
+    @override_settings(ROOT_URLCONF=_async_urlconf())
+    async def test_async_course_detail(self):
+        await self.async_client.aforce_login(self.user)
+        url = f'/course/{self.course.pk}/'
+        first = await self.async_client.get(url)
+        response = await self.async_client.get(url, headers={'If-None-Match': first['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+
+class RendererTest(TestCase):
+    """
+    Test renderer orjson dan jalur trusted_values (tanpa validasi per objek)
+    """
+
+    def setUp(self):
+        self.user = User.objects.create(username='siswa1', first_name='Siti', email='siti@example.com')
+        course = Course.objects.create(name="Pemrograman Python", teacher=self.user)
+        member = CourseMember.objects.create(course_id=course, user_id=self.user)
+        content = CourseContent.objects.create(name="Bab 1", course_id=course, video_url='https://youtu.be/x')
+        comment = Comment.objects.create(content_id=content, member_id=member, comment="Mantap 🙂")
+        self.expected = {
+            '/api/v1/contents': [{
+                'id': content.pk, 'course_id': course.pk, 'name': "Bab 1", 'description': '-',
+                'video_url': 'https://youtu.be/x', 'file_attachment': '',
+            }],
+            '/api/v1/comments': [{'id': comment.pk, 'content_id': content.pk, 'member_id': member.pk, 'comment': "Mantap 🙂"}],
+            '/api/v1/members': [{'id': member.pk, 'user_id': self.user.pk, 'course_id': course.pk, 'roles': 'std'}],
+            '/api/v1/users': [{
+                'id': self.user.pk, 'username': 'siswa1', 'first_name': 'Siti', 'last_name': '',
+                'email': 'siti@example.com',
+            }],
+            '/api/v1/mycourses/': [{
+                'id': member.pk, 'user_id': self.user.pk, 'course_id': course.pk,
+                'course_name': "Pemrograman Python", 'roles': 'std',
+            }],
+        }
+
+    def test_trusted_values_match_schema_output(self):
+        for url, items in self.expected.items():
+            response = self.client.get(url, HTTP_AUTHORIZATION='Bearer token')
+            self.assertEqual(response['Content-Type'], 'application/json; charset=utf-8')
+            self.assertEqual(response.json(), {'items': items, 'next_cursor': None, 'count': None}, url)
+
+        # streaming tetap lewat jalur streamable
+        response = self.client.get('/api/v1/members', {'format': 'ndjson'})
+        self.assertTrue(response.streaming)
+
+    def test_trusted_fields_rejects_resolvers(self):
+        from .apiv1 import CourseSchema, DetailCourseOut
+
+        with self.assertRaises(ImproperlyConfigured):
+            trusted_fields(CourseSchema)
+        with self.assertRaises(ImproperlyConfigured):
+            trusted_fields(DetailCourseOut)
+
+    def test_orjson_renderer_matches_default(self):
+        from decimal import Decimal
+        from uuid import uuid4
+        from django.utils import timezone
+        from ninja.renderers import JSONRenderer
+
+        data = {'at': timezone.now(), 'day': timezone.now().date(), 'price': Decimal('1.50'),
+                'uuid': uuid4(), 'text': "Komentar 🙂", 1: [None, True, 2.5]}
+        fast = ORJSONRenderer().render(None, data, response_status=200)
+        self.assertEqual(json.loads(fast), json.loads(JSONRenderer().render(None, data, response_status=200)))
+
+    def test_fast_renderer_opt_in(self):
+        api_renderer.cache_clear()
+        self.addCleanup(api_renderer.cache_clear)
+        self.assertNotIsInstance(api_renderer(), ORJSONRenderer)
+        api_renderer.cache_clear()
+        with override_settings(API_FAST_JSON=True):
+            self.assertIsInstance(api_renderer(), ORJSONRenderer)
+            response = self.client.get('/api/v1/members')
+        self.assertIn(b'"items":[{', response.content)
+
+
+class MergeDuplicateMembersMigrationTest(TransactionTestCase):
+    """
+    Test migrasi 0011: anggota ganda digabung dan progresnya dihitung ulang
+    """
+    before = [('core', '0010_import_job')]
+    after = [('core', '0011_unique_course_member')]
+
+    def _migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self._migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_merged_completions_cover_course(self):
+        apps = self._migrate(self.before)
+        User = apps.get_model('auth', 'User')
+        Course = apps.get_model('core', 'Course')
+        CourseMember = apps.get_model('core', 'CourseMember')
+        CourseContent = apps.get_model('core', 'CourseContent')
+        Completion = apps.get_model('core', 'Completion')
+        MemberProgress = apps.get_model('core', 'MemberProgress')
+
+        user = User.objects.create(username='siswa1')
+        course = Course.objects.create(name="Pemrograman Python", teacher=user)
+        contents = [CourseContent.objects.create(name=f"Bab {i}", course_id=course) for i in range(2)]
+        members = [CourseMember.objects.create(course_id=course, user_id=user) for _ in range(2)]
+        for member, content in zip(members, contents):
+            Completion.objects.create(member_id=member, content_id=content)
+            MemberProgress.objects.create(
+                member_id=member, user_id=user, course_id=course, completed_count=1, total_count=2,
+            )
+
+        apps = self._migrate(self.after)
+        progress = apps.get_model('core', 'MemberProgress').objects.get()
+        self.assertEqual(progress.member_id_id, members[0].pk)
+        self.assertEqual((progress.completed_count, progress.total_count, progress.fully_completed), (2, 2, True))
@@ -1,6 +1,200 @@
 # /code/core/throttling.py
-from ninja.throttling import AnonRateThrottle, AuthRateThrottle
+import threading
+import time
+from functools import wraps
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.db import connections, transaction
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from ninja import throttling
+from ninja.errors import Throttled
+
+
+# --- BACKEND TOKEN BUCKET ---
+
+class CacheBucketBackend:
+    """
+    Token bucket di Django cache: satu entri (tokens, updated_at) per key, O(1).
+    Baca-ubah-tulis tidak atomik, jadi hanya akurat untuk satu proses atau
+    cache bersama dengan trafik rendah. Cocok untuk development.
+    """
+
+    def __init__(self, alias='default'):
+        self.cache = caches[alias]
+
+    def consume(self, key, capacity, refill_rate, now):
+        tokens, updated_at = self.cache.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        # entri kedaluwarsa setelah bucket pasti penuh kembali
+        self.cache.set(key, (tokens, now), int((capacity - tokens) / refill_rate) + 1)
+        return allowed, tokens
+
+
+class DatabaseBucketBackend:
+    """
+    Token bucket di tabel core_throttlebucket, dibagi semua worker dan host.
+    Isi ulang, pengecekan dan pengurangan token terjadi dalam satu statement
+    INSERT ... ON CONFLICT DO UPDATE ... RETURNING (PostgreSQL, SQLite >= 3.35),
+    sehingga request paralel tidak bisa melewati limit. Statement ini ikut
+    terhitung di budget query view (core.querybudget): satu query per request
+    untuk endpoint yang di-throttle.
+    """
+
+    UPSERT_VENDORS = ('postgresql', 'sqlite')
+
+    def __init__(self, using='default'):
+        self.using = using
+
+    def consume(self, key, capacity, refill_rate, now):
+        connection = connections[self.using]
+        if connection.vendor not in self.UPSERT_VENDORS:
+            return self._consume_locked(key, capacity, refill_rate, now)
+
+        from .models import ThrottleBucket
+
+        table = connection.ops.quote_name(ThrottleBucket._meta.db_table)
+        # "key" adalah kata kunci di beberapa database
+        key_column = connection.ops.quote_name(ThrottleBucket._meta.get_field('key').column)
+        refill = f"{table}.tokens + (%s - {table}.updated_at) * %s"
+        level = f"(CASE WHEN {refill} > %s THEN %s ELSE {refill} END)"
+        sql = (
+            f"INSERT INTO {table} ({key_column}, tokens, updated_at, allowed) VALUES (%s, %s, %s, TRUE) "
+            f"ON CONFLICT ({key_column}) DO UPDATE SET "
+            f"tokens = CASE WHEN {level} >= 1 THEN {level} - 1 ELSE {level} END, "
+            f"updated_at = %s, allowed = {level} >= 1 "
+            f"RETURNING allowed, tokens"
+        )
+        level_params = [now, refill_rate, capacity, capacity, now, refill_rate]
+        params = [key, capacity - 1, now, *level_params, *level_params, *level_params, now, *level_params]
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            allowed, tokens = cursor.fetchone()
+        return bool(allowed), tokens
+
+    def _consume_locked(self, key, capacity, refill_rate, now):
+        from .models import ThrottleBucket
+
+        with transaction.atomic(using=self.using):
+            bucket, created = ThrottleBucket.objects.using(self.using).select_for_update().get_or_create(
+                key=key, defaults={'tokens': capacity, 'updated_at': now}
+            )
+            tokens = min(capacity, bucket.tokens + (now - bucket.updated_at) * refill_rate)
+            bucket.allowed = tokens >= 1
+            bucket.tokens = tokens - 1 if bucket.allowed else tokens
+            bucket.updated_at = now
+            bucket.save()
+        return bucket.allowed, bucket.tokens
+
+    def prune(self, older_than):
+        """Hapus bucket yang tidak disentuh sejak `older_than` detik (pasti sudah penuh lagi)."""
+        from .models import ThrottleBucket
+
+        cutoff = time.time() - older_than
+        return ThrottleBucket.objects.using(self.using).filter(updated_at__lt=cutoff).delete()[0]
+
+
+_backend = None
+
+
+def get_backend():
+    """Backend dari settings.THROTTLE_BACKEND (path kelas) dan THROTTLE_BACKEND_OPTIONS."""
+    global _backend
+    if _backend is None:
+        path = getattr(settings, 'THROTTLE_BACKEND', 'core.throttling.DatabaseBucketBackend')
+        _backend = import_string(path)(**getattr(settings, 'THROTTLE_BACKEND_OPTIONS', {}))
+    return _backend
+
+
+@receiver(setting_changed)
+def _reset_backend(setting, **kwargs):
+    global _backend
+    if setting in ('THROTTLE_BACKEND', 'THROTTLE_BACKEND_OPTIONS'):
+        _backend = None
+
+
+_local = threading.local()
+
+
+def _pending_waits():
+    # {id(throttle): detik} untuk request yang sedang diproses di thread ini
+    if not hasattr(_local, 'waits'):
+        _local.waits = {}
+    return _local.waits
+
+
+class TokenBucketMixin:
+    """
+    Ganti riwayat timestamp SimpleRateThrottle bawaan ninja dengan token bucket:
+    kapasitas = jumlah request pada rate, terisi ulang merata sepanjang periode.
+    Atribut `backend` menimpa settings.THROTTLE_BACKEND untuk throttle tertentu.
+
+    Satu instance (API_THROTTLES) dipakai bersama oleh request yang berjalan
+    paralel di thread lain, jadi hasil consume tidak disimpan di instance.
+    Ninja memanggil wait() tanpa request, tepat setelah allow_request() di
+    thread yang sama, sehingga waktu tunggu dititipkan per thread.
+    """
+
+    backend = None
+
+    def allow_request(self, request):
+        key = self.get_cache_key(request)
+        if key is None:
+            return True
+        refill_rate = self.num_requests / self.duration
+        allowed, tokens = (self.backend or get_backend()).consume(
+            key, self.num_requests, refill_rate, self.timer()
+        )
+        if allowed:
+            _pending_waits().pop(id(self), None)
+        else:
+            _pending_waits()[id(self)] = (1 - tokens) / refill_rate
+        return allowed
+
+    def wait(self):
+        return _pending_waits().pop(id(self), None)
+
+
+def _throttle_wait(request, throttles):
+    """None bila semua throttle mengizinkan, selain itu waktu tunggu terlama (detik)."""
+    waits = [throttle.wait() or 0 for throttle in throttles if not throttle.allow_request(request)]
+    return max(waits) if waits else None
+
+
+def throttle_async(*throttles):
+    """
+    Dekorator endpoint async ninja. Ninja memanggil throttle secara sinkron dari
+    event loop, sedangkan DatabaseBucketBackend memakai koneksi database yang
+    tidak boleh disentuh di sana; daftarkan endpoint dengan throttle=[] dan
+    biarkan dekorator ini menjalankan throttle lewat sync_to_async.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        async def wrapper(request, *args, **kwargs):
+            wait = await sync_to_async(_throttle_wait)(request, throttles)
+            if wait is not None:
+                raise Throttled(wait=wait)
+            return await view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class AnonRateThrottle(TokenBucketMixin, throttling.AnonRateThrottle):
+    pass
+
+
+class AuthRateThrottle(TokenBucketMixin, throttling.AuthRateThrottle):
+    pass
+
+
+# --- THROTTLE PER ENDPOINT ---
 
 class SimpleRateThrottle(AnonRateThrottle):
     def __init__(self):
@@ -29,4 +223,4 @@ class StrictPostThrottle(AuthRateThrottle):
 
 class DailyLimitThrottle(AuthRateThrottle):
     def __init__(self):
-        super().__init__('10/m')
\ No newline at end of file
+        super().__init__('10/m')
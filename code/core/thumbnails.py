@@ -0,0 +1,195 @@
+# /code/core/thumbnails.py
+"""
+Rendition gambar course (Course.image) dalam beberapa ukuran. Setiap rendition
+disimpan di storage yang sama, bersebelahan dengan file asli, dengan nama
+deterministik: course_images/foto.jpg -> course_images/foto.card-600x400.webp.
+Rendition dibuat saat upload (signal post_save Course) dan, untuk gambar lama,
+lewat `manage.py generate_thumbnails`. Request tidak pernah me-resize gambar:
+rendition yang belum ada dijawab dengan URL file asli, dan bila
+THUMBNAIL_GENERATE_ON_REQUEST aktif dibuat di thread latar belakang.
+
+Keberadaan rendition diingat di cache (THUMBNAIL_CACHE_ALIAS) agar halaman
+katalog tidak memanggil storage.exists() per ukuran per course.
+
+Pillow di-import lazy (lihat core.startup.HEAVY_MODULES).
+"""
+import logging
+import posixpath
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+logger = logging.getLogger('core.thumbnails')
+
+DEFAULT_SIZES = {'card': (600, 400), 'detail': (1200, 800)}
+EXTENSIONS = {'WEBP': 'webp', 'JPEG': 'jpg'}
+
+_executor = None
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def thumbnail_sizes():
+    return _setting('THUMBNAIL_SIZES', DEFAULT_SIZES)
+
+
+def _format():
+    fmt = _setting('THUMBNAIL_FORMAT', 'WEBP').upper()
+    if fmt not in EXTENSIONS:
+        raise ValueError(f"THUMBNAIL_FORMAT harus salah satu dari {sorted(EXTENSIONS)}")
+    return fmt
+
+
+def _name_of(image):
+    # FieldFile dari model maupun string dari .values('image')
+    return getattr(image, 'name', image) or ''
+
+
+def _cache():
+    return caches[_setting('THUMBNAIL_CACHE_ALIAS', 'default')]
+
+
+def _cache_key(target):
+    return f'thumbnail:{target}'
+
+
+def _remember(targets):
+    if targets:
+        _cache().set_many({_cache_key(t): True for t in targets}, _setting('THUMBNAIL_CACHE_TTL', 86400))
+
+
+def thumbnail_name(image, size):
+    """Nama rendition untuk ukuran `size`; ukuran ikut di nama agar perubahan THUMBNAIL_SIZES membuat file baru."""
+    width, height = thumbnail_sizes()[size]
+    directory, filename = posixpath.split(_name_of(image))
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(directory, f"{stem}.{size}-{width}x{height}.{EXTENSIONS[_format()]}")
+
+
+def _render(source, box, fmt):
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as image:
+        # JPEG bisa di-decode langsung pada skala yang lebih kecil (jauh lebih cepat untuk foto besar)
+        image.draft('RGB', box)
+        image = ImageOps.exif_transpose(image)
+        has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+        image = image.convert('RGBA' if has_alpha and fmt == 'WEBP' else 'RGB')
+        image.thumbnail(box, Image.Resampling.LANCZOS)
+
+        output = BytesIO()
+        options = {'quality': _setting('THUMBNAIL_QUALITY', 80)}
+        if fmt == 'JPEG':
+            options.update(optimize=True, progressive=True)
+        else:
+            options['method'] = 4
+        image.save(output, fmt, **options)
+    return output.getvalue()
+
+
+def generate_thumbnails(image, sizes=None, storage=None, force=False):
+    """
+    Buat rendition yang belum ada untuk `image` (FieldFile atau nama file).
+    File asli dibaca paling banyak sekali per ukuran yang hilang. Return daftar
+    nama rendition yang baru ditulis; gambar rusak/bukan gambar di-log saja.
+    """
+    from PIL import Image, UnidentifiedImageError
+
+    name = _name_of(image)
+    if not name:
+        return []
+    storage = storage or getattr(image, 'storage', None) or default_storage
+    fmt = _format()
+
+    created, ready = [], []
+    try:
+        for size in sizes or thumbnail_sizes():
+            target = thumbnail_name(name, size)
+            if not force and storage.exists(target):
+                ready.append(target)
+                continue
+            try:
+                with storage.open(name, 'rb') as source:
+                    data = _render(source, thumbnail_sizes()[size], fmt)
+            except FileNotFoundError:
+                logger.warning("Gambar %s tidak ditemukan, thumbnail tidak dibuat", name)
+                break
+            except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+                logger.warning("Gagal membuat thumbnail %s untuk %s", size, name, exc_info=True)
+                break
+
+            if force:
+                storage.delete(target)
+            saved = storage.save(target, ContentFile(data))
+            if saved != target:
+                # penulis lain (signal/command/thread) lebih dulu menyimpan rendition
+                # yang sama: buang salinan bersufiks, rendition tetap satu file
+                storage.delete(saved)
+            else:
+                created.append(target)
+            ready.append(target)
+    finally:
+        _remember(ready)
+    return created
+
+
+def _generate_in_background(name, storage):
+    global _executor
+    with _pending_lock:
+        if name in _pending:
+            return
+        _pending.add(name)
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='thumbnails')
+    _executor.submit(_generate_pending, name, storage)
+
+
+def _generate_pending(name, storage):
+    try:
+        generate_thumbnails(name, storage=storage)
+    except Exception:
+        logger.exception("Thumbnail untuk %s gagal dibuat", name)
+    finally:
+        with _pending_lock:
+            _pending.discard(name)
+
+
+def thumbnail_urls(image, sizes=None):
+    """
+    {ukuran: URL} untuk `image`. Rendition yang belum ada memakai URL file
+    asli; bila THUMBNAIL_GENERATE_ON_REQUEST aktif, pembuatannya diserahkan ke
+    thread latar belakang (tidak pernah di request/event loop). Dict kosong
+    bila course tidak punya gambar.
+    """
+    name = _name_of(image)
+    if not name:
+        return {}
+    storage = getattr(image, 'storage', None) or default_storage
+    known_sizes = thumbnail_sizes()
+    sizes = list(sizes or known_sizes)
+    for size in sizes:
+        if size not in known_sizes:
+            raise ValueError(f"Ukuran thumbnail tidak dikenal: {size}")
+
+    targets = {size: thumbnail_name(name, size) for size in sizes}
+    cached = _cache().get_many([_cache_key(t) for t in targets.values()])
+    found = [t for t in targets.values() if _cache_key(t) in cached or storage.exists(t)]
+    _remember([t for t in found if _cache_key(t) not in cached])
+
+    if len(found) < len(targets) and _setting('THUMBNAIL_GENERATE_ON_REQUEST', False):
+        _generate_in_background(name, storage)
+    return {size: storage.url(target if target in found else name) for size, target in targets.items()}
+
+
+def thumbnail_url(image, size):
+    """URL rendition `size` untuk `image` (lihat thumbnail_urls); string kosong bila tidak ada gambar."""
+    return thumbnail_urls(image, [size]).get(size, '')
@@ -1,9 +1,18 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 from .views import CourseListView, CourseDetailView 
 from core.apiv1 import apiv1
 from core.api import api
 
+# View baca yang ramai: versi async dipasang pada profil ASGI (settings.ASYNC_VIEWS)
+if settings.ASYNC_VIEWS:
+    from . import async_views as read_views
+    course_list_view, course_detail_view = read_views.course_list, read_views.course_detail
+else:
+    read_views = views
+    course_list_view, course_detail_view = CourseListView.as_view(), CourseDetailView.as_view()
+
 urlpatterns = [
     path('register/', views.register, name='register'),
 
@@ -16,19 +25,22 @@ urlpatterns = [
     # URLS UNTUK PENGELOLAAN USER (STAFF/ADMIN) - CRUD
     path('users/', views.users, name='users'),
     path('users/add/', views.user_create, name='user_create'), # CREATE
+    path('export/<str:name>/', views.export_data, name='export_data'),
     path('users/<int:pk>/edit/', views.user_update, name='user_update'), # UPDATE
     path('users/<int:pk>/delete/', views.user_delete, name='user_delete'), # DELETE
 
     # URLS COURSE
-    path('courses/list/', CourseListView.as_view(), name='course_list'),
-    path('course/<int:pk>/', CourseDetailView.as_view(), name='course_detail'),
+    path('courses/list/', course_list_view, name='course_list'),
+    path('course/<int:pk>/', course_detail_view, name='course_detail'),
     path('course/<int:pk>/join/', views.join_course, name='join_course'),
     path('course/<int:pk>/exit/', views.exit_course, name='exit_course'),
 
     path('my-courses/', views.my_courses, name='my_courses'),
-    path('course/<int:course_pk>/contents/', views.course_content_list, name='course_content_list'),
-    path('course/<int:course_pk>/content/<int:content_pk>/', views.course_content_detail, name='course_content_detail'),
+    path('course/<int:course_pk>/contents/', read_views.course_content_list, name='course_content_list'),
+    path('course/<int:course_pk>/content/<int:content_pk>/', read_views.course_content_detail, name='course_content_detail'),
     path('course/<int:course_pk>/content/<int:content_pk>/comment/', views.post_comment, name='post_comment'),
+    path('course/<int:course_pk>/content/<int:content_pk>/comments/', read_views.content_comments, name='content_comments'),
+    path('course/<int:course_pk>/content/<int:content_pk>/download/', views.content_download, name='content_download'),
     
     #Course CRUD
     path('courses/add/', views.course_create, name='course_create'),
@@ -38,9 +50,16 @@ urlpatterns = [
     #Course Content CRUD
     path('course/<int:course_pk>/contents/add/', views.content_create, name='course_content_add'),
     path('course/<int:course_pk>/contents/csv/', views.content_import_csv, name='course_content_csv'),
+    path('course/<int:course_pk>/contents/csv/<int:job_pk>/', views.content_import_job, name='course_content_import_job'),
+    path('course/<int:course_pk>/contents/csv/<int:job_pk>/status/', views.content_import_job_status, name='course_content_import_job_status'),
+    path('course/<int:course_pk>/contents/csv/<int:job_pk>/cancel/', views.content_import_job_cancel, name='course_content_import_job_cancel'),
     path('course/<int:course_pk>/content/<int:content_pk>/edit/', views.content_edit, name='course_content_edit'),
     path('course/<int:course_pk>/content/<int:content_pk>/delete/', views.content_delete, name='course_content_delete'),
     path('course/<int:course_id>/certificate/', views.render_sertif, name='generate_certificate'),
+    path('course/<int:course_id>/certificate/status/', views.certificate_status, name='certificate_status'),
+    path('course/<int:course_pk>/certificates.zip', views.course_certificates_zip, name='course_certificates_zip'),
+    path('course/<int:course_pk>/certificates.zip/status/', views.course_certificates_zip_status,
+         name='course_certificates_zip_status'),
     
     # URL Baru untuk Komentar (Harus di atas atau di bawah URL konten)
     path('comment/edit/<int:comment_pk>/', views.comment_edit, name='comment_edit'),
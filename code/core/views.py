@@ -4,20 +4,33 @@ from django.views.decorators.http import require_POST
 from django.views.generic import ListView, DetailView
 from django.contrib import messages
 from django.contrib.auth.models import User
-from django.db.models import Q, Count
+from django.db.models import Exists, OuterRef
 from django.core.files.storage import FileSystemStorage 
 from django.contrib.auth import get_user_model
 from django.contrib.auth import login
-import requests
 
 # Import model-model yang diperlukan
-from .models import Course, CourseMember, CourseContent, Comment, Completion
+from .models import Course, CourseMember, CourseContent, Comment, Completion, MemberProgress, ImportJob
 from .forms import UserEditForm, UserAddForm, RegisterForm, CourseForm, CourseContentForm
-from .importer import import_content_from_csv
+from .jobs import cancel_import_job, enqueue_import, job_status, resume_stale_job
+from .exports import EXPORT_FORMATS, EXPORT_NAMES, export_response
+from .search import search_courses
+from .aggregates import annotate_course_counts
+from .catalog import get_or_build
+from .stats import get_user_stats
+from .services import comment_feed, user_page
+from .downloads import serve_file
+from .conditional import conditional, content_detail_state, content_list_state, course_state
+from .certificates import (
+    certificate_name, certificate_path, certificate_state, course_zip_state, ensure_certificate,
+    render_certificate_html,
+)
 from django.core.paginator import Paginator
-from weasyprint import HTML
-from django.http import HttpResponse
+from django.http import FileResponse, Http404, JsonResponse
+from django.urls import reverse
+from django.utils.decorators import method_decorator
 from django.template.loader import render_to_string
+from ninja.errors import ValidationError as NinjaValidationError
 
 User = get_user_model()
 
@@ -73,124 +86,49 @@ def core(request):
 @login_required
 def users(request):
     query = request.GET.get('q')
-    page_number = request.GET.get('page', 1)
-    
     try:
-        api_base_url = f"{request.scheme}://{request.get_host()}/api/v1"
-        
-        params = {'page': page_number}
-        if query:
-            params['search'] = query
-        
-        response = requests.get(
-            f"{api_base_url}/users",
-            params=params,
-            timeout=5 
-        )
-        
-        if response.status_code == 200:
-            api_data = response.json()
-            
-            myusers_list = api_data.get('items', [])
-            if not myusers_list and 'results' in api_data:
-                myusers_list = api_data.get('results', [])
-            
-            total_count = api_data.get('count', len(myusers_list))
-            
-            paginator = Paginator(myusers_list, 5)
-            
-            try:
-                page_obj = paginator.page(page_number)
-            except PageNotAnInteger:
-                page_obj = paginator.page(1)
-            except EmptyPage:
-                page_obj = paginator.page(paginator.num_pages)
-                
-            message = f"Menampilkan hasil pencarian untuk: '{query}'" if query else ""
-            
-            stats = get_stats_from_database()
-            
-            context = {
-                'myusers': page_obj,
-                'page_obj': page_obj,
-                'query': query,
-                'search_message': message,
-                'total_users': total_count,
-                'admin': stats['admin'],
-                'staff': stats['staff'],
-                'siswa': stats['siswa'],
-                'teacher': stats['teacher'],
-                'rata2': stats['rata2'],
-            }
-            
-            return render(request, 'user/all_users.html', context)
-        else:
-            return users_from_database(request, query)
-            
-    except (requests.RequestException, requests.Timeout, KeyError, ValueError) as e:
-        print(f"API Error: {e}")  
-        return users_from_database(request, query)
+        start = max(int(request.GET.get('start', 1)), 1)
+        page_obj, next_cursor = user_page(query, request.GET.get('cursor'))
+    except (NinjaValidationError, ValueError):
+        # cursor/nomor awal rusak (mis. link lama) -> kembali ke halaman pertama
+        start = 1
+        page_obj, next_cursor = user_page(query)
+    message = f"Menampilkan hasil pencarian untuk: '{query}'" if query else ""
+
+    stats = get_user_stats()
 
-def users_from_database(request, query=None):
-    """Ambil data user langsung dari database (fallback)"""
-    if query:
-        myusers = User.objects.filter(
-            Q(username__icontains=query) |
-            Q(first_name__icontains=query) |
-            Q(last_name__icontains=query) |
-            Q(email__icontains=query)
-        ).distinct().order_by('date_joined')
-        message = f"Menampilkan hasil pencarian untuk: '{query}'"
-    else:
-        myusers = User.objects.all().order_by('date_joined')
-        message = ""
-    
-    # Hitung statistik
-    stats = get_stats_from_database()
-    
-    paginator = Paginator(myusers, 5)
-    page_number = request.GET.get('page', 1)
-    
-    try:
-        page_obj = paginator.page(page_number)
-    except PageNotAnInteger:
-        page_obj = paginator.page(1)
-    except EmptyPage:
-        page_obj = paginator.page(paginator.num_pages)
-    
     context = {
         'myusers': page_obj,
         'page_obj': page_obj,
+        'next_cursor': next_cursor,
+        'start': start,
+        'next_start': start + len(page_obj),
         'query': query,
         'search_message': message,
-        'total_users': User.objects.count(),
+        'total_users': stats['total_users'],
         'admin': stats['admin'],
         'staff': stats['staff'],
         'siswa': stats['siswa'],
         'teacher': stats['teacher'],
         'rata2': stats['rata2'],
     }
-    
+
     return render(request, 'user/all_users.html', context)
 
-def get_stats_from_database():
-    """Ambil statistik dari database"""
-    admin = User.objects.filter(is_superuser=True).count()
-    staff = User.objects.filter(is_staff=True).count()
-    siswa = User.objects.filter(is_staff=False, is_superuser=False).count()
-    teacher = User.objects.filter(course__isnull=False).distinct().count()
-    Tcourse = CourseMember.objects.values('course_id').distinct().count()
-    Tmember = CourseMember.objects.filter(roles='std').values('user_id').distinct().count()
-    rata2 = Tcourse / Tmember if Tmember > 0 else 0
-    
-    return {
-        'admin': admin,
-        'staff': staff,
-        'siswa': siswa,
-        'teacher': teacher,
-        'rata2': rata2,
-        'total_users': User.objects.count()
-    }
+@user_passes_test(is_staff_or_superuser)
+@login_required
+def export_data(request, name):
+    """
+    Export streaming untuk admin: /export/<name>/?format=csv|ndjson&gzip=1&course=<id>.
+    Memori tetap datar berapapun jumlah barisnya.
+    """
+    fmt = request.GET.get('format', 'csv')
+    if name not in EXPORT_NAMES or fmt not in EXPORT_FORMATS:
+        raise Http404
+    course = request.GET.get('course')
+    if course is not None and not course.isdigit():
+        raise Http404
+    return export_response(name, fmt, course and int(course), request.GET.get('gzip') in ('1', 'true'))
 
 @user_passes_test(is_staff_or_superuser)
 @login_required
@@ -260,58 +198,52 @@ def user_delete(request, pk):
 
 # --- VIEWS COURSE & CONTENT MANAGEMENT (DIKOREKSI) ---
 
+# sort katalog -> (ordering, pesan)
+CATALOG_SORTS = {
+    'harga_asc': ('price', 'Harga Termurah'),
+    'harga_desc': ('-price', 'Harga Termahal'),
+    'member_asc': ('student_total', 'Kurang Diminati'),
+    'member_desc': ('-student_total', 'Terpopuler'),
+}
+
+
+def course_catalog(query=None, sort_option=None):
+    """Daftar course katalog (dipakai view sync & async), disimpan per versi katalog."""
+    queryset = Course.objects.order_by('-created_at')
+
+    if sort_option in ('member_asc', 'member_desc'):
+        queryset = annotate_course_counts(queryset, 'student_total')
+
+    if query:
+        queryset = search_courses(queryset, query)
+
+    if sort_option in CATALOG_SORTS:
+        queryset = queryset.order_by(CATALOG_SORTS[sort_option][0])
+
+    # Hasil disimpan per versi katalog; versi naik saat course/member/konten berubah
+    return get_or_build(f'course_list:{query}:{sort_option}', lambda: list(queryset))
+
+
+def catalog_context(query=None, sort_option=None):
+    context = {'query': query, 'sort': sort_option}
+    if sort_option in CATALOG_SORTS:
+        context['sort_message'] = CATALOG_SORTS[sort_option][1]
+    if query:
+        context['search_message'] = f"Hasil pencarian untuk '{query}'"
+    return context
+
+
 class CourseListView(ListView):
     model = Course
     template_name = 'course/course_list.html'
     context_object_name = 'courses'
-    ordering = ['-created_at']
 
     def get_queryset(self):
-        query = self.request.GET.get('q')
-        sort_option = self.request.GET.get('sort')
-        queryset = super().get_queryset()
-
-        queryset = super().get_queryset().annotate(
-            member_count=Count('coursemember', filter=Q(coursemember__roles='std'))
-        )
-
-        if query:
-            queryset = queryset.filter(
-                Q(name__icontains=query) | Q(description__icontains=query)
-            )
-
-        if sort_option == 'harga_asc':
-            queryset = queryset.order_by('price') 
-        elif sort_option == 'harga_desc':
-            queryset = queryset.order_by('-price')
-        elif sort_option == 'member_asc':
-            queryset = queryset.order_by('member_count')
-        elif sort_option == 'member_desc':
-            queryset = queryset.order_by('-member_count')
-        
-        return queryset
+        return course_catalog(self.request.GET.get('q'), self.request.GET.get('sort'))
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        
-        sort_option = self.request.GET.get('sort')
-        query = self.request.GET.get('q')
-
-        context['query'] = query 
-        context['sort'] = sort_option
-
-        if sort_option == 'harga_asc':
-            context['sort_message'] = 'Harga Termurah'
-        elif sort_option == 'harga_desc':
-            context['sort_message'] = 'Harga Termahal'
-        elif sort_option == 'member_asc':
-            context['sort_message'] = 'Kurang Diminati'
-        elif sort_option == 'member_desc':
-            context['sort_message'] = 'Terpopuler'
-    
-        if query:
-            context['search_message'] = f"Hasil pencarian untuk '{query}'"
-            
+        context.update(catalog_context(self.request.GET.get('q'), self.request.GET.get('sort')))
         return context
 
 @login_required
@@ -359,15 +291,16 @@ def course_delete(request, pk):
         return redirect('course_list')
     return render(request, 'course/course_confirm_delete.html', {'course': course})
 
+@method_decorator(conditional(course_state), name='dispatch')
 class CourseDetailView(DetailView):
-    model = Course
+    queryset = Course.objects.select_related('teacher')
     template_name = 'course/course_detail.html'
     context_object_name = 'course'
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        course = self.get_object()
+        course = self.object
 
-        is_joined = CourseMember.objects.filter(
+        is_joined = self.request.user.is_authenticated and CourseMember.objects.filter(
             course_id=course,
             user_id=self.request.user
         ).exists()
@@ -395,7 +328,7 @@ def exit_course(request, pk):
 def join_course(request, pk):
     course = get_object_or_404(Course, pk=pk)
     
-    created = CourseMember.objects.get_or_create(
+    _, created = CourseMember.objects.get_or_create(
         course_id=course,
         user_id=request.user,
         defaults={'roles': 'std'}
@@ -408,12 +341,15 @@ def join_course(request, pk):
 
 @login_required
 def my_courses(request):
-    memberships = CourseMember.objects.filter(user_id=request.user)
+    memberships = CourseMember.objects.filter(user_id=request.user).select_related('course_id')
     return render(request, 'course/my_courses.html', {'memberships': memberships})
 
+CONTENTS_PER_PAGE = 6
+
 @login_required(login_url='login')
+@conditional(content_list_state)
 def course_content_list(request, course_pk):
-    course = get_object_or_404(Course, pk=course_pk)
+    course = get_object_or_404(Course.objects.select_related('teacher'), pk=course_pk)
     user = request.user
 
     is_member = CourseMember.objects.filter(course_id=course.pk, user_id=user.pk).exists()
@@ -431,45 +367,57 @@ def course_content_list(request, course_pk):
 
     student_list = [member.user_id for member in student_memberships]
     
-    student_count = len(student_list)
     contents = CourseContent.objects.filter(course_id=course.pk).order_by('pk') 
 
-    owner = (course.teacher == user)
-
-    paginator = Paginator(contents, 6) 
+    paginator = Paginator(contents, CONTENTS_PER_PAGE) 
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
 
-    context = {
+    context = content_list_context(course, user, is_member, student_list, page_obj)
+    return render(request, 'course/course_content_list.html', context)
+
+
+def content_list_context(course, user, is_member, student_list, page_obj):
+    return {
         'course': course,
         'contents': page_obj,
         'page_obj': page_obj,
         'is_member': is_member,
-        'total': student_count,
+        'total': len(student_list),
         'student_list': student_list,   
-        'owner': owner
+        'owner': course.teacher_id == user.pk,
     }
-    
-    return render(request, 'course/course_content_list.html', context)
+
+
+def _content_for_member(request, course_pk, content_pk):
+    """(course, content, member) bila user anggota kursus atau staff, selain itu None."""
+    course = get_object_or_404(Course, pk=course_pk)
+    content = get_object_or_404(CourseContent, pk=content_pk, course_id=course)
+    content.course_id = course  # dipakai template (form komentar) tanpa query lagi
+    current_member = CourseMember.objects.filter(course_id=course, user_id=request.user).first()
+    if current_member is None and not request.user.is_staff:
+        return None
+    return course, content, current_member
+
+
+def _comment_page(request, content):
+    try:
+        return comment_feed(content, request.GET.get('cursor'))
+    except NinjaValidationError:
+        return None
 
 
 @login_required(login_url='login')
+@conditional(content_detail_state)
 def course_content_detail(request, course_pk, content_pk):
-    course = get_object_or_404(Course, pk=course_pk)
-    content = get_object_or_404(CourseContent, pk=content_pk, course_id=course) 
-    
-    is_member = CourseMember.objects.filter(course_id=course, user_id=request.user).exists()
-    if not is_member and not request.user.is_staff:
+    access = _content_for_member(request, course_pk, content_pk)
+    if access is None:
           messages.error(request, "Anda harus bergabung dengan kursus ini untuk melihat konten.")
           return redirect('course_detail', pk=course_pk) # Gunakan course_pk untuk redirect
-    
-    comments = Comment.objects.filter(content_id=content).order_by('-created_at') 
+    course, content, current_member = access
 
-    try:
-        current_member = CourseMember.objects.get(course_id=course, user_id=request.user)
-    except CourseMember.DoesNotExist:
-        # Ini adalah fallback, tapi is_member di atas harusnya sudah mencegah ini
-        current_member = None
+    # halaman pertama saja; sisanya lewat "muat lebih banyak" (content_comments)
+    comments, next_cursor = comment_feed(content)
 
     if current_member :
         completed = Completion.objects.filter(member_id = current_member, content_id = content).exists()
@@ -480,10 +428,46 @@ def course_content_detail(request, course_pk, content_pk):
         'course': course,
         'content': content,
         'comments': comments,
+        'next_cursor': next_cursor,
         'completed' : completed,
     }
     return render(request, 'course/course_content_detail.html', context) 
 
+
+@login_required(login_url='login')
+def content_comments(request, course_pk, content_pk):
+    """Halaman komentar berikutnya (JSON) untuk tombol "muat lebih banyak"."""
+    access = _content_for_member(request, course_pk, content_pk)
+    if access is None:
+        return JsonResponse({'error': "Anda harus bergabung dengan kursus ini."}, status=403)
+
+    page = _comment_page(request, access[1])
+    if page is None:
+        return JsonResponse({'error': "Cursor tidak valid."}, status=400)
+    comments, next_cursor = page
+    html = render_to_string('comment/comment_items.html', {'comments': comments}, request=request)
+    return JsonResponse({'comments': comments, 'html': html, 'next_cursor': next_cursor})
+
+
+@login_required(login_url='login')
+def content_download(request, course_pk, content_pk):
+    """
+    Lampiran konten untuk anggota kursus/staff. Akses diperiksa dalam satu query;
+    player video mengirim banyak request Range untuk file yang sama.
+    """
+    content = get_object_or_404(
+        CourseContent.objects.only('file_attachment').annotate(
+            is_member=Exists(CourseMember.objects.filter(course_id=OuterRef('course_id'), user_id=request.user))
+        ),
+        pk=content_pk, course_id=course_pk,
+    )
+    if not content.is_member and not request.user.is_staff:
+        messages.error(request, "Anda harus bergabung dengan kursus ini untuk mengunduh lampiran.")
+        return redirect('course_detail', pk=course_pk)
+    if not content.file_attachment:
+        raise Http404("Konten ini tidak memiliki lampiran")
+    return serve_file(request, content.file_attachment)
+
 def check_course_ownership(user, course):
     is_owner = course.teacher == user
     is_superuser = user.is_superuser
@@ -610,7 +594,7 @@ def post_comment(request, course_pk, content_pk):
 # ----------------------------------------------------------------------
 @login_required(login_url='/login/')
 def comment_edit(request, comment_pk):
-    comment = get_object_or_404(Comment, pk=comment_pk)
+    comment = get_object_or_404(Comment.objects.select_related('content_id__course_id'), pk=comment_pk)
 
     if request.method == 'POST':
         # Asumsi data form POST memiliki field 'comment_text'
@@ -620,8 +604,8 @@ def comment_edit(request, comment_pk):
             comment.save()
             # Arahkan kembali ke halaman konten setelah edit
             return redirect('course_content_detail', 
-                            course_pk=comment.content_id.course_id.pk, 
-                            content_pk=comment.content_id.pk)
+                            course_pk=comment.content_id.course_id_id, 
+                            content_pk=comment.content_id_id)
         
     # Untuk GET request (menampilkan form edit)
     context = {
@@ -639,16 +623,14 @@ def comment_edit(request, comment_pk):
 login_required(login_url='/login/')
 @require_POST
 def comment_delete(request, comment_pk):
-    comment = get_object_or_404(Comment, pk=comment_pk)
+    comment = get_object_or_404(Comment.objects.select_related('member_id', 'content_id'), pk=comment_pk)
     
-    comment_user = comment.member_id.user_id 
-
     # 2. Periksa apakah User yang login adalah pemilik komentar
-    if comment_user == request.user:
+    if comment.member_id.user_id_id == request.user.pk:
         
         # Simpan PK konten dan kursus sebelum komentar dihapus
-        course_pk = comment.content_id.course_id.pk
-        content_pk = comment.content_id.pk
+        course_pk = comment.content_id.course_id_id
+        content_pk = comment.content_id_id
         
         comment.delete()
         messages.success(request, "Komentar berhasil dihapus.")
@@ -658,17 +640,16 @@ def comment_delete(request, comment_pk):
     # 3. Jika bukan pemilik komentar
     messages.error(request, "Anda tidak memiliki izin untuk menghapus komentar ini.")
     # Redirect kembali ke detail konten
-    return redirect('course_content_detail', course_pk=comment.content_id.course_id.pk, content_pk=comment.content_id.pk)
+    return redirect('course_content_detail', course_pk=comment.content_id.course_id_id, content_pk=comment.content_id_id)
 
 @login_required
 def user_dashboard(request):
     user = request.user
 
     if user.is_staff:
-        course_memberships = CourseMember.objects.filter(user_id=user)
+        course_memberships = CourseMember.objects.filter(user_id=user).select_related('course_id')
         jumlah = Course.objects.filter(teacher=request.user).count()
-        member = CourseMember.objects.filter(user_id=user)
-        komen = Comment.objects.filter(member_id__in=member).count()
+        komen = Comment.objects.filter(member_id__user_id=user).count()
         context = {
             'is_teacher': True,
             'courses': course_memberships,
@@ -681,53 +662,41 @@ def user_dashboard(request):
         view_type = request.GET.get('view', 'onprogress')  
         
         if view_type == 'complete':
-            completions = Completion.objects.filter(member_id__user_id=request.user).select_related(
-                'content_id__course_id'
-            ).order_by(
-                'content_id__course_id__name', 'content_id__name' 
-            )
+            progress_list = MemberProgress.objects.filter(
+                user_id=user, fully_completed=True
+            ).select_related('course_id').order_by('course_id__name')
 
-            completed_courses = {}
+            completed_courses = {
+                progress.member_id_id: {'course': progress.course_id, 'completed_contents': []}
+                for progress in progress_list
+            }
+            completions = Completion.objects.filter(
+                member_id__in=completed_courses.keys()
+            ).select_related('content_id').order_by('content_id__name')
             for completion in completions:
-                course = completion.content_id.course_id
-                if course.pk not in completed_courses:
-                    completed_courses[course.pk] = {
-                        'course': course,
-                        'completed_contents': []
-                    }
-                completed_courses[course.pk]['completed_contents'].append(completion.content_id)
-
-            completed_list = list(completed_courses.values())
+                completed_courses[completion.member_id_id]['completed_contents'].append(completion.content_id)
 
             context = {
                 'is_teacher': False,
                 'active_tab': 'complete',
-                'completions': completed_list
+                'completions': list(completed_courses.values())
             }
             return render(request, 'completion/dashboard.html', context)
         
         else: 
-            course_memberships = CourseMember.objects.filter(user_id=user)
-            
-            course_data = [] 
-            
-            for member in course_memberships:
-                course = member.course_id
-                
-                total_contents = course.contents.count() 
-                
-                completed_contents_count = Completion.objects.filter(
-                    member_id=member,  
-                    content_id__course_id=course 
-                ).count()
-                
-                is_fully_completed = (total_contents > 0 and completed_contents_count == total_contents)
-                
-                course_data.append({
-                    'member': member,
-                    'course': course,
-                    'is_fully_completed': is_fully_completed
-                })
+            progress_list = MemberProgress.objects.filter(user_id=user).select_related(
+                'member_id', 'course_id'
+            ).order_by('member_id')
+
+            course_data = [
+                {
+                    'member': progress.member_id,
+                    'course': progress.course_id,
+                    'progress': progress,
+                    'is_fully_completed': progress.fully_completed,
+                }
+                for progress in progress_list
+            ]
             
             context = {
                 'is_teacher': False,
@@ -751,53 +720,129 @@ def mark_content_complete(request, content_id):
     else:
         messages.info(request, f"Konten {content.name} sudah selesai sebelumnya.")
        
-    return redirect('course_content_list', course_pk=content.course_id.id)
+    return redirect('course_content_list', course_pk=content.course_id_id)
 
 @login_required
 def render_sertif(request, course_id):
+    """
+    Sertifikat dirender di process pool dan disimpan di cache disk. Selama
+    render berjalan endpoint mengembalikan 202 beserta URL status untuk polling.
+    """
     course = get_object_or_404(Course, pk=course_id)
-    
-    full_name = f"{request.user.first_name} {request.user.last_name}".strip()
-    if not full_name:
-        full_name = request.user.username
+    full_name = certificate_name(request.user)
+    path = certificate_path(request.user, course, full_name)
 
-    context = {
-        'full_name': full_name,
-        'course_name': course.name,
-    }
+    if ensure_certificate(path, lambda: render_certificate_html(course, full_name)):
+        return FileResponse(open(path, 'rb'), content_type='application/pdf',
+                            filename=f"Sertifikat_{full_name}.pdf")
 
-    html_string = render_to_string('completion/certif.html', context)
+    return _certificate_pending(request, course, reverse('certificate_status', args=[course.pk]),
+                                reverse('generate_certificate', args=[course.pk]))
 
-    response = HttpResponse(content_type='application/pdf')
-    response['Content-Disposition'] = f'inline; filename="Sertifikat_{full_name}.pdf"'
-
-    HTML(string=html_string).write_pdf(response)
 
+def _certificate_pending(request, course, poll_url, retry_url, state='pending'):
+    if 'application/json' in request.headers.get('Accept', ''):
+        response = JsonResponse({'status': state, 'poll_url': poll_url}, status=202)
+    else:
+        context = {'course': course, 'poll_url': poll_url, 'retry_url': retry_url, 'failed': state == 'failed'}
+        response = render(request, 'completion/certif_pending.html', context, status=202)
+    response['Location'] = poll_url
+    response['Retry-After'] = '2'
     return response
 
 
+@login_required
+def certificate_status(request, course_id):
+    course = get_object_or_404(Course, pk=course_id)
+    full_name = certificate_name(request.user)
+    path = certificate_path(request.user, course, full_name)
+    return JsonResponse({
+        'status': certificate_state(path, lambda: render_certificate_html(course, full_name)),
+        # membuka url ini setelah 'failed' menjadwalkan render ulang
+        'url': reverse('generate_certificate', args=[course.pk]),
+    })
+
+
+@login_required
+def course_certificates_zip(request, course_pk):
+    """
+    ZIP berisi sertifikat semua siswa yang sudah menyelesaikan course
+    (pengajar/admin). ZIP dibangun di luar request (lihat course_zip_state);
+    selama belum siap endpoint mengembalikan 202 dan halaman polling.
+    """
+    course = get_object_or_404(Course, pk=course_pk)
+    if not check_course_ownership(request.user, course):
+        messages.error(request, "Anda tidak memiliki izin mengunduh sertifikat kursus ini.")
+        return redirect('course_content_list', course_pk=course_pk)
+
+    state, path = course_zip_state(course, retry=True)
+    if state == 'ready':
+        return FileResponse(open(path, 'rb'), content_type='application/zip', as_attachment=True,
+                            filename=f"Sertifikat_{course.pk}.zip")
+    return _certificate_pending(request, course, reverse('course_certificates_zip_status', args=[course.pk]),
+                                reverse('course_certificates_zip', args=[course.pk]), state)
+
+
+@login_required
+def course_certificates_zip_status(request, course_pk):
+    course = get_object_or_404(Course, pk=course_pk)
+    if not check_course_ownership(request.user, course):
+        raise Http404
+    return JsonResponse({
+        'status': course_zip_state(course)[0],
+        'url': reverse('course_certificates_zip', args=[course.pk]),
+    })
+
+
 # CSV 
+@login_required(login_url='login')
 def content_import_csv(request, course_pk):
+    """Upload CSV disimpan sebagai ImportJob dan diproses di background."""
     course = get_object_or_404(Course, pk=course_pk)
-    
+    if not check_course_ownership(request.user, course):
+        messages.error(request, "Anda tidak memiliki izin untuk menambah konten pada kursus ini.")
+        return redirect('course_content_list', course_pk=course_pk)
+
     if request.method == 'POST':
         csv_file = request.FILES.get('csv_file')
         if not csv_file:
             messages.error(request, "Mohon unggah file CSV.")
             return render(request, 'courseContent/upload_csv.html', {'course': course})
-        
-        success_count, error_message = import_content_from_csv(csv_file, course)
-        
-        if error_message:
-            messages.error(request, f"Import GAGAL TOTAL. Tidak ada konten yang ditambahkan. Detail kesalahan pertama: {error_message[:200]}...") 
-        else:
-            messages.success(request, f"Impor berhasil! Total {success_count} konten kursus baru telah ditambahkan.")
-            
-        return redirect('course_content_list', course_pk=course.pk)
+
+        job = enqueue_import(course, csv_file, request.user)
+        return redirect('course_content_import_job', course_pk=course.pk, job_pk=job.pk)
 
     context = {'course': course}
     return render(request, 'courseContent/upload_csv.html', context)
 
+
+def _get_import_job(request, course_pk, job_pk):
+    job = get_object_or_404(ImportJob.objects.select_related('course'), pk=job_pk, course_id=course_pk)
+    if not check_course_ownership(request.user, job.course):
+        raise Http404
+    return job
+
+
+@login_required(login_url='login')
+def content_import_job(request, course_pk, job_pk):
+    """Halaman progres impor; upload_csv.html mem-polling content_import_job_status."""
+    job = resume_stale_job(_get_import_job(request, course_pk, job_pk))
+    return render(request, 'courseContent/upload_csv.html', {'course': job.course, 'job': job})
+
+
+@login_required(login_url='login')
+def content_import_job_status(request, course_pk, job_pk):
+    return JsonResponse(job_status(resume_stale_job(_get_import_job(request, course_pk, job_pk))))
+
+
+@login_required(login_url='login')
+@require_POST
+def content_import_job_cancel(request, course_pk, job_pk):
+    job = _get_import_job(request, course_pk, job_pk)
+    cancel_import_job(job)
+    job.refresh_from_db()
+    return JsonResponse(job_status(job))
+
 # API
 @login_required
 def apihtml(request):
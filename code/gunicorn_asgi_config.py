@@ -0,0 +1,26 @@
+# gunicorn_asgi_config.py
+# Profil ASGI: gunicorn sebagai process manager, uvicorn (paket uvicorn-worker) sebagai worker.
+# Jalankan dengan:
+#   gunicorn lms_project.asgi:application -c gunicorn_asgi_config.py
+#
+# Setiap worker melayani banyak koneksi sekaligus lewat event loop; view baca
+# async (core/async_views.py, aktif otomatis lewat lms_project/asgi.py) tidak
+# memegang thread selama menunggu database, sehingga jumlah koneksi per mesin
+# naik tanpa menambah worker (dan memori). View lain tetap sync dan dijalankan
+# Django di thread pool.
+
+bind = "127.0.0.1:8000"
+
+# Satu event loop per core sudah cukup; tidak perlu (2 * $num_cores) + 1
+workers = 3
+
+worker_class = "uvicorn_worker.UvicornWorker"
+
+accesslog = "/var/log/gunicorn/access.log"
+errorlog = "/var/log/gunicorn/error.log"
+loglevel = "info"
+
+# Request lambat tidak memblokir worker, tapi tetap dibatasi
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
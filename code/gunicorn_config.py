@@ -1,4 +1,5 @@
 # gunicorn_config.py
+import os
 
 # Socket untuk komunikasi dengan Nginx. 
 # Jika Gunicorn dan Nginx di server yang sama, gunakan alamat local (127.0.0.1:8000)
@@ -16,4 +17,18 @@ errorlog = "/var/log/gunicorn/error.log"
 loglevel = "info"
 
 # Waktu timeout (jika permintaan lebih dari 30 detik)
-timeout = 30 
\ No newline at end of file
+timeout = 30
+
+# Preload (opsional, GUNICORN_PRELOAD=1): Django di-load sekali di master lalu
+# worker di-fork darinya, sehingga worker baru siap hampir seketika dan memori
+# kode dibagi antar worker. Konsekuensinya, perubahan kode butuh restart penuh
+# (bukan HUP).
+preload_app = os.environ.get('GUNICORN_PRELOAD') == '1'
+
+
+def when_ready(server):
+    # Dipanggil di master setelah aplikasi di-preload, sebelum worker di-fork
+    if preload_app:
+        from core.startup import warmup
+        warmup()
+
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -16,19 +17,21 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.humanize',
+    'django.contrib.postgres',
     'core',
     # 'ninja_simple_jwt',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'core.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.querybudget.QueryBudgetMiddleware',
 ]
 
 ROOT_URLCONF = 'lms_project.urls'
@@ -104,6 +107,115 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+
+# View baca async (core/async_views.py) untuk profil ASGI; diaktifkan oleh
+# lms_project/asgi.py. Pada gunicorn sync/WSGI tetap memakai view sync.
+ASYNC_VIEWS = os.environ.get('LMS_ASYNC_VIEWS') == '1'
+
+# Renderer JSON NinjaAPI (core/renderers.py): orjson bila LMS_FAST_JSON=1.
+# Bentuk dan nilai JSON sama dengan renderer bawaan, hanya lebih ringkas.
+API_FAST_JSON = os.environ.get('LMS_FAST_JSON') == '1'
+
+# Cache katalog course (core/catalog.py). Gunakan backend bersama (file/redis/
+# memcached) pada alias ini agar versi katalog konsisten antar worker gunicorn.
+# Versi katalog dan versi tabel /contents & /comments juga menjadi ETag endpoint
+# list API (core/conditional.py); dengan LocMem ETag tersebut tidak dikirim.
+CATALOG_CACHE_ALIAS = 'default'
+CATALOG_CACHE_TTL = 300
+CATALOG_CACHE_LOCK_TIMEOUT = 30
+CATALOG_CACHE_COLD_WAIT = 2.0
+
+# Statistik halaman user (core.stats), diinvalidasi lewat signal
+USER_STATS_TTL = 300
+
+# Store throttle API (core/throttling.py). DatabaseBucketBackend memakai tabel
+# core_throttlebucket sehingga limit berlaku bersama untuk semua worker gunicorn;
+# CacheBucketBackend hanya akurat bila cache-nya dibagi antar proses.
+THROTTLE_BACKEND = 'core.throttling.DatabaseBucketBackend'
+THROTTLE_BACKEND_OPTIONS = {'using': 'default'}
+
+# Render sertifikat PDF (core/certificates.py): process pool per worker gunicorn,
+# hasil disimpan di disk (di luar MEDIA_ROOT karena tidak boleh publik).
+# CERTIFICATE_WORKERS = 0 merender langsung di request.
+CERTIFICATE_CACHE_DIR = BASE_DIR / 'certificate_cache'
+CERTIFICATE_WORKERS = 2
+CERTIFICATE_RENDER_TIMEOUT = 120
+CERTIFICATE_BATCH_WORKERS = None  # None = jumlah CPU
+# ZIP sertifikat satu course dibangun di luar request. CERTIFICATE_ZIP_RUNNER:
+# 'thread'  -> satu thread background per worker gunicorn
+# 'command' -> diproses `manage.py generate_course_certificates --queued` (cron/worker terpisah)
+# 'sync'    -> langsung di request (test/development)
+# Build yang tidak selesai dalam CERTIFICATE_ZIP_TIMEOUT detik dijadwalkan ulang.
+CERTIFICATE_ZIP_RUNNER = 'thread'
+CERTIFICATE_ZIP_TIMEOUT = 1800
+
+# Thumbnail gambar course (core/thumbnails.py): rendition disimpan di samping
+# file asli dan dibuat saat upload. Isi ulang untuk gambar lama dengan
+# `manage.py generate_thumbnails`; selama belum ada, URL file asli yang dipakai.
+# THUMBNAIL_GENERATE_ON_REQUEST = True membuat rendition yang hilang di thread
+# latar belakang (bukan di request). Keberadaan rendition diingat di cache
+# THUMBNAIL_CACHE_ALIAS selama THUMBNAIL_CACHE_TTL detik.
+THUMBNAIL_SIZES = {'card': (600, 400), 'detail': (1200, 800)}
+THUMBNAIL_FORMAT = 'WEBP'  # atau 'JPEG'
+THUMBNAIL_QUALITY = 80
+THUMBNAIL_GENERATE_ON_REQUEST = False
+THUMBNAIL_CACHE_ALIAS = 'default'
+THUMBNAIL_CACHE_TTL = 86400
+
+# Download lampiran konten (core/downloads.py). Dengan proxy di depan, set
+# DOWNLOAD_OFFLOAD agar proxy yang mengirim byte file dan worker langsung bebas:
+#   'x-accel'    -> nginx:  location /protected-media/ { internal; alias /code/media/; }
+#   'x-sendfile' -> Apache mod_xsendfile / lighttpd (header berisi path absolut)
+# None (default) -> Django men-stream file sendiri, termasuk Range/206.
+# Jangan sajikan MEDIA_ROOT secara publik di produksi: lampiran hanya lewat view ini.
+DOWNLOAD_OFFLOAD = os.environ.get('LMS_DOWNLOAD_OFFLOAD') or None
+DOWNLOAD_ACCEL_PREFIX = '/protected-media/'
+DOWNLOAD_BLOCK_SIZE = 64 * 1024
+
+# Impor CSV konten (core/importer.py, core/jobs.py). IMPORT_JOB_RUNNER:
+# 'thread'  -> job dijalankan thread background di worker yang menerima upload
+# 'command' -> job menunggu diproses `manage.py run_import_jobs` (disarankan di produksi)
+# 'sync'    -> job dijalankan langsung di request (test/development)
+IMPORT_BATCH_SIZE = 2000
+IMPORT_UPLOAD_DIR = BASE_DIR / 'import_uploads'
+IMPORT_JOB_RUNNER = 'thread'
+# Job 'running' menulis heartbeat tiap IMPORT_JOB_HEARTBEAT detik; job yang diam
+# lebih dari IMPORT_JOB_STALE_AFTER detik (worker mati) dikembalikan ke antrean oleh
+# run_import_jobs, atau saat progresnya di-poll bila runner 'thread'.
+IMPORT_JOB_HEARTBEAT = 15
+IMPORT_JOB_STALE_AFTER = 120
+
+# Budget query per request (core/querybudget.py). Pelanggaran di-log, atau
+# dilempar sebagai exception jika QUERY_BUDGET_RAISE = True.
+QUERY_BUDGET_ENABLED = True
+QUERY_BUDGET_RAISE = DEBUG
+QUERY_BUDGET_REPEAT_THRESHOLD = 5
+QUERY_BUDGETS = {
+    # endpoint apiv1: +2 untuk UPSERT bucket throttle (anon + auth) request tanpa login
+    'apiv1:list_users': 4,
+    'apiv1:listPublicCourses': 4,
+    'apiv1:listAllCourse': 4,
+    'apiv1:list_members': 4,
+    'apiv1:getMyCourses': 5,
+    'apiv1:list_contents': 5,
+    'apiv1:list_comments': 5,
+    'course_list': 6,
+    'course_detail': 6,
+    'my_courses': 4,
+    'course_content_list': 9,
+    'course_content_detail': 9,
+    'content_download': 3,
+    'dashboard': 6,
+}
+
+# Konfigurasi text search Postgres untuk pencarian course (tidak ada stemmer Bahasa Indonesia)
+SEARCH_CONFIG = 'simple'
+
 LOGIN_REDIRECT_URL = 'home' 
 
 LOGOUT_REDIRECT_URL = 'index' 